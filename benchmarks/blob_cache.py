@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Second config over the same site: with and without the shared blob cache
+
+Crawls a generated site twice under two config names, as godot.json and
+godot-large-example.json would. Without the cache the second config fetches
+and parses every page again; with it, bodies and extracted pages come from
+the cache. Responses are served from memory after --latency seconds, so the
+"requests" column is what a real site would see.
+
+Usage:
+    python3 benchmarks/blob_cache.py
+    python3 benchmarks/blob_cache.py --pages 1000 --latency 0.05
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from doc_scraper import DocToSkillConverter
+
+
+BASE = 'https://docs.example.com/'
+
+
+def make_site(count):
+    site = {}
+    for i in range(count):
+        links = ''.join(f'<a href="{BASE}page{j}">page {j}</a>' for j in (i + 1, i * 2 + 1) if j < count)
+        sections = ''.join(
+            f'<h2>Section {k}</h2><p>Paragraph {k} of page {i} explains nodes, signals and scenes.</p>'
+            f'<pre><code class="language-gdscript">func example_{k}():\n    emit_signal("done")</code></pre>'
+            for k in range(20))
+        url = BASE if i == 0 else f'{BASE}page{i}'
+        site[url] = f'<html><body><h1>Page {i}</h1><article>{sections}{links}</article></body></html>'.encode()
+    return site
+
+
+def crawl(name, site, latency, cache):
+    config = {'name': name, 'base_url': BASE, 'rate_limit': 0, 'max_pages': len(site),
+              'selectors': {'main_content': 'article', 'title': 'h1'}}
+    if cache:
+        config['blob_cache'] = {'dir': cache}
+    requests_made = []
+
+    def get(url, **kwargs):
+        requests_made.append(url)
+        time.sleep(latency)
+        if url not in site:
+            return Mock(url=url, status_code=404, headers={}, raw=None, content=b'',
+                        raise_for_status=Mock(side_effect=Exception('404')))
+        return Mock(url=url, status_code=200, headers={'Content-Type': 'text/html'}, raw=None, content=site[url])
+
+    converter = DocToSkillConverter(config)
+    converter.http_cache = None
+    converter.http = Mock()
+    converter.http.get.side_effect = get
+    started = time.perf_counter()
+    converter.scrape_all()
+    return time.perf_counter() - started, len(requests_made), len(converter.pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark a second config crawling the same site')
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds per request')
+    args = parser.parse_args()
+
+    site = make_site(args.pages)
+    old_cwd = os.getcwd()
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)
+    results = []
+    try:
+        for label, cache in (('no cache', None), ('blob cache', os.path.join(directory, 'cache'))):
+            crawl(f'{label.replace(" ", "-")}-first', site, args.latency, cache)
+            results.append((label, crawl(f'{label.replace(" ", "-")}-second', site, args.latency, cache)))
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"\nSecond config, {args.pages} pages, {args.latency * 1000:.0f} ms per request\n")
+    print(f"{'method':<12} {'seconds':>8} {'requests':>9} {'pages':>6}")
+    for label, (elapsed, requests_made, pages) in results:
+        print(f"{label:<12} {elapsed:>8.2f} {requests_made:>9} {pages:>6}")
+
+
+if __name__ == "__main__":
+    main()
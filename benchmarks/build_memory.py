@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+build_skill peak memory as the number of pages grows
+
+Builds a skill from page stores of increasing size and reports the time and
+tracemalloc peak of each build. The build streams pages from the store
+(one categorization pass, then one render pass per category), so the peak
+should level off instead of growing with the page count.
+
+Usage:
+    python3 benchmarks/build_memory.py
+    python3 benchmarks/build_memory.py --pages 1000 10000 40000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from doc_scraper import DocToSkillConverter
+from lang_classifier import get_classifier
+
+
+CATEGORIES = {
+    'getting_started': ['intro', 'getting_started', 'tutorial'],
+    'scripting': ['scripting', 'gdscript', 'signal'],
+    'physics': ['physics', 'collision', 'body'],
+    'api': ['class', 'reference', 'method'],
+}
+
+
+def make_page(i, rng):
+    sections = ['tutorials', 'scripting', 'physics', 'classes', 'community']
+    words = ['node', 'signal', 'scene', 'render', 'texture', 'physics', 'input', 'the', 'a']
+    code = f"func example_{i}():\n    emit_signal(\"done\")\n" * 5
+    return {
+        'url': f"https://docs.example.com/{rng.choice(sections)}/page{i}",
+        'title': f"{rng.choice(words).title()} {rng.choice(words)} {i}",
+        'content': ' '.join(rng.choice(words) for _ in range(rng.randint(300, 1500))),
+        'headings': [{'level': 'h2', 'text': f"Heading {j}"} for j in range(8)],
+        'code_samples': [{'code': code, 'language': rng.choice(['gdscript', 'unknown'])}] * 3,
+        'patterns': [{'description': 'Example:', 'code': code}],
+        'links': [f"https://docs.example.com/classes/page{j}" for j in range(20)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark build_skill memory')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1000, 4000, 16000])
+    args = parser.parse_args()
+
+    get_classifier()
+    old_cwd = os.getcwd()
+    print(f"{'pages':>7} {'seconds':>8} {'peak MB':>8}")
+    for count in args.pages:
+        directory = tempfile.mkdtemp()
+        os.chdir(directory)
+        try:
+            config = {'name': 'bench', 'base_url': 'https://docs.example.com/', 'categories': CATEGORIES}
+            converter = DocToSkillConverter(config)
+            rng = random.Random(0)
+            for i in range(count):
+                converter.store.put(make_page(i, rng))
+            converter.store.close()
+
+            converter = DocToSkillConverter(config)
+            tracemalloc.start()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter.build_skill()
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{count:>7} {elapsed:>8.1f} {peak / 1024 / 1024:>8.1f}")
+        finally:
+            os.chdir(old_cwd)
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
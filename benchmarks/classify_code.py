@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Code language classification throughput
+
+Classifies N doc-style code samples (built from training/lang_samples, each
+made unique so the repeat cache never hits) one call per sample and as a
+single batch, and reports samples per second.
+
+Usage:
+    python3 benchmarks/classify_code.py
+    python3 benchmarks/classify_code.py --samples 100000 --runs 3
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from lang_classifier import get_classifier, sample_snippets
+
+
+SAMPLES_DIR = Path(__file__).parent.parent / 'training' / 'lang_samples'
+
+
+def make_samples(count):
+    pool = [snippet for items in sample_snippets(SAMPLES_DIR).values() for snippet in items]
+    return [f"{pool[i % len(pool)]}\n# sample {i}" for i in range(count)]
+
+
+def time_s(func, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark code language classification')
+    parser.add_argument('--samples', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=3, help='Runs per mode (median is reported)')
+    args = parser.parse_args()
+
+    classifier = get_classifier()
+    codes = make_samples(args.samples)
+    average = sum(map(len, codes)) / len(codes)
+    print(f"{len(codes)} samples, {average:.0f} chars on average, median of {args.runs} runs\n")
+    print(f"{'mode':<12} {'seconds':>8} {'samples/sec':>12}")
+    for mode, func in (('per sample', lambda: [classifier.classify(code) for code in codes]),
+                       ('batch', lambda: classifier.classify_batch(codes))):
+        elapsed = time_s(func, args.runs)
+        print(f"{mode:<12} {elapsed:>8.2f} {len(codes) / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
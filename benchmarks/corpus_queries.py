@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Build queries: page dicts in Python vs the SQLite corpus
+
+Times what build_skill needs before writing references - categorizing the
+pages and collecting the quick reference - once by loading every page from
+the page store into Python (the default) and once as corpus.sqlite queries.
+
+Usage:
+    python3 benchmarks/corpus_queries.py
+    python3 benchmarks/corpus_queries.py --pages 40000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from corpus_db import CorpusDB
+from doc_scraper import DocToSkillConverter
+from page_store import PageStore
+
+
+CATEGORIES = {
+    'getting_started': ['intro', 'getting_started', 'tutorial'],
+    'scripting': ['scripting', 'gdscript', 'signal'],
+    'physics': ['physics', 'collision', 'body'],
+    'rendering': ['shader', 'render', 'material'],
+    'api': ['class', 'reference', 'method'],
+}
+
+
+def make_pages(count, seed=0):
+    rng = random.Random(seed)
+    sections = ['tutorials', 'scripting', 'physics', 'rendering', 'classes', 'community']
+    words = ['node', 'signal', 'scene', 'render', 'texture', 'physics', 'input', 'shader', 'the', 'a']
+    for i in range(count):
+        code = f"func example_{i % 400}():\n    pass"
+        yield {
+            'url': f"https://docs.example.com/{rng.choice(sections)}/page{i}",
+            'title': f"{rng.choice(words).title()} {rng.choice(words)} {i}",
+            'content': ' '.join(rng.choice(words) for _ in range(rng.randint(200, 800))),
+            'headings': [{'level': 'h2', 'text': f"Heading {j}"} for j in range(5)],
+            'code_samples': [{'code': code, 'language': 'gdscript'}],
+            'patterns': [{'description': 'Example:', 'code': code}],
+            'links': [f"https://docs.example.com/classes/page{j}" for j in range(10)],
+        }
+
+
+def measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark build queries over the corpus')
+    parser.add_argument('--pages', type=int, default=10000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        store = PageStore(os.path.join(directory, 'pages'))
+        corpus = CorpusDB(os.path.join(directory, 'corpus.sqlite'))
+        started = time.perf_counter()
+        for page in make_pages(args.pages):
+            store.put(page)
+            corpus.add(page)
+        store.close()
+        corpus.flush()
+        print(f"{args.pages} pages written to store and corpus in {time.perf_counter() - started:.1f}s\n")
+
+        converter = DocToSkillConverter({'name': 'bench', 'base_url': 'https://docs.example.com/',
+                                         'categories': CATEGORIES}, dry_run=True)
+
+        def python_queries():
+            pages = list(PageStore(os.path.join(directory, 'pages')).pages())
+            categories = converter.smart_categorize(pages)
+            return {cat: len(p) for cat, p in categories.items()}, len(converter.generate_quick_reference(pages))
+
+        def corpus_queries():
+            categories = corpus.categorize(CATEGORIES)
+            return {cat: len(urls) for cat, urls in categories.items()}, len(corpus.quick_reference())
+
+        print(f"{'method':<8} {'seconds':>8} {'peak MB':>8}")
+        results = []
+        for name, func in (('python', python_queries), ('corpus', corpus_queries)):
+            result, elapsed, peak = measure(func)
+            results.append(result)
+            print(f"{name:<8} {elapsed:>8.2f} {peak / 1024 / 1024:>8.1f}")
+        assert results[0] == results[1], results
+        corpus.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+extract_content cost on deeply nested markup
+
+Sphinx-style pages wrap every section in another <div>. The old extractor
+called get_text() on every <div> for pattern detection, re-reading the same
+text once per ancestor (quadratic in depth). This compares that multi-pass
+approach with the single-pass PageWalk as nesting grows.
+
+Usage:
+    python3 benchmarks/extract_nested.py
+    python3 benchmarks/extract_nested.py --depths 50 100 200 400 --runs 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from page_walk import PageWalk
+
+
+def nested_page(depth):
+    """Sections nested `depth` deep, each with a heading, prose, a link and code"""
+    opening = ''.join(
+        f'<div class="section" id="s{i}"><h2>Section {i}</h2>'
+        f'<p>Paragraph {i} describes <a href="ref{i}.html">ref {i}</a> in enough words.</p>'
+        f'<div class="highlight"><pre><code>value_{i} = compute({i})</code></pre></div>'
+        for i in range(depth))
+    return f'<html><body><div role="main">{opening}{"</div>" * depth}</div></body></html>'
+
+
+def multi_pass(main):
+    """The find_all / select / get_text passes extract_content used to make"""
+    headings = [h.get_text() for h in main.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])]
+    code = [c.get_text() for c in main.select('pre code')]
+    patterns = []
+    for elem in main.find_all(['p', 'div']):
+        text = elem.get_text().lower()
+        if any(word in text for word in ['example:', 'pattern:', 'usage:', 'typical use']):
+            next_code = elem.find_next(['pre', 'code'])
+            if next_code:
+                patterns.append(next_code.get_text())
+    paragraphs = [p.get_text() for p in main.find_all('p')]
+    links = [a['href'] for a in main.find_all('a', href=True)]
+    return headings, code, patterns[:5], paragraphs, links
+
+
+def single_pass(main):
+    walk = PageWalk(main, 'pre code')
+    return walk.headings, walk.code_blocks, walk.pattern_candidates(limit=5), walk.paragraphs, walk.hrefs
+
+
+def time_ms(func, main, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(main)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extraction on nested markup')
+    parser.add_argument('--depths', type=int, nargs='+', default=[25, 50, 100, 200, 400])
+    parser.add_argument('--runs', type=int, default=5, help='Runs per depth (median is reported)')
+    args = parser.parse_args()
+
+    print(f"Median of {args.runs} runs, ms per page (parsing excluded)\n")
+    print(f"{'depth':>6} {'multi-pass':>11} {'single-pass':>12} {'speedup':>8}")
+    for depth in args.depths:
+        main_elem = BeautifulSoup(nested_page(depth), 'html.parser').select_one('div[role="main"]')
+        before = time_ms(multi_pass, main_elem, args.runs)
+        after = time_ms(single_pass, main_elem, args.runs)
+        print(f"{depth:>6} {before:>11.1f} {after:>12.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
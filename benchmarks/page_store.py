@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Page storage: one JSON file per page vs the sharded page store
+
+Times writing N generated pages, loading them all (what build_skill does)
+and looking up random URLs (what incremental reuse does), for the old
+layout (one indent=2 JSON file per page, globbed and loaded) and for
+PageStore.
+
+Usage:
+    python3 benchmarks/page_store.py
+    python3 benchmarks/page_store.py --pages 40000
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from page_store import PageStore
+
+
+def make_pages(count, seed=0):
+    rng = random.Random(seed)
+    words = ['node', 'signal', 'scene', 'render', 'texture', 'physics', 'input', 'shader', 'the', 'a']
+    return [{
+        'url': f"https://docs.example.com/section{i % 50}/page{i}",
+        'title': f"Page {i}",
+        'content': ' '.join(rng.choice(words) for _ in range(rng.randint(200, 800))),
+        'headings': [{'level': 'h2', 'text': f"Heading {j}"} for j in range(5)],
+        'code_samples': [{'code': 'func _ready():\n    pass', 'language': 'gdscript'}] * rng.randint(0, 4),
+        'patterns': [],
+        'links': [f"https://docs.example.com/section{j}/" for j in range(20)],
+    } for i in range(count)]
+
+
+class JsonFiles:
+    """The old layout, as save_page and load_scraped_data used it"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, url):
+        return os.path.join(self.directory, hashlib.md5(url.encode()).hexdigest()[:10] + '.json')
+
+    def put(self, page):
+        with open(self.path(page['url']), 'w', encoding='utf-8') as f:
+            json.dump(page, f, indent=2, ensure_ascii=False)
+
+    def pages(self):
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            with open(path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+
+    def get(self, url):
+        with open(self.path(url), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def close(self):
+        pass
+
+
+def disk_usage(directory):
+    files = os.listdir(directory)
+    return len(files), sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+
+
+def run(name, make_store, pages, lookups):
+    directory = tempfile.mkdtemp()
+    try:
+        store = make_store(directory)
+        started = time.perf_counter()
+        for page in pages:
+            store.put(page)
+        store.close()
+        write = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store = make_store(directory)
+        loaded = sum(1 for _ in store.pages())
+        load = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for url in lookups:
+            store.get(url)
+        lookup = time.perf_counter() - started
+        store.close()
+
+        files, size = disk_usage(directory)
+        print(f"{name:<12} {write:>8.2f} {load:>8.2f} {lookup / len(lookups) * 1e6:>10.0f} "
+              f"{files:>7} {size / 1024 / 1024:>8.1f}")
+        assert loaded == len(pages)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark page storage')
+    parser.add_argument('--pages', type=int, default=10000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages)
+    lookups = [page['url'] for page in random.Random(1).sample(pages, min(args.lookups, len(pages)))]
+    print(f"{len(pages)} pages, {len(lookups)} random lookups\n")
+    print(f"{'layout':<12} {'write s':>8} {'load s':>8} {'lookup µs':>10} {'files':>7} {'MB':>8}")
+    run('json files', JsonFiles, pages, lookups)
+    run('page store', PageStore, pages, lookups)
+
+
+if __name__ == "__main__":
+    main()
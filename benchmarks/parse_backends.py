@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Per-page parse cost of each HTML parser backend
+
+Times make_soup alone and make_soup + extract_content for every installed
+backend, with and without partial parsing, and the peak memory of a parse. Uses a generated documentation page unless HTML files are given
+(for example pages kept by --archive, or saved with curl).
+
+Usage:
+    python3 benchmarks/parse_backends.py
+    python3 benchmarks/parse_backends.py page1.html page2.html --runs 50
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from doc_scraper import DocToSkillConverter
+from parser_backend import available_backends
+
+
+SELECTORS = {'main_content': 'div[role="main"]', 'title': 'title', 'code_blocks': 'pre code'}
+
+
+def sample_page(sections=40):
+    """A Sphinx-like page: big navigation sidebar, headings, prose and code"""
+    nav = ''.join(f'<li><a href="/api/class_{i}.html">Class{i}</a></li>' for i in range(600))
+    body = []
+    for i in range(sections):
+        body.append(f'<h2 id="s{i}">Section {i}</h2>')
+        body.append(f'<p>Paragraph {i} explains how <a href="ref_{i}.html">Ref{i}</a> '
+                    f'works &amp; when to call <code>method_{i}()</code> from a script.</p>' * 3)
+        body.append(f'<pre><code class="language-python">def handler_{i}(event):\n'
+                    f'    return process(event, level={i})\n</code></pre>')
+    return (f'<!DOCTYPE html><html><head><title>Sample</title>'
+            f'<script>{"var x = 1;" * 500}</script></head><body>'
+            f'<nav><ul>{nav}</ul></nav>'
+            f'<div class="document"><div role="main"><h1>Sample</h1>{"".join(body)}</div></div>'
+            f'<footer>{"<p>footer</p>" * 100}</footer></body></html>').encode('utf-8')
+
+
+def time_ms(func, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def peak_kb(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends')
+    parser.add_argument('files', nargs='*', help='HTML files to parse (default: generated page)')
+    parser.add_argument('--runs', type=int, default=20, help='Runs per page (median is reported)')
+    args = parser.parse_args()
+
+    pages = [Path(f).read_bytes() for f in args.files] or [sample_page()]
+    size_kb = sum(len(p) for p in pages) / len(pages) / 1024
+
+    print(f"Pages: {len(pages)} (avg {size_kb:.0f} KB), median of {args.runs} runs, ms per page\n")
+    print(f"{'backend':<20} {'parse':>8} {'parse+extract':>14} {'peak KB':>8}")
+
+    baseline = None
+    for backend in available_backends():
+        # selectolax always builds a title + main tree
+        for partial in ((False,) if backend == 'selectolax' else (False, True)):
+            config = {'name': 'bench', 'base_url': 'https://example.com/',
+                      'selectors': SELECTORS, 'parser': backend, 'partial_parse': partial}
+            converter = DocToSkillConverter(config, dry_run=True)
+
+            parse = sum(time_ms(lambda: converter.make_soup(page), args.runs) for page in pages) / len(pages)
+            full = sum(time_ms(lambda: converter.extract_content(converter.make_soup(page), 'https://example.com/'),
+                               args.runs) for page in pages) / len(pages)
+            peak = max(peak_kb(lambda: converter.make_soup(page)) for page in pages)
+
+            baseline = baseline or full
+            label = backend + (' +partial' if partial else '')
+            print(f"{label:<20} {parse:>8.2f} {full:>14.2f} {peak:>8.0f}   ({baseline / full:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+URL filter throughput
+
+is_valid_url runs for every link on every page. This times the old
+per-pattern substring loop against the compiled UrlFilter (one regex
+alternation for includes, one for excludes) over a million generated URLs,
+using the url_patterns of a real config.
+
+Usage:
+    python3 benchmarks/url_filter.py
+    python3 benchmarks/url_filter.py --config configs/kubernetes.json --urls 1000000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'cli'))
+
+from compiled_config import CompiledConfig
+
+
+ROOT = Path(__file__).parent.parent
+
+
+def substring_filter(config):
+    """is_valid_url as it was: dict lookups and a loop over each pattern list"""
+    base_url = config['base_url']
+
+    def is_valid_url(url):
+        if not url.startswith(base_url):
+            return False
+        includes = config.get('url_patterns', {}).get('include', [])
+        if includes and not any(pattern in url for pattern in includes):
+            return False
+        excludes = config.get('url_patterns', {}).get('exclude', [])
+        if any(pattern in url for pattern in excludes):
+            return False
+        return True
+    return is_valid_url
+
+
+def make_urls(config, count, seed=0):
+    """Links like a doc site's: pattern paths mixed with ordinary segments and other hosts"""
+    rng = random.Random(seed)
+    patterns = config.get('url_patterns', {})
+    segments = [p.strip('/') for p in patterns.get('include', []) + patterns.get('exclude', [])]
+    segments += ['guide', 'reference', 'api', 'v2', 'classes', 'methods', 'examples', 'index.html']
+    hosts = [config['base_url']] * 9 + ['https://github.com/']
+    return [rng.choice(hosts) + '/'.join(rng.choice(segments) for _ in range(rng.randint(1, 4)))
+            + f"/page{i}.html" for i in range(count)]
+
+
+def time_s(func, urls, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        accepted = sum(map(func, urls))
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), accepted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark URL filtering')
+    parser.add_argument('--config', default=str(ROOT / 'configs' / 'steam-economy-complete.json'))
+    parser.add_argument('--urls', type=int, default=1000000)
+    parser.add_argument('--runs', type=int, default=3, help='Runs per filter (median is reported)')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    urls = make_urls(config, args.urls)
+    compiled = CompiledConfig(config)
+    print(f"{len(urls)} URLs, {compiled.is_valid_url.describe()}, median of {args.runs} runs\n")
+    print(f"{'filter':<12} {'seconds':>8} {'URLs/sec':>12} {'accepted':>9}")
+    for name, func in (('substring', substring_filter(config)), ('compiled', compiled.is_valid_url)):
+        elapsed, accepted = time_s(func, urls, args.runs)
+        print(f"{name:<12} {elapsed:>8.2f} {len(urls) / elapsed:>12.0f} {accepted:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Raw page archive for Skill Seeker
+Keeps every fetched HTML response in output/<name>_data/raw_pages.archive so
+pages can be re-extracted with new selectors (--replay) without a re-crawl.
+
+Each file has one writer: worker processes of a multi-process crawl append
+to their own raw_pages.<host>-<pid>.archive next to it. The files are
+append-only. Each record is one frame:
+
+    b'SSA1' | header length (u32, big-endian) | body length (u32) | header | body
+
+The header is JSON (url, requested URL, status, response headers, fetch time,
+SHA-1 of the raw body); the body is the zlib-compressed response. A re-scrape
+appends a new record only when a page's body changed, and readers use the
+latest record per URL. A truncated last frame (crash mid-write) is ignored.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+
+MAGIC = b'SSA1'
+FRAME = struct.Struct('>4sII')
+
+
+def read_record(path, offset):
+    """
+    Read the record at offset
+
+    Returns:
+        tuple: (header dict, raw body bytes)
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        _, header_len, body_len = FRAME.unpack(f.read(FRAME.size))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+        return header, zlib.decompress(f.read(body_len))
+
+
+class PageArchive:
+    """Append-only archive of raw responses, safe to write from worker threads"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._digests = None   # url -> sha1 of its latest body, loaded on first write
+        self._valid_end = 0
+        self.recorded = 0
+
+    def scan(self):
+        """
+        Index the archive without decompressing bodies
+
+        Returns:
+            dict: url -> (offset, header) of the latest record per URL, in
+                order of first appearance
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as f:
+            offset = 0
+            while offset + FRAME.size <= size:
+                magic, header_len, body_len = FRAME.unpack(f.read(FRAME.size))
+                end = offset + FRAME.size + header_len + body_len
+                if magic != MAGIC or end > size:
+                    break
+                header = json.loads(f.read(header_len).decode('utf-8'))
+                f.seek(body_len, os.SEEK_CUR)
+                records[header['url']] = (offset, header)
+                offset = end
+        self._valid_end = offset
+        return records
+
+    def record(self, url, response, requested=None):
+        """
+        Append a response unless its body matches the URL's latest record
+
+        Args:
+            url: URL the page is stored under (after redirects)
+            response: 200 response with its body loaded
+            requested: URL that was asked for, if it redirected
+
+        Returns:
+            bool: True if a record was written
+        """
+        body = response.content
+        digest = hashlib.sha1(body).hexdigest()
+        header = {
+            'url': url,
+            'requested': requested or url,
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'fetched_at': time.time(),
+            'sha1': digest,
+        }
+
+        with self._lock:
+            if self._digests is None:
+                self._digests = {u: h.get('sha1') for u, (_, h) in self.scan().items()}
+                # Cut off a frame left half-written by a crash, or new records
+                # would be unreachable behind it
+                if os.path.exists(self.path) and os.path.getsize(self.path) > self._valid_end:
+                    with open(self.path, 'r+b') as f:
+                        f.truncate(self._valid_end)
+            if self._digests.get(url) == digest:
+                return False
+
+            header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+            compressed = zlib.compress(body)
+            with open(self.path, 'ab') as f:
+                f.write(FRAME.pack(MAGIC, len(header_bytes), len(compressed)) + header_bytes + compressed)
+            self._digests[url] = digest
+            self.recorded += 1
+        return True
+
+
+def scan_archives(data_dir):
+    """
+    Index every archive file of a scrape
+
+    Returns:
+        dict: url -> (path, offset, header) of the newest record per URL
+    """
+    records = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, 'raw_pages*.archive'))):
+        for url, (offset, header) in PageArchive(path).scan().items():
+            current = records.get(url)
+            if current is None or header['fetched_at'] >= current[2]['fetched_at']:
+                records[url] = (path, offset, header)
+    return records
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Batch Scraper for Skill Seeker
+Scrapes many configs at once in one process under a global connection cap.
+
+The scheduler interleaves hosts round-robin and caps the requests in flight
+per host, so a slow or throttled site only holds its own slots while the
+other configs keep moving. Configs that target the same host share one
+politeness throttle.
+
+Usage:
+    python3 batch_scrape.py configs/react.json configs/vue.json configs/godot.json
+    python3 batch_scrape.py configs/*.json --max-connections 32 --per-host 4
+"""
+
+import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from urllib.parse import urlparse
+
+try:
+    from doc_scraper import DocToSkillConverter, load_config
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from doc_scraper import DocToSkillConverter, load_config
+
+
+# Requests in flight across all configs
+DEFAULT_MAX_CONNECTIONS = 16
+
+
+class BatchJob:
+    """One config in a batch: its converter, host and throughput counters"""
+
+    def __init__(self, converter, per_host=None):
+        self.converter = converter
+        self.name = converter.name
+        self.host = urlparse(converter.base_url).netloc
+        self.max_pages = converter.config.get('max_pages', 500)
+        # Without --per-host each config keeps its own concurrency setting
+        self.per_host = per_host or converter.concurrency
+        self.fetched = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def is_done(self):
+        """Nothing in flight and nothing left to start"""
+        converter = self.converter
+        return not converter.in_flight_urls and (
+            not converter.pending_urls or len(converter.visited_urls) >= self.max_pages)
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def rate(self):
+        elapsed = self.elapsed()
+        return self.fetched / elapsed if elapsed > 0 else 0.0
+
+
+class BatchScheduler:
+    """
+    Scrape several configs concurrently under one connection budget
+
+    Args:
+        converters: DocToSkillConverter per config
+        max_connections: Requests in flight across the whole batch
+        per_host: Requests in flight per host (default: each config's
+            `concurrency`)
+    """
+
+    def __init__(self, converters, max_connections=DEFAULT_MAX_CONNECTIONS, per_host=None):
+        self.jobs = [BatchJob(converter, per_host) for converter in converters]
+        self.max_connections = max(1, max_connections)
+        # Round-robin order, kept across fills so every config gets its turn
+        self._turns = deque(self.jobs)
+
+        # Configs on the same host share its throttle and its in-flight slots
+        throttles = {}
+        for job in self.jobs:
+            job.converter.throttle = throttles.setdefault(job.host, job.converter.throttle)
+
+    def _fill(self, executor, futures, in_flight):
+        """Start fetches round-robin across configs until the budget is used"""
+        idle = 0
+        while idle < len(self._turns) and len(futures) < self.max_connections:
+            job = self._turns[0]
+            # Back of the line: every other config gets a turn first
+            self._turns.rotate(-1)
+            url = None
+            if job.finished_at is None and in_flight[job.host] < job.per_host:
+                url = job.converter.next_fetch(job.max_pages)
+            if url is None:
+                idle += 1
+                continue
+            idle = 0
+            if job.started_at is None:
+                job.started_at = time.time()
+            futures[executor.submit(job.converter.fetch_page, url)] = (job, url)
+            in_flight[job.host] += 1
+
+    def run(self):
+        """Scrape every config; returns the jobs with their counters"""
+        for job in self.jobs:
+            converter = job.converter
+            converter.crawl_start_time = time.time()
+            converter.crawl_start_count = converter.pages_scraped
+            if converter.config.get('sitemap'):
+                converter.seed_from_sitemap()
+            # Same as scrape_all: a fresh scrape starts from the last preview
+            if not converter.resume:
+                converter.seed_from_preview()
+
+        futures = {}
+        in_flight = defaultdict(int)
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            while True:
+                self._fill(executor, futures, in_flight)
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, url = futures.pop(future)
+                    in_flight[job.host] -= 1
+                    page = future.result()
+                    job.fetched += 1
+                    if not page:
+                        job.failed += 1
+                    job.converter.finish_fetch(url, page)
+                    if job.is_done():
+                        self._finish(job)
+
+        # Configs that never needed a fetch (empty frontier, fully reused)
+        for job in self.jobs:
+            if job.finished_at is None:
+                self._finish(job)
+        return self.jobs
+
+    def _finish(self, job):
+        job.finished_at = time.time()
+        print(f"\n🏁 {job.name}: {job.fetched} pages in {job.elapsed():.1f}s ({job.rate():.1f} pages/sec)")
+        job.converter.finish_scrape()
+
+
+def print_report(jobs, elapsed):
+    """Per-config throughput table"""
+    print(f"\n{'='*70}")
+    print("BATCH SCRAPE RESULTS")
+    print(f"{'='*70}\n")
+    print(f"{'Config':<24} {'Host':<26} {'Pages':>6} {'Failed':>6} {'Pages/s':>8}")
+    for job in jobs:
+        print(f"{job.name[:24]:<24} {job.host[:26]:<26} {job.fetched:>6} {job.failed:>6} {job.rate():>8.1f}")
+
+    total = sum(job.fetched for job in jobs)
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"\n✅ {len(jobs)} configs, {total} pages in {elapsed:.1f}s ({rate:.1f} pages/sec overall)")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Scrape several Skill Seeker configs at once',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Scrape three configs sharing 16 connections
+  python3 batch_scrape.py configs/react.json configs/vue.json configs/godot.json
+
+  # Bigger connection budget, at most 4 requests in flight per host
+  python3 batch_scrape.py configs/*.json --max-connections 32 --per-host 4
+
+  # Scrape only; build the skills later with --skip-scrape
+  python3 batch_scrape.py configs/*.json --skip-build
+        """
+    )
+
+    parser.add_argument('configs', nargs='+', help='Config JSON files')
+    parser.add_argument('--max-connections', '-c', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                       help=f'Requests in flight across all configs (default: {DEFAULT_MAX_CONNECTIONS})')
+    parser.add_argument('--per-host', type=int,
+                       help='Requests in flight per host (default: each config\'s concurrency)')
+    parser.add_argument('--max-pages', type=int, help='Override max_pages for every config')
+    parser.add_argument('--resume', action='store_true', help='Resume each config from its checkpoint')
+    parser.add_argument('--skip-build', action='store_true', help='Scrape only, do not build skills')
+
+    args = parser.parse_args()
+
+    converters = []
+    names = set()
+    for path in args.configs:
+        config = load_config(path)
+        if config['name'] in names:
+            print(f"❌ Two configs are named '{config['name']}' - they would share an output directory")
+            return 1
+        names.add(config['name'])
+        if args.max_pages:
+            config['max_pages'] = args.max_pages
+        converters.append(DocToSkillConverter(config, resume=args.resume))
+
+    scheduler = BatchScheduler(converters, args.max_connections, args.per_host)
+    hosts = len({job.host for job in scheduler.jobs})
+    print(f"📚 Batch: {len(converters)} configs on {hosts} hosts, "
+          f"{scheduler.max_connections} connections")
+
+    start = time.time()
+    try:
+        jobs = scheduler.run()
+    except KeyboardInterrupt:
+        print("\n\nBatch interrupted.")
+        for converter in converters:
+            if converter.manifest:
+                converter.manifest.save()
+            if converter.checkpoint_enabled:
+                converter.save_checkpoint()
+        print("💾 Progress saved - rerun with --resume to continue")
+        return 1
+
+    print_report(jobs, time.time() - start)
+
+    failed = []
+    for converter in converters:
+        if converter.checkpoint_enabled:
+            converter.clear_checkpoint()
+        if not args.skip_build and not converter.build_skill():
+            failed.append(converter.name)
+
+    if failed:
+        print(f"\n❌ Build failed for: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Content-addressed blob cache for Skill Seeker
+A user-level cache, shared by every config, of raw response bodies and
+extracted pages. Configs that crawl the same site (godot.json,
+godot-large-example.json, the children of split_config) fetch and parse
+each page once instead of once per output/<name>_data directory.
+
+    ~/.cache/skillseeker/            ($SKILLSEEKER_CACHE or $XDG_CACHE_HOME/skillseeker)
+        blobs/ab/ab12...             zlib-compressed blob, named by SHA-256 of its content
+        index.sqlite                 urls:      URL -> final URL, body hash, fetched_at
+                                     extracted: (body, URL, extraction settings) -> page blob
+                                     blobs:     size and last use, for LRU eviction
+
+A body fetched less than max_age ago is reused without any request. Older
+ones are fetched again (through the per-config HTTP cache, so usually a
+304). Once the blobs exceed max_bytes, the least recently used are deleted
+until 90% of the budget is left.
+
+Enable it per config:
+    "blob_cache": true
+    "blob_cache": {"max_age": 86400, "max_bytes": 2000000000, "dir": "/shared/cache"}
+or with --blob-cache. Several processes may share one cache.
+
+    python3 cli/blob_cache.py stats
+    python3 cli/blob_cache.py evict --max-bytes 500000000
+    python3 cli/blob_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_MAX_AGE = 24 * 3600
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# Eviction stops once this share of max_bytes is left
+EVICT_TO = 0.9
+# Blobs written between size checks
+EVICT_CHECK_INTERVAL = 200
+
+
+def cache_dir():
+    """User-level cache directory"""
+    if os.environ.get('SKILLSEEKER_CACHE'):
+        return Path(os.environ['SKILLSEEKER_CACHE'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'skillseeker'
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobCache:
+    """
+    Bodies and extracted pages by content hash, with a URL map and LRU eviction
+
+    Args:
+        root: Cache directory (default: cache_dir())
+        max_age: Seconds a cached body is reused without a request
+        max_bytes: Size budget of the blobs (compressed)
+    """
+
+    def __init__(self, root=None, max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root) if root else cache_dir()
+        self.blob_dir = self.root / 'blobs'
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / 'index.sqlite'), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " hash TEXT PRIMARY KEY, size INTEGER, last_used REAL);"
+            "CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs(last_used);"
+            "CREATE TABLE IF NOT EXISTS urls ("
+            " url TEXT PRIMARY KEY, final_url TEXT, hash TEXT, content_type TEXT, fetched_at REAL);"
+            "CREATE TABLE IF NOT EXISTS extracted ("
+            " key TEXT PRIMARY KEY, hash TEXT);"
+        )
+        self._conn.commit()
+        self._writes = 0
+
+        # Stats for the end-of-scrape report
+        self.bodies_reused = 0
+        self.pages_reused = 0
+        self.bytes_reused = 0
+
+    # --- Blobs ---------------------------------------------------------------
+
+    def _path(self, digest):
+        return self.blob_dir / digest[:2] / digest
+
+    def put_blob(self, data):
+        """Store data (if new) and return its hash"""
+        digest = sha256(data)
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial blob
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix='.tmp-')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(data))
+            os.replace(tmp, str(path))
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)",
+                               (digest, path.stat().st_size, time.time()))
+        self._writes += 1
+        if self._writes % EVICT_CHECK_INTERVAL == 0:
+            self.evict()
+        return digest
+
+    def get_blob(self, digest):
+        """Blob content, or None if it was evicted"""
+        try:
+            with open(str(self._path(digest)), 'rb') as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+            return None
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE blobs SET last_used = ? WHERE hash = ?", (time.time(), digest))
+        return data
+
+    # --- Responses -----------------------------------------------------------
+
+    def store_response(self, url, response):
+        """Remember a 200 response to a request for url (response.url is where it ended up)"""
+        digest = self.put_blob(response.content)
+        final_url = getattr(response, 'url', None)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?)",
+                (url, final_url if isinstance(final_url, str) else url, digest,
+                 response.headers.get('Content-Type', ''), time.time()))
+
+    def response(self, url):
+        """
+        Cached 200 response for url if it is younger than max_age
+
+        Returns:
+            requests.Response: With from_cache=True, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT final_url, hash, content_type, fetched_at FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None or time.time() - row[3] > self.max_age:
+            return None
+        final_url, digest, content_type, _ = row
+        body = self.get_blob(digest)
+        if body is None:
+            return None
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = final_url
+        response.headers = CaseInsensitiveDict({'Content-Type': content_type or 'text/html'})
+        response._content = body
+        response.from_cache = True
+        self.bodies_reused += 1
+        self.bytes_reused += len(body)
+        return response
+
+    # --- Extracted pages -----------------------------------------------------
+
+    @staticmethod
+    def extract_key(url, body, settings):
+        """Key of an extraction: the body, the URL it came from and the extraction settings"""
+        return sha256(b'\0'.join([sha256(body).encode(), url.encode('utf-8'), settings.encode('utf-8')]))
+
+    def get_extracted(self, key):
+        """Stored extraction result, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT hash FROM extracted WHERE key = ?", (key,)).fetchone()
+        data = self.get_blob(row[0]) if row else None
+        if data is None:
+            return None
+        self.pages_reused += 1
+        return json.loads(data.decode('utf-8'))
+
+    def put_extracted(self, key, value):
+        digest = self.put_blob(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO extracted VALUES (?, ?)", (key, digest))
+
+    # --- Maintenance ---------------------------------------------------------
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used blobs while the cache is over budget
+
+        Returns:
+            int: Bytes freed
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total = self.total_bytes()
+        if total <= max_bytes:
+            return 0
+
+        target = total - max_bytes * EVICT_TO
+        freed = 0
+        evicted = []
+        with self._lock:
+            for digest, size in self._conn.execute("SELECT hash, size FROM blobs ORDER BY last_used").fetchall():
+                if freed >= target:
+                    break
+                evicted.append((digest,))
+                freed += size
+            with self._conn:
+                self._conn.executemany("DELETE FROM blobs WHERE hash = ?", evicted)
+                self._conn.executemany("DELETE FROM urls WHERE hash = ?", evicted)
+                self._conn.executemany("DELETE FROM extracted WHERE hash = ?", evicted)
+        for digest, in evicted:
+            try:
+                os.remove(str(self._path(digest)))
+            except OSError:
+                pass
+        return freed
+
+    def clear(self):
+        """Delete every blob and mapping"""
+        with self._lock, self._conn:
+            for table in ('blobs', 'urls', 'extracted'):
+                self._conn.execute(f"DELETE FROM {table}")
+        shutil.rmtree(str(self.blob_dir), ignore_errors=True)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+    def counts(self):
+        with self._lock:
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ('blobs', 'urls', 'extracted')}
+
+    def summary(self):
+        """One-line report of what the cache saved this run"""
+        return (f"{self.bodies_reused} bodies and {self.pages_reused} extracted pages reused, "
+                f"{self.bytes_reused / 1024:.1f} KB not fetched")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def blob_cache_options(config):
+    """The config's blob_cache setting as a dict, or None if it is off"""
+    value = config.get('blob_cache', False)
+    if value is True:
+        return {}
+    if isinstance(value, dict):
+        return value
+    return None
+
+
+def open_blob_cache(config):
+    """BlobCache for a config, or None if it does not enable one"""
+    options = blob_cache_options(config)
+    if options is None:
+        return None
+    return BlobCache(options.get('dir'),
+                     max_age=options.get('max_age', DEFAULT_MAX_AGE),
+                     max_bytes=options.get('max_bytes', DEFAULT_MAX_BYTES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or trim the shared blob cache')
+    parser.add_argument('command', choices=['stats', 'evict', 'clear'])
+    parser.add_argument('--dir', help=f'Cache directory (default: {cache_dir()})')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES, help='Budget for evict')
+    args = parser.parse_args()
+
+    cache = BlobCache(args.dir)
+    if args.command == 'stats':
+        counts = cache.counts()
+        print(f"Cache: {cache.root}")
+        print(f"Blobs: {counts['blobs']} ({cache.total_bytes() / 1024 / 1024:.1f} MB)")
+        print(f"URLs: {counts['urls']}")
+        print(f"Extracted pages: {counts['extracted']}")
+    elif args.command == 'evict':
+        freed = cache.evict(args.max_bytes)
+        print(f"✅ Freed {freed / 1024 / 1024:.1f} MB")
+    else:
+        cache.clear()
+        print(f"✅ Cleared {cache.root}")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
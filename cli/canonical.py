@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+URL canonicalization for Skill Seeker
+Collapses the many spellings of one page (anchors, tracking parameters,
+trailing slashes, index.html, redirect aliases) so the crawl fetches it once.
+
+Two forms are produced:
+    canonicalize(url)  URL to fetch and store: lowercase scheme/host, no
+                       default port, no fragment, filtered and sorted query
+    key(url)           identity used for dedup: the canonical URL with
+                       trailing slashes and index files folded, after
+                       following recorded redirects
+
+Config (all optional):
+    "canonical": {
+        "strip_fragment": true,
+        "drop_params": ["highlight", "utm_*"],
+        "sort_query": true,
+        "index_files": ["index.html", "index.htm"],
+        "fold_trailing_slash": true
+    }
+"""
+
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+DEFAULT_OPTIONS = {
+    'strip_fragment': True,
+    # Sphinx search highlighting, analytics and referral tags never change the page
+    'drop_params': ['highlight', 'utm_*', 'ref', 'gclid', 'fbclid', '_ga'],
+    'sort_query': True,
+    'index_files': ['index.html', 'index.htm'],
+    'fold_trailing_slash': True,
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonical_options(config=None):
+    """Canonicalization options from config['canonical'] layered over the defaults"""
+    options = dict(DEFAULT_OPTIONS)
+    if config:
+        overrides = config.get('canonical', {})
+        options.update({k: v for k, v in overrides.items() if k in DEFAULT_OPTIONS})
+    return options
+
+
+class UrlCanonicalizer:
+    """Canonical URLs and dedup keys, plus the redirect aliases seen so far"""
+
+    def __init__(self, config=None):
+        options = canonical_options(config)
+        self.strip_fragment = options['strip_fragment']
+        self.sort_query = options['sort_query']
+        self.index_files = tuple(options['index_files'])
+        self.fold_trailing_slash = options['fold_trailing_slash']
+        self.drop_exact = set()
+        self.drop_prefixes = []
+        for param in options['drop_params']:
+            if param.endswith('*'):
+                self.drop_prefixes.append(param[:-1])
+            else:
+                self.drop_exact.add(param)
+
+        self.redirects = {}   # key of requested URL -> key of final URL
+        self._lock = threading.Lock()
+
+    def _keep_param(self, name):
+        return name not in self.drop_exact and not name.startswith(tuple(self.drop_prefixes))
+
+    def canonicalize(self, url):
+        """URL to fetch and store for url"""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        netloc = parts.hostname or ''
+        if ':' in netloc:
+            netloc = f"[{netloc}]"  # IPv6 literal
+        try:
+            port = parts.port
+        except ValueError:
+            return url  # malformed port: leave it for is_valid_url/fetch to reject
+        if port and port != DEFAULT_PORTS.get(scheme):
+            netloc = f"{netloc}:{port}"
+        if parts.username:
+            netloc = f"{parts.username}@{netloc}"
+
+        query = parts.query
+        if query:
+            params = [(k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+                      if self._keep_param(k)]
+            if self.sort_query:
+                params.sort()
+            query = urlencode(params)
+
+        fragment = '' if self.strip_fragment else parts.fragment
+        return urlunsplit((scheme, netloc, parts.path or '/', query, fragment))
+
+    def _fold(self, url):
+        """Dedup key of a canonical URL, ignoring redirects"""
+        parts = urlsplit(url)
+        path = parts.path
+        for index in self.index_files:
+            if path.endswith('/' + index):
+                path = path[:-len(index)]
+                break
+        if self.fold_trailing_slash and len(path) > 1:
+            path = path.rstrip('/') or '/'
+        return urlunsplit((parts.scheme, parts.netloc, path, parts.query, parts.fragment))
+
+    def key(self, url):
+        """Identity of url for dedup: same key means same page"""
+        folded = self._fold(self.canonicalize(url))
+        return self.redirects.get(folded, folded)
+
+    def record_redirect(self, requested, final):
+        """
+        Remember that requested redirected to final, so later links to either
+        spelling resolve to one key. Safe to call from worker threads.
+
+        Returns:
+            bool: True if the URLs are different pages by key
+        """
+        source = self._fold(self.canonicalize(requested))
+        target = self.key(final)
+        if source == target:
+            return False
+        with self._lock:
+            self.redirects[source] = target
+        return True
+
+    def load_redirects(self, redirects):
+        """Restore aliases saved in a checkpoint"""
+        with self._lock:
+            self.redirects.update(redirects)
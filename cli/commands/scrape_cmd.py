@@ -54,6 +54,48 @@ def run_scrape(console, config, skip_scrape, resume, fresh, max_pages):
         sys.exit(130)
 
 
+def batch_scrape(console, configs, max_connections, per_host, max_pages, resume, skip_build):
+    """Scrape several configs at once under one connection budget"""
+    config_paths = []
+    for config in configs:
+        config_path = find_config(config)
+        if not config_path:
+            console.print(f"❌ Config not found: {config}", style="red")
+            sys.exit(1)
+        config_paths.append(str(config_path))
+
+    cmd = ['python3', 'cli/batch_scrape.py', *config_paths,
+           '--max-connections', str(max_connections)]
+
+    if per_host:
+        cmd.extend(['--per-host', str(per_host)])
+    if max_pages:
+        cmd.extend(['--max-pages', str(max_pages)])
+    if resume:
+        cmd.append('--resume')
+    if skip_build:
+        cmd.append('--skip-build')
+
+    console.print(create_step_panel(
+        1, 1,
+        "Batch Scraping Documentation",
+        f"Configs: [cyan]{len(config_paths)}[/cyan]\n"
+        f"Connections: {max_connections}\n"
+        f"Per host: {per_host or 'config concurrency'}",
+        status="running"
+    ))
+
+    try:
+        subprocess.run(cmd, check=True)
+        console.print("\n✅ Batch scrape complete!", style="green bold")
+    except subprocess.CalledProcessError:
+        console.print("\n❌ Batch scrape failed", style="red bold")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        console.print("\n\n⚠️  Interrupted by user", style="yellow")
+        sys.exit(130)
+
+
 def estimate_pages(console, config, max_discovery):
     """Estimate page count before scraping"""
     config_path = find_config(config)
@@ -4,6 +4,8 @@ Shows project overview, cached data, built skills, suggestions
 """
 
 import json
+import sqlite3
+import sys
 from pathlib import Path
 from rich.table import Table
 from rich.panel import Panel
@@ -87,6 +89,10 @@ def _show_cached_data_status(console, detailed):
     if data_dirs:
         console.print(f"[bold]💾 Cached Data:[/bold] {len(data_dirs)} skills")
 
+        # Corpus databases are read-only safe, so counts are live even mid-scrape
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        from corpus_db import open_corpus
+
         for data_dir in sorted(data_dirs):
             # Get summary
             summary_file = data_dir / "summary.json"
@@ -109,6 +115,19 @@ def _show_cached_data_status(console, detailed):
             else:
                 console.print(f"   ├─ {data_dir.stem}")
 
+            try:
+                corpus = open_corpus(data_dir)
+                if corpus is not None:
+                    stats = corpus.stats()
+                    corpus.close()
+                    console.print(f"   │  └─ corpus: {stats['pages']} pages, "
+                                  f"{stats['code_samples']} code samples, {stats['links']} links")
+                    if detailed and stats['languages']:
+                        languages = ", ".join(f"{lang} ({n})" for lang, n in stats['languages'])
+                        console.print(f"   │     languages: {languages}")
+            except sqlite3.Error as e:
+                console.print(f"   │  └─ corpus: unreadable ({e})")
+
         console.print()
 
 
@@ -116,10 +116,13 @@ def full_workflow(console, config, enhance, upload):
     console.print(f"\n[bold green]🎉 Full workflow complete! ({total_time/60:.1f} minutes)[/bold green]")
 
 
-def rebuild_workflow(console, skill_name, enhance, upload):
+def rebuild_workflow(console, skill_name, enhance, upload, incremental=False):
     """Fast rebuild: build → enhance → package (uses cached data)"""
     console.print("\n[bold cyan]⚡ Rebuild Workflow[/bold cyan]")
-    console.print("[dim]Steps: Build (from cache) → Enhance → Package[/dim]\n")
+    if incremental:
+        console.print("[dim]Steps: Incremental scrape → Build (affected files) → Enhance → Package[/dim]\n")
+    else:
+        console.print("[dim]Steps: Build (from cache) → Enhance → Package[/dim]\n")
 
     # Check if cached data exists
     data_dir = Path(f'output/{skill_name}_data')
@@ -129,9 +132,20 @@ def rebuild_workflow(console, skill_name, enhance, upload):
         sys.exit(1)
 
     # Build steps
-    steps = [
-        ("Build from cache", ['python3', 'cli/doc_scraper.py', '--name', skill_name, '--skip-scrape']),
-    ]
+    if incremental:
+        # Re-scraping needs the config, not just the cached data
+        config_path = find_config(skill_name)
+        if not config_path:
+            console.print(f"❌ Config not found: {skill_name}", style="red")
+            sys.exit(1)
+        steps = [
+            ("Incremental scrape + build",
+             ['python3', 'cli/doc_scraper.py', '--config', str(config_path), '--incremental']),
+        ]
+    else:
+        steps = [
+            ("Build from cache", ['python3', 'cli/doc_scraper.py', '--name', skill_name, '--skip-scrape']),
+        ]
 
     if enhance == 'local':
         steps.append(("Enhance (local)", ['python3', 'cli/enhance_skill_local.py', f'output/{skill_name}/']))
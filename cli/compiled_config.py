@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compiled config for Skill Seeker
+The parts of a config consulted for every link and every page, compiled
+once per run instead of re-read from the config dict on each call.
+
+    UrlFilter       base_url prefix plus url_patterns: all include substrings
+                    in one regex alternation, all exclude substrings in
+                    another, so a URL costs two scans instead of one
+                    substring test per pattern
+    CompiledConfig  the URL filter plus the title, main_content and
+                    code_blocks selectors compiled with soupsieve
+
+Invalid patterns or selectors raise ValueError when the config is compiled,
+so validate_config reports them before a crawl starts.
+"""
+
+import re
+
+import soupsieve
+
+
+DEFAULT_SELECTORS = {
+    'main_content': 'div[role="main"]',
+    'title': 'title',
+    'code_blocks': 'pre code',
+}
+
+
+def _any_substring(patterns):
+    """Regex search matching any of the literal substrings, or None if there are none"""
+    if not patterns:
+        return None
+    # Sorted and deduplicated so equal pattern sets compile to the same regex
+    return re.compile('|'.join(re.escape(pattern) for pattern in sorted(set(patterns)))).search
+
+
+def _patterns(url_patterns, key):
+    patterns = url_patterns.get(key) or []
+    if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+        raise ValueError(f"'url_patterns.{key}' must be a list of strings")
+    return patterns
+
+
+class UrlFilter:
+    """
+    Scope test for URLs: under the prefix, matching an include pattern (if
+    any are set) and no exclude pattern
+
+    Args:
+        prefix: URLs must start with this (usually base_url)
+        includes: Substrings of which a URL must contain one (empty: any URL)
+        excludes: Substrings a URL must not contain
+    """
+
+    def __init__(self, prefix, includes=(), excludes=()):
+        self.prefix = prefix
+        self.includes = list(includes)
+        self.excludes = list(excludes)
+        self._include = _any_substring(self.includes)
+        self._exclude = _any_substring(self.excludes)
+
+    def __call__(self, url):
+        if not url.startswith(self.prefix):
+            return False
+        if self._include is not None and self._include(url) is None:
+            return False
+        return self._exclude is None or self._exclude(url) is None
+
+    def describe(self):
+        return f"{len(self.includes)} include, {len(self.excludes)} exclude patterns"
+
+
+class CompiledConfig:
+    """
+    URL filter and selectors of one config
+
+    Attributes:
+        selectors: Selector strings, defaults filled in
+        title, main_content, code_blocks: Compiled soupsieve selectors
+        is_valid_url: UrlFilter for base_url and url_patterns
+
+    Raises:
+        ValueError: url_patterns or a selector is malformed
+    """
+
+    def __init__(self, config):
+        selectors = config.get('selectors') or {}
+        if not isinstance(selectors, dict):
+            raise ValueError("'selectors' must be a dictionary")
+        self.selectors = dict(DEFAULT_SELECTORS)
+        self.selectors.update({key: value for key, value in selectors.items() if value})
+
+        for key in DEFAULT_SELECTORS:
+            selector = self.selectors[key]
+            try:
+                compiled = soupsieve.compile(selector)
+            except (soupsieve.SelectorSyntaxError, TypeError) as e:
+                raise ValueError(f"Invalid selector 'selectors.{key}': {selector!r} ({e})") from None
+            setattr(self, key, compiled)
+
+        url_patterns = config.get('url_patterns') or {}
+        if not isinstance(url_patterns, dict):
+            raise ValueError("'url_patterns' must be a dictionary")
+        self.is_valid_url = UrlFilter(config.get('base_url', ''),
+                                      _patterns(url_patterns, 'include'),
+                                      _patterns(url_patterns, 'exclude'))
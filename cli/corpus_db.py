@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Corpus database for Skill Seeker
+An optional SQLite copy of the scraped pages in
+output/<name>_data/corpus.sqlite (enabled with "corpus_db": true in the
+config), so categorization, the quick reference, router keywords and status
+reports run as indexed queries instead of loading every page into Python.
+
+    pages           url, title, content (FTS5 index pages_fts on title and content)
+    headings        page_id, position, level, text
+    code_samples    page_id, position, language, confidence, code
+    patterns        page_id, position, description, code
+    links           page_id, target
+
+The scraper writes in batched transactions. The database is in WAL mode, so
+read-only connections (CorpusDB(path, readonly=True)) can query it while a
+scrape is still writing; they see the last committed batch.
+
+    python3 cli/corpus_db.py build output/react_data      # (re)index the page store
+    python3 cli/corpus_db.py search output/react_data "state hook"
+    python3 cli/corpus_db.py stats output/react_data
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+# Pages per write transaction
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    content TEXT NOT NULL DEFAULT '',
+    stored_at REAL
+);
+CREATE TABLE IF NOT EXISTS headings (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    position INTEGER,
+    level TEXT,
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS code_samples (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    position INTEGER,
+    language TEXT,
+    confidence REAL,
+    code TEXT
+);
+CREATE TABLE IF NOT EXISTS patterns (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    position INTEGER,
+    description TEXT,
+    code TEXT
+);
+CREATE TABLE IF NOT EXISTS links (
+    page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    target TEXT
+);
+CREATE INDEX IF NOT EXISTS headings_page ON headings(page_id);
+CREATE INDEX IF NOT EXISTS code_samples_page ON code_samples(page_id);
+CREATE INDEX IF NOT EXISTS code_samples_language ON code_samples(language);
+CREATE INDEX IF NOT EXISTS patterns_page ON patterns(page_id);
+CREATE INDEX IF NOT EXISTS links_page ON links(page_id);
+CREATE INDEX IF NOT EXISTS links_target ON links(target);
+"""
+
+# External-content FTS5 index kept in sync with pages by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    title, content, content='pages', content_rowid='id'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_vocab USING fts5vocab(pages_fts, 'col');
+CREATE TRIGGER IF NOT EXISTS pages_fts_insert AFTER INSERT ON pages BEGIN
+    INSERT INTO pages_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_fts_delete AFTER DELETE ON pages BEGIN
+    INSERT INTO pages_fts(pages_fts, rowid, title, content)
+    VALUES ('delete', old.id, old.title, old.content);
+END;
+"""
+
+# Title words too generic to route on
+STOPWORDS = {
+    'about', 'and', 'for', 'from', 'guide', 'how', 'into', 'introduction',
+    'overview', 'page', 'reference', 'the', 'this', 'using', 'what', 'when',
+    'with', 'your', 'documentation', 'docs',
+}
+
+
+class CorpusDB:
+    """
+    SQLite corpus of scraped pages
+
+    Args:
+        path: Database file
+        readonly: Open an existing database for queries only (safe while a
+            scraper writes to it)
+        batch_size: Pages buffered by add() per write transaction
+    """
+
+    def __init__(self, path, readonly=False, batch_size=BATCH_SIZE):
+        self.path = str(path)
+        self.readonly = readonly
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending = []
+
+        if readonly:
+            uri = Path(self.path).resolve().as_uri() + '?mode=ro'
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(FTS_SCHEMA)
+            except sqlite3.OperationalError as e:
+                print(f"⚠️  SQLite without FTS5, corpus search disabled: {e}")
+            self._conn.commit()
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self.has_fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'pages_fts'").fetchone() is not None
+
+    # --- Writing -------------------------------------------------------------
+
+    def add(self, page):
+        """Queue a page (replacing any stored page with its URL); written per batch"""
+        self._pending.append(page)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write queued pages in one transaction"""
+        if not self._pending:
+            return
+        with self._lock, self._conn:
+            for page in self._pending:
+                self._write(page)
+        self._pending = []
+
+    def _write(self, page):
+        self._conn.execute("DELETE FROM pages WHERE url = ?", (page['url'],))
+        page_id = self._conn.execute(
+            "INSERT INTO pages (url, title, content, stored_at) VALUES (?, ?, ?, ?)",
+            (page['url'], page.get('title') or '', page.get('content') or '', time.time())
+        ).lastrowid
+        self._conn.executemany(
+            "INSERT INTO headings VALUES (?, ?, ?, ?)",
+            [(page_id, i, h.get('level'), h.get('text')) for i, h in enumerate(page.get('headings', []))])
+        self._conn.executemany(
+            "INSERT INTO code_samples VALUES (?, ?, ?, ?, ?)",
+            [(page_id, i, s.get('language'), s.get('language_confidence'), s.get('code'))
+             for i, s in enumerate(page.get('code_samples', []))])
+        self._conn.executemany(
+            "INSERT INTO patterns VALUES (?, ?, ?, ?)",
+            [(page_id, i, p.get('description'), p.get('code')) for i, p in enumerate(page.get('patterns', []))])
+        self._conn.executemany(
+            "INSERT INTO links VALUES (?, ?)", [(page_id, link) for link in page.get('links', [])])
+
+    def delete(self, url):
+        """Remove a page"""
+        self.flush()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+
+    def clear(self):
+        """Remove every page"""
+        self._pending = []
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+
+    def rebuild(self, pages):
+        """
+        Replace the corpus with pages (e.g. from the page store)
+
+        Returns:
+            int: Pages written
+        """
+        self.clear()
+        count = 0
+        for page in pages:
+            self.add(page)
+            count += 1
+        self.flush()
+        if self.has_fts:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT INTO pages_fts(pages_fts) VALUES ('optimize')")
+        return count
+
+    def close(self):
+        if not self.readonly:
+            self.flush()
+        self._conn.close()
+
+    # --- Queries -------------------------------------------------------------
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM pages")[0][0]
+
+    def urls(self):
+        """URLs in the order pages were stored"""
+        return [url for url, in self._query("SELECT url FROM pages ORDER BY id")]
+
+    def categorize(self, category_defs):
+        """
+        smart_categorize as one query: each page goes to the first category
+        whose keywords score at least 2 (3 per hit in the URL, 2 in the
+        title, 1 in the first 500 characters of content), else to 'other'.
+        Case folding is SQLite's lower(), which only folds ASCII letters.
+
+        Args:
+            category_defs: {category: [keywords]}
+
+        Returns:
+            dict: {category: [urls]} without empty categories
+        """
+        # Numbered parameters, so each keyword is bound once however often it is used
+        params = []
+
+        def param(value):
+            params.append(value)
+            return f"?{len(params)}"
+
+        cases = []
+        for cat, keywords in category_defs.items():
+            terms = []
+            for keyword in keywords:
+                p = param(keyword.lower())
+                terms.append(f"(instr(u, {p}) > 0) * 3 + (instr(t, {p}) > 0) * 2 + (instr(c, {p}) > 0)")
+            if terms:
+                cases.append(f"WHEN {' + '.join(terms)} >= 2 THEN {param(cat)}")
+        category = f"CASE {' '.join(cases)} ELSE NULL END" if cases else "NULL"
+
+        rows = self._query(
+            f"SELECT url, {category} FROM ("
+            " SELECT id, url, lower(url) AS u, lower(title) AS t, lower(substr(content, 1, 500)) AS c"
+            " FROM pages) ORDER BY id", params)
+
+        categories = {cat: [] for cat in category_defs}
+        categories['other'] = []
+        for url, cat in rows:
+            categories[cat if cat is not None else 'other'].append(url)
+        return {cat: urls for cat, urls in categories.items() if urls}
+
+    def quick_reference(self, limit=15, max_length=300):
+        """
+        generate_quick_reference as one query: the first patterns (in page
+        order) with distinct code shorter than max_length characters
+
+        Returns:
+            list: [{'description', 'code'}]
+        """
+        # SQLite takes bare columns from the row that min() selected
+        rows = self._query(
+            "SELECT description, code, MIN(rowid) AS first FROM patterns"
+            " WHERE length(code) < ? GROUP BY code ORDER BY first LIMIT ?", (max_length, limit))
+        return [{'description': description, 'code': code} for description, code, _ in rows]
+
+    def top_terms(self, column='title', limit=10, min_length=4):
+        """
+        Words in the most pages' titles (or contents), from the FTS vocabulary
+
+        Returns:
+            list: Terms, most common first
+        """
+        if not self.has_fts:
+            return []
+        rows = self._query(
+            "SELECT term FROM pages_vocab WHERE col = ? AND length(term) >= ?"
+            " ORDER BY doc DESC, term LIMIT ?", (column, min_length, limit + len(STOPWORDS)))
+        return [term for term, in rows if term not in STOPWORDS and not term.isdigit()][:limit]
+
+    def search(self, query, limit=10):
+        """
+        Full-text search, best match first
+
+        Returns:
+            list: [(url, title, snippet)]
+        """
+        if not self.has_fts:
+            raise RuntimeError("corpus search needs SQLite with FTS5")
+        return self._query(
+            "SELECT pages.url, pages.title, snippet(pages_fts, 1, '[', ']', '…', 12)"
+            " FROM pages_fts JOIN pages ON pages.id = pages_fts.rowid"
+            " WHERE pages_fts MATCH ? ORDER BY rank LIMIT ?", (query, limit))
+
+    def stats(self):
+        """Page, code sample and link counts plus the most common languages"""
+        counts = self._query(
+            "SELECT (SELECT COUNT(*) FROM pages), (SELECT COUNT(*) FROM code_samples),"
+            " (SELECT COUNT(*) FROM links)")[0]
+        languages = self._query(
+            "SELECT language, COUNT(*) FROM code_samples GROUP BY language ORDER BY 2 DESC, 1 LIMIT 5")
+        return {'pages': counts[0], 'code_samples': counts[1], 'links': counts[2], 'languages': languages}
+
+
+def open_corpus(data_dir, readonly=True):
+    """CorpusDB of output/<name>_data, or None if it has none"""
+    path = os.path.join(str(data_dir), 'corpus.sqlite')
+    if readonly and not os.path.exists(path):
+        return None
+    return CorpusDB(path, readonly=readonly)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query a scrape\'s corpus database')
+    parser.add_argument('command', choices=['build', 'search', 'stats'])
+    parser.add_argument('data_dir', help='Scrape data directory, e.g. output/react_data')
+    parser.add_argument('query', nargs='?', help='FTS5 query (search)')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        try:
+            from page_store import PageStore
+        except ImportError:
+            sys.path.insert(0, str(Path(__file__).parent))
+            from page_store import PageStore
+        corpus = open_corpus(args.data_dir, readonly=False)
+        count = corpus.rebuild(PageStore(os.path.join(args.data_dir, 'pages')).pages())
+        corpus.close()
+        print(f"✅ Indexed {count} pages into {corpus.path}")
+        return
+
+    corpus = open_corpus(args.data_dir)
+    if corpus is None:
+        print(f"❌ No corpus database in {args.data_dir} (run: python3 cli/corpus_db.py build {args.data_dir})")
+        sys.exit(1)
+
+    if args.command == 'search':
+        if not args.query:
+            parser.error("search needs a query")
+        for url, title, snippet in corpus.search(args.query, args.limit):
+            print(f"{title}\n  {url}\n  {snippet}\n")
+    else:
+        stats = corpus.stats()
+        print(f"Pages: {stats['pages']}")
+        print(f"Code samples: {stats['code_samples']}")
+        print(f"Links: {stats['links']}")
+        print("Languages: " + ", ".join(f"{lang} ({n})" for lang, n in stats['languages']))
+        print("Top title terms: " + ", ".join(corpus.top_terms()))
+    corpus.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Duplicate page detection for Skill Seeker
+Doc sites serve one page under many URLs (/stable/ and /latest/, language
+mirrors, print views). The scraper fingerprints each page's main content
+right after parsing; a page whose fingerprint was seen before is recorded as
+an alias and is not extracted, saved or expanded.
+
+Fingerprints:
+    exact  SHA-1 of the whitespace-normalized main-content text
+    near   64-bit SimHash of 3-word shingles (optional), matched within
+           max_distance differing bits
+
+Config:
+    "dedup": {"enabled": true, "near_duplicates": false, "max_distance": 3}
+"""
+
+import hashlib
+import re
+import threading
+from multiprocessing.managers import BaseManager
+
+
+DEFAULT_OPTIONS = {
+    'enabled': True,
+    'near_duplicates': False,
+    'max_distance': 3,
+}
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """Collapse whitespace and case so layout-only differences do not matter"""
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+def simhash(text):
+    """64-bit SimHash of a normalized text's word shingles"""
+    words = text.split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = [' '.join(words)]
+    else:
+        shingles = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if weights[bit] > 0)
+
+
+def hamming(a, b):
+    """Number of differing bits"""
+    return bin(a ^ b).count('1')
+
+
+def band_keys(value, max_distance):
+    """
+    (band index, band value) pairs of a SimHash
+
+    The hash is split into max_distance + 1 bands. Two hashes within
+    max_distance bits agree on at least one band, so only pages sharing a
+    band need comparing.
+    """
+    bands = max_distance + 1
+    width = SIMHASH_BITS // bands
+    mask = (1 << width) - 1
+    return [(i, value >> (i * width) & mask) for i in range(bands)]
+
+
+def dedup_options(config):
+    """Config 'dedup' section merged over the defaults"""
+    return dict(DEFAULT_OPTIONS, **config.get('dedup', {}))
+
+
+class DuplicateDetector:
+    """
+    Remembers fingerprints of scraped pages; safe to use from worker threads
+
+    Near-duplicate lookups compare only pages sharing a SimHash band (see
+    band_keys).
+    """
+
+    def __init__(self, near_duplicates=False, max_distance=3):
+        self.near_duplicates = near_duplicates
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._exact = {}    # sha1 -> first URL
+        self._bands = {}    # (band index, band value) -> [(simhash, URL)]
+
+    def signature(self, text):
+        """
+        Fingerprint of a page's main-content text (stateless, any thread)
+
+        Returns:
+            tuple: (sha1, simhash or None), or None for an empty page
+        """
+        text = normalize_text(text)
+        if not text:
+            return None
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return digest, simhash(text) if self.near_duplicates else None
+
+    def check(self, url, signature):
+        """
+        Register url's fingerprint, or report the page it duplicates
+
+        Returns:
+            str: URL of the earlier page with the same content, or None
+        """
+        if signature is None:
+            return None
+        digest, value = signature
+
+        with self._lock:
+            original = self._exact.get(digest)
+            if original is not None and original != url:
+                return original
+
+            if value is not None:
+                for band in band_keys(value, self.max_distance):
+                    for other, other_url in self._bands.get(band, ()):
+                        if other_url != url and hamming(value, other) <= self.max_distance:
+                            return other_url
+
+            self._exact.setdefault(digest, url)
+            if value is not None:
+                for band in band_keys(value, self.max_distance):
+                    self._bands.setdefault(band, []).append((value, url))
+        return None
+
+
+class DedupManager(BaseManager):
+    """Server process holding one DuplicateDetector for every extraction process"""
+
+
+DedupManager.register('DuplicateDetector', DuplicateDetector, exposed=['check'])
+
+
+class SharedDetector:
+    """
+    Detector of one of several processes: fingerprints are computed here, and
+    checked against an index every process shares, so a page is a duplicate
+    of pages any process has seen
+
+    Args:
+        check: (url, signature) -> earlier URL or None; the check of a
+            DedupManager.DuplicateDetector proxy, or a shared frontier's
+            check_duplicate (--workers, where processes may run on other hosts)
+    """
+
+    def __init__(self, check, near_duplicates=False, max_distance=3):
+        self.near_duplicates = near_duplicates
+        self.max_distance = max_distance
+        self._local = DuplicateDetector(near_duplicates, max_distance)
+        self._check = check
+
+    def signature(self, text):
+        return self._local.signature(text)
+
+    def check(self, url, signature):
+        return self._check(url, signature)
+
+
+def make_detector(config):
+    """DuplicateDetector for a config, or None if dedup is disabled"""
+    options = dedup_options(config)
+    if not options['enabled']:
+        return None
+    return DuplicateDetector(options['near_duplicates'], int(options['max_distance']))
@@ -15,21 +15,78 @@ import json
 import time
 import re
 import argparse
-import hashlib
-import requests
+import socket
+import threading
+import multiprocessing
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from collections import deque, defaultdict
+from collections import defaultdict
+from functools import partial
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    from throttle import make_throttle, BACKOFF_STATUSES
+    from http_client import get_client, guarded_get, release, fetch_limits, ContentSkipped
+    from http_cache import ResponseCache
+    from incremental import ScrapeManifest
+    from sitemap import load_sitemap_urls, fetch_robots
+    from frontier import Frontier, make_priority
+    from canonical import UrlCanonicalizer
+    from shared_frontier import open_frontier
+    from archive import PageArchive, scan_archives, read_record
+    from dedup import make_detector, DedupManager, SharedDetector
+    from link_preview import preview_crawl, save_discovered, load_discovered, discard_discovered
+    from parser_backend import make_soup, resolve_backend, PARSER_BACKENDS
+    from page_walk import PageWalk
+    from lang_classifier import get_classifier
+    from compiled_config import CompiledConfig
+    from page_store import PageStore, StoredPages
+    from corpus_db import CorpusDB
+    from blob_cache import open_blob_cache, blob_cache_options
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from throttle import make_throttle, BACKOFF_STATUSES
+    from http_client import get_client, guarded_get, release, fetch_limits, ContentSkipped
+    from http_cache import ResponseCache
+    from incremental import ScrapeManifest
+    from sitemap import load_sitemap_urls, fetch_robots
+    from frontier import Frontier, make_priority
+    from canonical import UrlCanonicalizer
+    from shared_frontier import open_frontier
+    from archive import PageArchive, scan_archives, read_record
+    from dedup import make_detector, DedupManager, SharedDetector
+    from link_preview import preview_crawl, save_discovered, load_discovered, discard_discovered
+    from parser_backend import make_soup, resolve_backend, PARSER_BACKENDS
+    from page_walk import PageWalk
+    from lang_classifier import get_classifier
+    from compiled_config import CompiledConfig
+    from page_store import PageStore, StoredPages
+    from corpus_db import CorpusDB
+    from blob_cache import open_blob_cache, blob_cache_options
 
 
 class DocToSkillConverter:
-    def __init__(self, config, dry_run=False, resume=False):
+    # Extra attempts for a page answered with 429/503 once the host has backed off
+    BACKOFF_RETRIES = 2
+    # Below this many archived pages --replay extracts in-process (no pool startup)
+    REPLAY_POOL_MIN = 50
+    # Pipeline: downloaded pages allowed to wait per extraction process
+    EXTRACT_QUEUE_PER_PROCESS = 2
+    # Bump when extract_content changes its output, so blob-cached pages are re-extracted
+    EXTRACT_VERSION = 1
+    # Build: pages read, classified and categorized at a time
+    BUILD_BATCH = 200
+
+    def __init__(self, config, dry_run=False, resume=False, incremental=False):
         self.config = config
         self.name = config['name']
         self.base_url = config['base_url']
         self.dry_run = dry_run
         self.resume = resume
+        self.incremental = incremental
+        # URL patterns and selectors, compiled once for every link and page
+        self.compiled = CompiledConfig(config)
 
         # Paths
         self.data_dir = f"output/{self.name}_data"
@@ -41,13 +98,47 @@ class DocToSkillConverter:
         self.checkpoint_enabled = checkpoint_config.get('enabled', False)
         self.checkpoint_interval = checkpoint_config.get('interval', 1000)
 
+        # Crawl config: worker threads share a per-host politeness budget
+        # that adapts to 429/503, Retry-After, Crawl-delay and latency
+        self.concurrency = max(1, int(config.get('concurrency', 1)))
+        self.throttle = make_throttle(config)
+        self.robots_hosts = set()
+        self._robots_lock = threading.Lock()
+        self.http = get_client(config)
+        self.fetch_limits = fetch_limits(config)
+        self.parser = resolve_backend(config.get('parser'))
+        self.partial_parse = config.get('partial_parse', False)
+        # Extraction processes for the fetch -> extract -> write pipeline (0 = off)
+        self.extract_processes = extract_processes(config)
+        # Everything extract_response's result depends on besides the body and URL
+        self.extract_settings = json.dumps({
+            'version': self.EXTRACT_VERSION,
+            'base_url': self.base_url,
+            'selectors': self.compiled.selectors,
+            'url_patterns': config.get('url_patterns', {}),
+            'canonical': config.get('canonical', {}),
+            'parser': self.parser,
+            'partial_parse': self.partial_parse,
+            'dedup': config.get('dedup'),
+        }, sort_keys=True)
+
         # State
         self.visited_urls = set()
-        # Support multiple starting URLs
+        # Support multiple starting URLs; the frontier dedups by canonical key
+        self.canonicalizer = UrlCanonicalizer(config)
         start_urls = config.get('start_urls', [self.base_url])
-        self.pending_urls = deque(start_urls)
-        self.pages = []
+        self.pending_urls = self.new_frontier(
+            self.canonicalizer.canonicalize(url) for url in start_urls)
         self.pages_scraped = 0
+        self.in_flight_urls = set()
+        self.crawl_start_time = time.time()
+        self.crawl_start_count = 0
+        self.lastmod = {}        # URL -> sitemap lastmod, when known
+        self.gone_urls = set()   # URLs that answered 404/410
+        self.skipped_urls = {}   # URL -> reason it was not downloaded (type/size)
+        self.duplicate_urls = {} # URL -> earlier URL with the same main content
+        self.dedup = make_detector(config)
+        self.change_counts = defaultdict(int)
 
         # Create directories (unless dry-run)
         if not dry_run:
@@ -56,36 +147,72 @@ class DocToSkillConverter:
             os.makedirs(f"{self.skill_dir}/scripts", exist_ok=True)
             os.makedirs(f"{self.skill_dir}/assets", exist_ok=True)
 
+        # Conditional-revalidation cache: re-scrapes only transfer changed pages
+        self.http_cache = None
+        if not dry_run and config.get('http_cache', True):
+            self.http_cache = ResponseCache(f"{self.data_dir}/http_cache.sqlite")
+
+        # Raw responses, so pages can be re-extracted offline with --replay
+        self.archive = None
+        if not dry_run and config.get('archive', True):
+            self.archive = PageArchive(f"{self.data_dir}/raw_pages.archive")
+
+        # Bodies and extracted pages shared with other configs (~/.cache/skillseeker)
+        self.blob_cache = None
+        if not dry_run:
+            self.blob_cache = open_blob_cache(config)
+
+        # Extracted pages: compressed JSONL shards plus a URL index
+        self.store = PageStore(f"{self.data_dir}/pages")
+        # Pages saved this session, by URL (read back from the store when needed)
+        self.pages = StoredPages(self.store)
+        if not dry_run:
+            migrated = self.store.migrate_legacy()
+            if migrated:
+                print(f"📦 Moved {migrated} page files into the page store")
+
+        # Optional SQLite copy of the pages for indexed build queries and search
+        self.corpus = None
+        if not dry_run and config.get('corpus_db', False):
+            self.corpus = CorpusDB(f"{self.data_dir}/corpus.sqlite")
+            if len(self.corpus) != len(self.store):
+                indexed = self.corpus.rebuild(self.store.pages())
+                print(f"🗃️  Indexed {indexed} stored pages into corpus.sqlite")
+
+        # Content-hash manifest: lets --incremental skip, drop and rebuild selectively
+        self.manifest = None
+        if not dry_run:
+            self.manifest = ScrapeManifest(f"{self.data_dir}/manifest.json", self.store)
+
         # Load checkpoint if resuming
         if resume and not dry_run:
             self.load_checkpoint()
     
+    def new_frontier(self, urls=()):
+        """Empty or seeded frontier with this config's priority and canonical keys"""
+        return Frontier(urls, priority=make_priority(self.config), key=self.canonicalizer.key)
+
     def is_valid_url(self, url):
         """Check if URL should be scraped"""
-        if not url.startswith(self.base_url):
-            return False
-
-        # Include patterns
-        includes = self.config.get('url_patterns', {}).get('include', [])
-        if includes and not any(pattern in url for pattern in includes):
-            return False
-
-        # Exclude patterns
-        excludes = self.config.get('url_patterns', {}).get('exclude', [])
-        if any(pattern in url for pattern in excludes):
-            return False
-
-        return True
+        return self.compiled.is_valid_url(url)
 
     def save_checkpoint(self):
         """Save progress checkpoint"""
         if not self.checkpoint_enabled or self.dry_run:
             return
+        if self.corpus is not None:
+            self.corpus.flush()
 
+        # In-flight URLs have no saved page yet, so a resume must fetch them again
+        pending, depths = self.pending_urls.dump()
+        in_flight = sorted(self.in_flight_urls)
         checkpoint_data = {
             "config": self.config,
-            "visited_urls": list(self.visited_urls),
-            "pending_urls": list(self.pending_urls),
+            "visited_urls": list(self.visited_urls - self.in_flight_urls),
+            "pending_urls": in_flight + pending,
+            "pending_depths": [self.pending_urls.depth(url) for url in in_flight] + depths,
+            "redirects": self.canonicalizer.redirects,
+            "duplicates": self.duplicate_urls,
             "pages_scraped": self.pages_scraped,
             "last_updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "checkpoint_interval": self.checkpoint_interval
@@ -93,7 +220,7 @@ class DocToSkillConverter:
 
         try:
             with open(self.checkpoint_file, 'w') as f:
-                json.dump(checkpoint_data, f, indent=2)
+                json.dump(checkpoint_data, f, separators=(',', ':'))
             print(f"  💾 Checkpoint saved ({self.pages_scraped} pages)")
         except Exception as e:
             print(f"  ⚠️  Failed to save checkpoint: {e}")
@@ -109,7 +236,12 @@ class DocToSkillConverter:
                 checkpoint_data = json.load(f)
 
             self.visited_urls = set(checkpoint_data["visited_urls"])
-            self.pending_urls = deque(checkpoint_data["pending_urls"])
+            self.canonicalizer.load_redirects(checkpoint_data.get("redirects", {}))
+            self.duplicate_urls = checkpoint_data.get("duplicates", {})
+            self.pending_urls = self.new_frontier()
+            self.pending_urls.mark_seen(self.visited_urls)
+            self.pending_urls.load(checkpoint_data["pending_urls"],
+                                   checkpoint_data.get("pending_depths"))
             self.pages_scraped = checkpoint_data["pages_scraped"]
 
             print(f"✅ Resumed from checkpoint")
@@ -144,24 +276,24 @@ class DocToSkillConverter:
             'links': []
         }
         
-        selectors = self.config.get('selectors', {})
-        
         # Extract title
-        title_elem = soup.select_one(selectors.get('title', 'title'))
+        title_elem = self.compiled.title.select_one(soup)
         if title_elem:
             page['title'] = self.clean_text(title_elem.get_text())
         
         # Find main content
-        main_selector = selectors.get('main_content', 'div[role="main"]')
-        main = soup.select_one(main_selector)
+        main = self.compiled.main_content.select_one(soup)
         
         if not main:
             print(f"⚠ No content: {url}")
             return page
         
+        # One pass over main collects everything below
+        walk = PageWalk(main, self.compiled.code_blocks)
+
         # Extract headings with better structure
-        for h in main.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            text = self.clean_text(h.get_text())
+        for h, text in walk.headings:
+            text = self.clean_text(text)
             if text:
                 page['headings'].append({
                     'level': h.name,
@@ -169,41 +301,39 @@ class DocToSkillConverter:
                     'id': h.get('id', '')
                 })
         
-        # Extract code with language detection
-        code_selector = selectors.get('code_blocks', 'pre code')
-        for code_elem in main.select(code_selector):
-            code = code_elem.get_text()
+        # Extract code; samples without a language class are classified
+        # later, all together (see classify_code)
+        for code_elem, code in walk.code_blocks:
             if len(code.strip()) > 10:
-                # Try to detect language
-                lang = self.detect_language(code_elem, code)
                 page['code_samples'].append({
                     'code': code.strip(),
-                    'language': lang
+                    'language': self.language_hint(code_elem) or 'unknown'
                 })
         
         # Extract patterns (NEW: common code patterns)
-        page['patterns'] = self.extract_patterns(main, page['code_samples'])
+        page['patterns'] = self.extract_patterns(main, page['code_samples'], walk)
         
         # Extract paragraphs
         paragraphs = []
-        for p in main.find_all('p'):
-            text = self.clean_text(p.get_text())
+        for text in walk.paragraphs:
+            text = self.clean_text(text)
             if text and len(text) > 20:  # Skip very short paragraphs
                 paragraphs.append(text)
         
         page['content'] = '\n\n'.join(paragraphs)
         
-        # Extract links
-        for link in main.find_all('a', href=True):
-            href = urljoin(url, link['href'])
-            if self.is_valid_url(href):
+        # Extract links (the set keeps the duplicate check linear)
+        seen = set()
+        for href in walk.hrefs:
+            href = self.canonicalizer.canonicalize(urljoin(url, href))
+            if href not in seen and self.is_valid_url(href):
+                seen.add(href)
                 page['links'].append(href)
         
         return page
     
-    def detect_language(self, elem, code):
-        """Detect programming language from code block"""
-        # Check class attribute
+    def language_hint(self, elem):
+        """Language named by the code block's class (or its parent <pre>'s), if any"""
         classes = elem.get('class', [])
         for cls in classes:
             if 'language-' in cls:
@@ -218,38 +348,41 @@ class DocToSkillConverter:
             for cls in classes:
                 if 'language-' in cls:
                     return cls.replace('language-', '')
-        
-        # Heuristic detection
-        if 'import ' in code and 'from ' in code:
-            return 'python'
-        if 'const ' in code or 'let ' in code or '=>' in code:
-            return 'javascript'
-        if 'func ' in code and 'var ' in code:
-            return 'gdscript'
-        if 'def ' in code and ':' in code:
-            return 'python'
-        if '#include' in code or 'int main' in code:
-            return 'cpp'
-        
-        return 'unknown'
+        return None
+
+    def detect_language(self, elem, code):
+        """Detect programming language from code block"""
+        return self.language_hint(elem) or get_classifier().classify(code)[0]
+
+    def classify_code(self, pages):
+        """
+        Classify every code sample without a language in one batch
+
+        Sets 'language' and 'language_confidence' on samples whose language
+        is 'unknown' and that have not been classified before.
+
+        Returns:
+            int: Number of samples classified
+        """
+        samples = [sample for page in pages for sample in page.get('code_samples', [])
+                   if sample.get('language', 'unknown') == 'unknown'
+                   and 'language_confidence' not in sample]
+        if not samples:
+            return 0
+        results = get_classifier().classify_batch([sample['code'] for sample in samples])
+        for sample, (language, confidence) in zip(samples, results):
+            sample['language'] = language
+            sample['language_confidence'] = confidence
+        return len(samples)
     
-    def extract_patterns(self, main, code_samples):
+    def extract_patterns(self, main, code_samples, walk=None):
         """Extract common coding patterns (NEW FEATURE)"""
-        patterns = []
-        
-        # Look for "Example:" or "Pattern:" sections
-        for elem in main.find_all(['p', 'div']):
-            text = elem.get_text().lower()
-            if any(word in text for word in ['example:', 'pattern:', 'usage:', 'typical use']):
-                # Get the code that follows
-                next_code = elem.find_next(['pre', 'code'])
-                if next_code:
-                    patterns.append({
-                        'description': self.clean_text(elem.get_text()),
-                        'code': next_code.get_text().strip()
-                    })
-        
-        return patterns[:5]  # Limit to 5 most relevant patterns
+        walk = walk or PageWalk(main)
+
+        # "Example:" or "Pattern:" sections, with the code that follows
+        # Limit to 5 most relevant patterns
+        return [{'description': self.clean_text(text), 'code': next_code.get_text().strip()}
+                for text, next_code in walk.pattern_candidates(limit=5)]
     
     def clean_text(self, text):
         """Clean text content"""
@@ -257,43 +390,561 @@ class DocToSkillConverter:
         return text.strip()
     
     def save_page(self, page):
-        """Save page data"""
-        url_hash = hashlib.md5(page['url'].encode()).hexdigest()[:10]
-        safe_title = re.sub(r'[^\w\s-]', '', page['title'])[:50]
-        safe_title = re.sub(r'[-\s]+', '_', safe_title)
-        
-        filename = f"{safe_title}_{url_hash}.json"
-        filepath = os.path.join(self.data_dir, "pages", filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(page, f, indent=2, ensure_ascii=False)
+        """Save page data (replacing any earlier version of its URL)"""
+        self.store.put(page)
+        if self.corpus is not None:
+            self.corpus.add(page)
     
+    def fetch_page(self, url):
+        """
+        Fetch and extract a single page
+
+        Safe to call from worker threads. The page is returned, not saved or
+        queued, but download() updates shared state on the way: the throttle
+        and backoff, gone_urls and skipped_urls, redirect aliases, and the
+        caches. The dedup detector also registers the page's fingerprint.
+
+        Returns:
+            dict: Extracted page, or None on error
+        """
+        fetched = self.download(url)
+        if fetched is None:
+            return None
+        url, body = fetched
+
+        try:
+            page, _ = self.extract_response(url, body, check_duplicates=True)
+            return page
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            return None
+
+    def download(self, url):
+        """
+        Network half of fetch_page: fetch a page and archive the response
+
+        Returns:
+            tuple: (final URL, response body), or None on error
+        """
+        try:
+            print(f"  {url}")
+            # Fetched recently by any config sharing the blob cache: no request at all
+            response = self.blob_cache.response(url) if self.blob_cache else None
+
+            if response is None:
+                self.apply_crawl_delay(url)
+                for attempt in range(self.BACKOFF_RETRIES + 1):
+                    # Politeness: wait for this host's next request slot
+                    self.throttle.wait(url)
+
+                    started = time.monotonic()
+                    if self.http_cache:
+                        response = self.http_cache.fetch(self.http, url, limits=self.fetch_limits, timeout=30)
+                    else:
+                        response = guarded_get(self.http, url, timeout=30, **self.fetch_limits)
+                    self.throttle.record(url, response.status_code, time.monotonic() - started,
+                                         response.headers.get('Retry-After'))
+
+                    if response.status_code not in BACKOFF_STATUSES or attempt == self.BACKOFF_RETRIES:
+                        break
+                    # Each dropped response would otherwise hold a pooled connection
+                    release(response)
+                    print(f"  ⏳ HTTP {response.status_code}, backing off ({self.throttle.describe(url)})")
+                if response.status_code >= 400:
+                    release(response)
+                response.raise_for_status()
+                if self.blob_cache:
+                    self.blob_cache.store_response(url, response)
+
+            # Redirects: store the page under its final URL and remember the alias
+            requested = url
+            final_url = getattr(response, 'url', None)
+            if isinstance(final_url, str) and self.canonicalizer.record_redirect(url, final_url):
+                url = self.canonicalizer.canonicalize(final_url)
+
+            if self.archive:
+                self.archive.record(url, response, requested)
+
+            return url, response.content
+
+        except ContentSkipped as e:
+            print(f"  ⏭️  Skipped: {e.reason}")
+            self.skipped_urls[url] = e.reason
+            return None
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            if status in (404, 410):
+                self.gone_urls.add(url)
+            return None
+
+    def make_soup(self, markup):
+        """Parse a page with the configured parser backend"""
+        return make_soup(markup, self.parser, self.compiled.selectors, partial=self.partial_parse)
+
+    def content_signature(self, soup):
+        """Dedup fingerprint of a parsed page's main content (None if there is none)"""
+        main = self.compiled.main_content.select_one(soup)
+        return self.dedup.signature(main.get_text(' ')) if main else None
+
+    def apply_crawl_delay(self, url):
+        """Read robots.txt Crawl-delay once per host before its first request"""
+        if self.dry_run:
+            return
+        host = urlparse(url).netloc
+        if host in self.robots_hosts:
+            return
+        with self._robots_lock:
+            if host in self.robots_hosts:
+                return
+            crawl_delay = fetch_robots(url, self.http)['crawl_delay']
+            if crawl_delay:
+                self.throttle.set_crawl_delay(url, crawl_delay)
+                print(f"  🤖 robots.txt Crawl-delay for {host}: {crawl_delay}s")
+            self.robots_hosts.add(host)
+
+    def queue_links(self, page):
+        """Add a page's unseen links to the frontier"""
+        depth = self.pending_urls.depth(page['url']) + 1
+        for link in page['links']:
+            self.pending_urls.add(link, depth)
+
+    def process_page(self, page, url=None):
+        """
+        Save a fetched page and queue its links (main thread only)
+
+        Args:
+            page: Extracted page
+            url: URL that was requested, if it may have redirected to page['url']
+        """
+        if page.get('duplicate_of'):
+            self.duplicate_urls[page['url']] = page['duplicate_of']
+            self.visited_urls.add(page['url'])
+            self.pending_urls.mark_seen([page['url']])
+            return
+
+        if url and page['url'] != url:
+            if page['url'] in self.visited_urls:
+                print(f"  ↪ Redirect to already scraped {page['url']}")
+                return
+            self.visited_urls.add(page['url'])
+            self.pending_urls.mark_seen([page['url']])
+            self.pending_urls.discard(page['url'])
+
+        self.save_page(page)
+        self.pages.append(page)
+
+        if self.manifest:
+            status = self.manifest.record(page, self.lastmod.get(page['url']))
+            self.change_counts[status] += 1
+
+        self.queue_links(page)
+
+    def reuse_page(self, url):
+        """
+        In incremental mode, reuse the stored page if the sitemap lastmod
+        says it has not changed. Links are still followed.
+
+        Returns:
+            bool: True if the page was reused and needs no fetch
+        """
+        if not (self.incremental and self.manifest
+                and self.manifest.is_fresh(url, self.lastmod.get(url))):
+            return False
+
+        page = self.store.get(url)
+        if page is None:
+            return False
+
+        self.pages.append(page)
+        self.change_counts['unchanged'] += 1
+        self.queue_links(page)
+        return True
+
     def scrape_page(self, url):
         """Scrape a single page"""
+        if self.reuse_page(url):
+            return
+        page = self.fetch_page(url)
+        if page:
+            self.process_page(page, url)
+
+    def seed_from_sitemap(self):
+        """Queue every in-scope sitemap URL up front and remember its lastmod"""
+        entries = load_sitemap_urls(self.config, self.http, self.is_valid_url)
+        if not entries:
+            print("🗺️  Sitemap: none found, discovering URLs by crawling\n")
+            return
+
+        added = 0
+        for url, lastmod in entries.items():
+            url = self.canonicalizer.canonicalize(url)
+            if lastmod:
+                self.lastmod[url] = lastmod
+            if self.pending_urls.add(url):
+                added += 1
+
+        print(f"🗺️  Sitemap: {len(entries)} URLs in scope, {added} queued\n")
+
+    def finish_incremental(self):
+        """Drop pages that disappeared and report what changed"""
+        if self.pending_urls:
+            print("ℹ️  Crawl stopped at max_pages - keeping pages that were not reached")
+        else:
+            present = self.visited_urls - self.gone_urls - set(self.skipped_urls)
+            for dropped in self.manifest.drop_missing(present):
+                self.store.delete(dropped)
+                if self.corpus is not None:
+                    self.corpus.delete(dropped)
+
+        print(f"🔄 Incremental: {self.change_counts['added']} new, "
+              f"{self.change_counts['changed']} changed, "
+              f"{self.change_counts['unchanged']} unchanged, "
+              f"{len(self.manifest.removed)} removed")
+
+    def default_frontier_spec(self):
+        """Shared frontier store used by --workers when --frontier is not given"""
+        return f"sqlite:///{self.data_dir}/frontier.sqlite"
+
+    def seed_shared_frontier(self, frontier):
+        """Coordinator: put the start (and sitemap) URLs into the shared frontier"""
+        if self.config.get('sitemap'):
+            self.seed_from_sitemap()
+        added = frontier.add_many((url, self.pending_urls.depth(url)) for url in self.pending_urls)
+        print(f"🧭 Shared frontier: {added} URLs seeded")
+
+    def run_worker(self, frontier, worker_index=0, num_workers=1):
+        """
+        Worker: claim URLs from the shared frontier until the crawl is done
+
+        Pages go to the shared data directory; discovered links go back to
+        the frontier. Up to `concurrency` claimed URLs are fetched at once.
+        The crawl is done when nothing is pending and no lease is out.
+        """
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+        max_pages = self.config.get('max_pages', 500)
+        self.crawl_start_time = time.time()
+        next_report = 10
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                claimed = frontier.claim(worker_id, worker_index, num_workers,
+                                         limit=self.concurrency, budget=max_pages)
+                if not claimed:
+                    if frontier.counts()['leased'] == 0:
+                        break
+                    # Other workers may still discover links
+                    time.sleep(1)
+                    continue
+
+                urls = [url for url, _ in claimed]
+                for (url, depth), page in zip(claimed, executor.map(self.fetch_page, urls)):
+                    if page and not page.get('duplicate_of'):
+                        self.save_page(page)
+                        if page['url'] != url:
+                            frontier.add_many([(page['url'], depth)], done=True)
+                        frontier.add_many((link, depth + 1) for link in page['links'])
+                        self.pages_scraped += 1
+                    frontier.complete(url, worker_id, ok=page is not None)
+                frontier.renew(worker_id)
+
+                if self.pages_scraped >= next_report:
+                    next_report = self.pages_scraped - self.pages_scraped % 10 + 10
+                    print(f"  [worker {worker_index}: {self.pages_scraped} pages, "
+                          f"{self.crawl_rate():.1f} pages/sec, {self.throttle.describe(self.base_url)}]")
+
+        print(f"✅ Worker {worker_index} done: {self.pages_scraped} pages")
+
+    def scrape_with_workers(self, num_workers, frontier_spec=None):
+        """
+        Coordinator: seed a shared frontier, run worker processes, collect pages
+
+        A rerun with --resume continues the existing frontier; otherwise it is
+        reset first. Workers on other hosts can join the same crawl with
+        --join --frontier <spec> while it runs.
+        """
+        spec = frontier_spec or self.default_frontier_spec()
+        frontier = open_frontier(spec, key=self.canonicalizer.key)
+        if not self.resume:
+            frontier.reset()
+        self.seed_shared_frontier(frontier)
+
+        print(f"\n{'='*60}")
+        print(f"SCRAPING: {self.name} with {num_workers} worker processes")
+        print(f"{'='*60}")
+        print(f"Frontier: {spec}\n")
+
+        start = time.time()
+        processes = [
+            multiprocessing.Process(target=run_worker_process,
+                                    args=(self.config, spec, index, num_workers))
+            for index in range(num_workers)
+        ]
+        for process in processes:
+            process.start()
         try:
-            print(f"  {url}")
-            
-            headers = {'User-Agent': 'Mozilla/5.0 (Documentation Scraper)'}
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            page = self.extract_content(soup, url)
-            
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            # Leases of killed workers expire, so --resume picks their URLs up again
+            for process in processes:
+                process.terminate()
+            raise
+
+        counts = frontier.counts()
+        self.duplicate_urls.update(frontier.duplicates())
+        frontier.close()
+        elapsed = time.time() - start
+        print(f"\n✅ Workers finished in {elapsed:.1f}s: {counts['done']} done, "
+              f"{counts['failed']} failed, {counts['pending']} left pending")
+
+        self.collect_worker_pages()
+        self.save_summary()
+
+    def collect_worker_pages(self):
+        """Load the pages workers wrote and record them in the manifest"""
+        self.store.load()
+        for page in self.store.pages():
+            self.pages.append(page)
+            self.visited_urls.add(page['url'])
+            if self.corpus is not None:
+                self.corpus.add(page)
+            if self.manifest:
+                status = self.manifest.record(page, self.lastmod.get(page['url']))
+                self.change_counts[status] += 1
+
+    def extract_response(self, url, body, check_duplicates=False):
+        """
+        Extract a page from a response body (archived or just downloaded)
+
+        With check_duplicates, the page's signature goes through self.dedup
+        before extract_content runs: a duplicate is never extracted and comes
+        back as {'url': url, 'duplicate_of': original}.
+
+        Returns:
+            tuple: (page, dedup signature or None)
+        """
+        key = cached = soup = None
+        if self.blob_cache:
+            key = self.blob_cache.extract_key(url, body, self.extract_settings)
+            cached = self.blob_cache.get_extracted(key)
+        if cached is not None:
+            signature = cached['signature']
+        else:
+            soup = self.make_soup(body)
+            signature = self.content_signature(soup) if self.dedup else None
+
+        # Same main content as a page already scraped: record the alias only
+        if check_duplicates and self.dedup:
+            original = self.dedup.check(url, signature)
+            if original:
+                print(f"  ⧉ Duplicate of {original}")
+                return {'url': url, 'duplicate_of': original}, signature
+
+        if cached is not None:
+            return cached['page'], signature
+        page = self.extract_content(soup, url)
+        if key:
+            self.blob_cache.put_extracted(key, {'page': page, 'signature': signature})
+        return page, signature
+
+    def replay_archive(self, processes=None):
+        """
+        Re-extract every archived page with the current config (no network)
+
+        Pages are rebuilt from the newest archived response per URL; URLs the
+        current url_patterns exclude are dropped. Extraction runs in a process
+        pool (all cores by default) because parsing dominates the cost.
+
+        Returns:
+            int: Number of pages extracted
+        """
+        records = scan_archives(self.data_dir)
+        locations = [(path, offset) for url, (path, offset, header) in records.items()
+                     if header.get('status') == 200 and self.is_valid_url(url)]
+
+        print(f"\n{'='*60}")
+        print(f"REPLAY: {self.name}")
+        print(f"{'='*60}")
+        if not locations:
+            print("⚠️  No archived pages - scrape once with archiving enabled first")
+            return 0
+        print(f"Archive: {len(locations)} pages\n")
+
+        # Every page is rebuilt; URLs the config now excludes must not linger
+        self.store.clear()
+        if self.corpus is not None:
+            self.corpus.clear()
+
+        start = time.time()
+        if processes == 1 or len(locations) < self.REPLAY_POOL_MIN:
+            archived = (read_record(path, offset) for path, offset in locations)
+            self._store_replayed(self.extract_response(header['url'], body) for header, body in archived)
+        else:
+            workers = processes or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_extract_worker,
+                                     initargs=(self.config,)) as executor:
+                chunksize = max(1, len(locations) // (workers * 4))
+                self._store_replayed(executor.map(_replay_record, locations, chunksize=chunksize))
+
+        if self.manifest:
+            self.manifest.drop_missing(self.visited_urls)
+
+        elapsed = time.time() - start
+        rate = len(self.pages) / elapsed if elapsed > 0 else 0
+        print(f"✅ Re-extracted {len(self.pages)} pages in {elapsed:.1f}s ({rate:.0f} pages/sec)")
+        self.save_summary()
+        return len(self.pages)
+
+    def _store_replayed(self, results):
+        kept = []
+        for page, signature in results:
+            if page['url'] in self.visited_urls:
+                continue
+            original = self.dedup.check(page['url'], signature) if self.dedup else None
+            if original:
+                self.duplicate_urls[page['url']] = original
+                continue
+            self.visited_urls.add(page['url'])
+            kept.append(page)
+
+        # One classifier batch for the whole archive, before pages are written
+        classified = self.classify_code(kept)
+        if classified:
+            print(f"🔤 Classified {classified} code samples")
+        for page in kept:
             self.save_page(page)
             self.pages.append(page)
-            
-            # Add new URLs
-            for link in page['links']:
-                if link not in self.visited_urls and link not in self.pending_urls:
-                    self.pending_urls.append(link)
-            
-            # Rate limiting
-            time.sleep(self.config.get('rate_limit', 0.5))
-            
+            if self.manifest:
+                status = self.manifest.record(page, self.lastmod.get(page['url']))
+                self.change_counts[status] += 1
+
+    def crawl_rate(self):
+        """Pages per second scraped in this session (excludes resumed pages)"""
+        elapsed = time.time() - self.crawl_start_time
+        scraped = self.pages_scraped - self.crawl_start_count
+        return scraped / elapsed if elapsed > 0 else 0
+
+    def _page_done(self):
+        """Bookkeeping after each scraped page: checkpoints and progress"""
+        self.pages_scraped += 1
+
+        # Save checkpoint at interval
+        if self.checkpoint_enabled and self.pages_scraped % self.checkpoint_interval == 0:
+            self.save_checkpoint()
+
+        if self.pages_scraped % 10 == 0:
+            print(f"  [{len(self.visited_urls)} pages, {self.crawl_rate():.1f} pages/sec, "
+                  f"{self.throttle.describe(self.base_url)}]")
+
+    def next_fetch(self, max_pages):
+        """
+        Take the next URL that needs a fetch (main thread only)
+
+        Pages reused from an incremental run are handled inline.
+
+        Returns:
+            str: URL now in flight, or None if the frontier is empty or
+                the page budget is spent
+        """
+        while self.pending_urls and len(self.visited_urls) < max_pages:
+            url = self.pending_urls.pop()
+            self.visited_urls.add(url)
+            if self.reuse_page(url):
+                self._page_done()
+                continue
+            self.in_flight_urls.add(url)
+            return url
+        return None
+
+    def finish_fetch(self, url, page):
+        """Record the result of a fetch started by next_fetch (main thread only)"""
+        if page:
+            self.process_page(page, url)
+        self.in_flight_urls.discard(url)
+        self._page_done()
+
+    def _scrape_concurrent(self, max_pages):
+        """Scrape with a thread pool, keeping all crawl state on this thread"""
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                # Keep the pool full while the page budget allows
+                while len(futures) < self.concurrency:
+                    url = self.next_fetch(max_pages)
+                    if url is None:
+                        break
+                    futures[executor.submit(self.fetch_page, url)] = url
+
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.finish_fetch(futures.pop(future), future.result())
+
+    def _scrape_pipeline(self, max_pages):
+        """
+        Scrape in stages so parsing uses every core
+
+        Fetch threads only download. Bodies wait in a bounded queue for a
+        process pool running extract_content, and this thread is the single
+        writer (save_page, manifest, frontier). The pool checks duplicates
+        before extracting, against one detector in a DedupManager process. While the queue is full no
+        new downloads start, so at most queue size + concurrency bodies are
+        held in memory however large the crawl.
+        """
+        queue_size = self.extract_processes * self.EXTRACT_QUEUE_PER_PROCESS
+        fetching = {}
+        extracting = {}
+
+        # Workers check duplicates before extracting, all against one detector
+        dedup_manager = shared_dedup = None
+        if self.dedup:
+            dedup_manager = DedupManager()
+            dedup_manager.start()
+            shared_dedup = dedup_manager.DuplicateDetector(self.dedup.near_duplicates, self.dedup.max_distance)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as fetchers, \
+                    ProcessPoolExecutor(max_workers=self.extract_processes, initializer=_init_extract_worker,
+                                        initargs=(self.config, shared_dedup)) as extractors:
+                while True:
+                    # Backpressure: only download while the extraction queue has room
+                    while len(fetching) < self.concurrency and len(extracting) < queue_size:
+                        url = self.next_fetch(max_pages)
+                        if url is None:
+                            break
+                        fetching[fetchers.submit(self.download, url)] = url
+
+                    if not fetching and not extracting:
+                        break
+
+                    done, _ = wait(list(fetching) + list(extracting), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future in fetching:
+                            url = fetching.pop(future)
+                            fetched = future.result()
+                            if fetched is None:
+                                self.finish_fetch(url, None)
+                            else:
+                                extracting[extractors.submit(_extract_fetched, *fetched)] = url
+                        else:
+                            self.finish_fetch(extracting.pop(future), self._extracted_page(future))
+        finally:
+            if dedup_manager is not None:
+                dedup_manager.shutdown()
+
+    def _extracted_page(self, future):
+        """Page (or duplicate marker) from a pipeline extraction, or None on error"""
+        try:
+            page, _ = future.result()
         except Exception as e:
             print(f"  ✗ Error: {e}")
-    
+            return None
+        return page
+
     def scrape_all(self):
         """Scrape all pages"""
         print(f"\n{'='*60}")
@@ -311,134 +962,218 @@ class DocToSkillConverter:
 
         max_pages = self.config.get('max_pages', 500)
 
-        # Dry run: preview first 20 URLs
-        preview_limit = 20 if self.dry_run else max_pages
+        self.crawl_start_time = time.time()
+        self.crawl_start_count = self.pages_scraped
 
-        while self.pending_urls and len(self.visited_urls) < preview_limit:
-            url = self.pending_urls.popleft()
+        if self.config.get('sitemap'):
+            self.seed_from_sitemap()
 
-            if url in self.visited_urls:
-                continue
+        if self.dry_run:
+            self.preview_links(preview_limit=20)
+            return
 
-            self.visited_urls.add(url)
+        if not self.resume:
+            self.seed_from_preview()
 
-            if self.dry_run:
-                # Just show what would be scraped
-                print(f"  [Preview] {url}")
-                # Simulate finding links without actually scraping
-                try:
-                    headers = {'User-Agent': 'Mozilla/5.0 (Documentation Scraper - Dry Run)'}
-                    response = requests.get(url, headers=headers, timeout=10)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-
-                    main_selector = self.config.get('selectors', {}).get('main_content', 'div[role="main"]')
-                    main = soup.select_one(main_selector)
-
-                    if main:
-                        for link in main.find_all('a', href=True):
-                            href = urljoin(url, link['href'])
-                            if self.is_valid_url(href) and href not in self.visited_urls:
-                                self.pending_urls.append(href)
-                except:
-                    pass  # Ignore errors in dry run
-            else:
-                self.scrape_page(url)
-                self.pages_scraped += 1
+        if self.extract_processes:
+            print(f"Pipeline: {self.concurrency} fetch threads, {self.extract_processes} extraction processes\n")
+            self._scrape_pipeline(max_pages)
+        elif self.concurrency > 1:
+            print(f"Concurrency: {self.concurrency} workers\n")
+            self._scrape_concurrent(max_pages)
 
-                # Save checkpoint at interval
-                if self.checkpoint_enabled and self.pages_scraped % self.checkpoint_interval == 0:
-                    self.save_checkpoint()
+        while self.pending_urls and len(self.visited_urls) < max_pages:
+            url = self.pending_urls.pop()
+            self.visited_urls.add(url)
+            self.scrape_page(url)
+            self._page_done()
+
+        self.finish_scrape()
+
+    def preview_links(self, preview_limit=20):
+        """
+        Dry run: walk the link graph without extracting pages
+
+        Only hrefs inside the main content are read, several pages at a
+        time. The URLs found are saved for the next real scrape.
+        """
+        stats = preview_crawl(
+            self.pending_urls, self.http, self.throttle, self.canonicalizer, self.is_valid_url,
+            main_selector=self.compiled.selectors['main_content'],
+            limits=self.fetch_limits, max_pages=preview_limit,
+            concurrency=self.concurrency, timeout=10,
+            on_page=lambda url, count: print(f"  [Preview] {url}")
+        )
+        self.visited_urls.update(stats['urls'])
+        saved_to = save_discovered(self.name, stats['urls'], self.pending_urls, self.base_url)
+
+        print(f"\n✅ Dry run complete: would scrape ~{len(self.visited_urls)} pages")
+        if stats['visited'] >= preview_limit:
+            print(f"   (showing first {preview_limit}, actual scraping may find more)")
+        print(f"💾 {len(self.visited_urls) + len(self.pending_urls)} discovered URLs saved to {saved_to}")
+        print(f"\n💡 To actually scrape, run without --dry-run")
+
+    def seed_from_preview(self):
+        """Queue the URLs a dry run or estimate already discovered (once: the file is then deleted)"""
+        entries = load_discovered(self.name, self.base_url)
+        discard_discovered(self.name)
+        if not entries:
+            return
 
-            if len(self.visited_urls) % 10 == 0:
-                print(f"  [{len(self.visited_urls)} pages]")
+        added = 0
+        for url, depth in entries:
+            url = self.canonicalizer.canonicalize(url)
+            if self.is_valid_url(url) and self.pending_urls.add(url, depth):
+                added += 1
+        print(f"🔭 Preview: {added} previously discovered URLs queued\n")
+
+    def finish_scrape(self):
+        """Report the crawl and write summary.json and the manifest"""
+        elapsed = time.time() - self.crawl_start_time
+        print(f"\n✅ Scraped {len(self.visited_urls)} pages in {elapsed:.1f}s ({self.crawl_rate():.1f} pages/sec)")
+        if self.http_cache:
+            print(f"♻️  HTTP cache: {self.http_cache.summary()}")
+        if self.blob_cache:
+            print(f"🗄️  Blob cache: {self.blob_cache.summary()}")
+            self.blob_cache.evict()
+        if self.skipped_urls:
+            print(f"⏭️  Skipped {len(self.skipped_urls)} non-HTML or oversized URLs (listed in summary.json)")
+        if self.duplicate_urls:
+            print(f"⧉  {len(self.duplicate_urls)} URLs duplicated an earlier page (listed in summary.json)")
+        if self.incremental and self.manifest:
+            self.finish_incremental()
+        self.save_summary()
 
-        if self.dry_run:
-            print(f"\n✅ Dry run complete: would scrape ~{len(self.visited_urls)} pages")
-            if len(self.visited_urls) >= preview_limit:
-                print(f"   (showing first {preview_limit}, actual scraping may find more)")
-            print(f"\n💡 To actually scrape, run without --dry-run")
-        else:
-            print(f"\n✅ Scraped {len(self.visited_urls)} pages")
-            self.save_summary()
-    
     def save_summary(self):
         """Save scraping summary"""
         summary = {
             'name': self.name,
             'total_pages': len(self.pages),
             'base_url': self.base_url,
-            'pages': [{'title': p['title'], 'url': p['url']} for p in self.pages]
+            'pages': [{'title': p['title'], 'url': p['url']} for p in self.pages],
+            'skipped': [{'url': url, 'reason': reason} for url, reason in sorted(self.skipped_urls.items())],
+            'duplicates': [{'url': url, 'duplicate_of': original}
+                           for url, original in sorted(self.duplicate_urls.items())]
         }
         
         with open(f"{self.data_dir}/summary.json", 'w', encoding='utf-8') as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        if self.manifest:
+            self.manifest.save()
+        if self.corpus is not None:
+            self.corpus.flush()
+
+        # Rewritten and deleted pages leave dead bytes in the shards
+        reclaimed = self.store.compact_if_needed()
+        if reclaimed:
+            print(f"🗜️  Compacted page store, reclaimed {reclaimed / 1024:.0f} KB")
     
     def load_scraped_data(self):
         """Load previously scraped data"""
-        pages = []
-        pages_dir = Path(self.data_dir) / "pages"
-        
-        if not pages_dir.exists():
-            return []
-        
-        for json_file in pages_dir.glob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    pages.append(json.load(f))
-            except Exception as e:
-                print(f"⚠ Error loading {json_file}: {e}")
-        
-        return pages
+        return list(self.store.pages())
     
+    def categorize_page(self, page, category_defs):
+        """Category of one page: the first whose keywords score 2 or more, else 'other'"""
+        url = page['url'].lower()
+        title = page['title'].lower()
+        content = page.get('content', '').lower()[:500]  # Check first 500 chars
+
+        # Match against keywords
+        for cat, keywords in category_defs.items():
+            score = 0
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword in url:
+                    score += 3
+                if keyword in title:
+                    score += 2
+                if keyword in content:
+                    score += 1
+
+            if score >= 2:  # Threshold for categorization
+                return cat
+
+        return 'other'
+
     def smart_categorize(self, pages):
         """Improved categorization with better pattern matching"""
         category_defs = self.config.get('categories', {})
         
         # Default smart categories if none provided
         if not category_defs:
-            category_defs = self.infer_categories(pages)
+            category_defs = self.infer_categories(page['url'] for page in pages)
+
+        if self.corpus is not None:
+            categories = self.corpus_categorize(pages, category_defs)
+            if categories is not None:
+                return categories
         
         categories = {cat: [] for cat in category_defs.keys()}
         categories['other'] = []
         
         for page in pages:
-            url = page['url'].lower()
-            title = page['title'].lower()
-            content = page.get('content', '').lower()[:500]  # Check first 500 chars
-            
-            categorized = False
-            
-            # Match against keywords
-            for cat, keywords in category_defs.items():
-                score = 0
-                for keyword in keywords:
-                    keyword = keyword.lower()
-                    if keyword in url:
-                        score += 3
-                    if keyword in title:
-                        score += 2
-                    if keyword in content:
-                        score += 1
-                
-                if score >= 2:  # Threshold for categorization
-                    categories[cat].append(page)
-                    categorized = True
-                    break
-            
-            if not categorized:
-                categories['other'].append(page)
+            categories[self.categorize_page(page, category_defs)].append(page)
         
         # Remove empty categories
         categories = {k: v for k, v in categories.items() if v}
         
         return categories
+
+    def categorize_store(self):
+        """
+        Categorize the stored pages in one streaming pass, keeping only URLs
+
+        Pages are read BUILD_BATCH at a time. Code samples without a language
+        are classified on the way, and pages that gained one are written back
+        to the store (and corpus), so the next build skips them.
+
+        Returns:
+            tuple: ({category: StoredPages}, number of code samples classified)
+        """
+        category_defs = self.config.get('categories', {})
+        if not category_defs:
+            category_defs = self.infer_categories(page['url'] for page in self.store.pages())
+
+        category_of = self.corpus_category_map(category_defs) if self.corpus is not None else None
+        urls = {cat: [] for cat in category_defs}
+        urls['other'] = []
+        classified = 0
+
+        pages = self.store.pages()
+        while True:
+            batch = list(islice(pages, self.BUILD_BATCH))
+            if not batch:
+                break
+            unlabeled = [page for page in batch
+                         if any(sample.get('language', 'unknown') == 'unknown' and 'language_confidence' not in sample
+                                for sample in page.get('code_samples', []))]
+            if unlabeled:
+                classified += self.classify_code(unlabeled)
+                for page in unlabeled:
+                    self.save_page(page)
+            for page in batch:
+                if category_of is not None:
+                    cat = category_of[page['url']]
+                else:
+                    cat = self.categorize_page(page, category_defs)
+                urls.setdefault(cat, []).append(page['url'])
+
+        if self.corpus is not None:
+            self.corpus.flush()
+        if classified:
+            # Rewritten pages leave their old copies behind
+            self.store.compact_if_needed()
+        categories = {cat: StoredPages(self.store, cat_urls) for cat, cat_urls in urls.items() if cat_urls}
+        return categories, classified
     
-    def infer_categories(self, pages):
+    def infer_categories(self, urls):
         """Infer categories from URL patterns (IMPROVED)"""
+        urls = list(urls)
         url_segments = defaultdict(int)
         
-        for page in pages:
-            path = urlparse(page['url']).path
+        for url in urls:
+            path = urlparse(url).path
             segments = [s for s in path.split('/') if s and s not in ['en', 'stable', 'latest', 'docs']]
             
             for seg in segments:
@@ -453,86 +1188,108 @@ class DocToSkillConverter:
                 categories[seg] = [seg]
         
         # Add common defaults
-        if 'tutorial' not in categories and any('tutorial' in url for url in [p['url'] for p in pages]):
+        if 'tutorial' not in categories and any('tutorial' in url for url in urls):
             categories['tutorials'] = ['tutorial', 'guide', 'getting-started']
         
-        if 'api' not in categories and any('api' in url or 'reference' in url for url in [p['url'] for p in pages]):
+        if 'api' not in categories and any('api' in url or 'reference' in url for url in urls):
             categories['api'] = ['api', 'reference', 'class']
         
         return categories
     
+    def corpus_categorize(self, pages, category_defs):
+        """smart_categorize as a corpus query, or None if the corpus and pages differ"""
+        categorized = self.corpus.categorize(category_defs)
+        category_of = {url: cat for cat, urls in categorized.items() for url in urls}
+        if len(category_of) != len(pages) or not all(page['url'] in category_of for page in pages):
+            print("  ⚠️  corpus.sqlite is out of sync with the pages - categorizing in Python")
+            return None
+
+        categories = {cat: [] for cat in categorized}
+        for page in pages:
+            categories[category_of[page['url']]].append(page)
+        return categories
+
+    def corpus_category_map(self, category_defs):
+        """URL -> category as a corpus query, or None if the corpus and page store differ"""
+        category_of = {url: cat for cat, urls in self.corpus.categorize(category_defs).items() for url in urls}
+        if len(category_of) != len(self.store) or not all(url in self.store for url in category_of):
+            print("  ⚠️  corpus.sqlite is out of sync with the pages - categorizing in Python")
+            return None
+        return category_of
+
     def generate_quick_reference(self, pages):
         """Generate quick reference from common patterns (NEW FEATURE)"""
+        if self.corpus is not None:
+            return self.corpus.quick_reference(limit=15, max_length=300)
+
         quick_ref = []
         
-        # Collect all patterns
-        all_patterns = []
-        for page in pages:
-            all_patterns.extend(page.get('patterns', []))
-        
-        # Get most common code patterns
+        # First distinct short patterns; pages may be a stream, so stop reading once full
         seen_codes = set()
-        for pattern in all_patterns:
-            code = pattern['code']
-            if code not in seen_codes and len(code) < 300:
-                quick_ref.append(pattern)
-                seen_codes.add(code)
-                if len(quick_ref) >= 15:
-                    break
+        for page in pages:
+            for pattern in page.get('patterns', []):
+                code = pattern['code']
+                if code not in seen_codes and len(code) < 300:
+                    quick_ref.append(pattern)
+                    seen_codes.add(code)
+                    if len(quick_ref) >= 15:
+                        return quick_ref
         
         return quick_ref
     
     def create_reference_file(self, category, pages):
-        """Create enhanced reference file"""
+        """Create enhanced reference file (written page by page, so pages may be a StoredPages)"""
         if not pages:
             return
         
-        lines = []
-        lines.append(f"# {self.name.title()} - {category.replace('_', ' ').title()}\n")
-        lines.append(f"**Pages:** {len(pages)}\n")
-        lines.append("---\n")
-        
-        for page in pages:
-            lines.append(f"## {page['title']}\n")
-            lines.append(f"**URL:** {page['url']}\n")
-            
-            # Table of contents from headings
-            if page.get('headings'):
-                lines.append("**Contents:**")
-                for h in page['headings'][:10]:
-                    level = int(h['level'][1]) if len(h['level']) > 1 else 1
-                    indent = "  " * max(0, level - 2)
-                    lines.append(f"{indent}- {h['text']}")
-                lines.append("")
-            
-            # Content
-            if page.get('content'):
-                content = page['content'][:2500]
-                if len(page['content']) > 2500:
-                    content += "\n\n*[Content truncated]*"
-                lines.append(content)
-                lines.append("")
-            
-            # Code examples with language
-            if page.get('code_samples'):
-                lines.append("**Examples:**\n")
-                for i, sample in enumerate(page['code_samples'][:4], 1):
-                    lang = sample.get('language', 'unknown')
-                    code = sample.get('code', sample if isinstance(sample, str) else '')
-                    lines.append(f"Example {i} ({lang}):")
-                    lines.append(f"```{lang}")
-                    lines.append(code[:600])
-                    if len(code) > 600:
-                        lines.append("...")
-                    lines.append("```\n")
-            
-            lines.append("---\n")
-        
         filepath = os.path.join(self.skill_dir, "references", f"{category}.md")
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+            f.write(f"# {self.name.title()} - {category.replace('_', ' ').title()}\n\n")
+            f.write(f"**Pages:** {len(pages)}\n\n")
+            f.write("---\n")
+            for page in pages:
+                f.write('\n' + '\n'.join(self.reference_lines(page)))
         
         print(f"  ✓ {category}.md ({len(pages)} pages)")
+
+    def reference_lines(self, page):
+        """Lines of one page's section in a reference file"""
+        lines = []
+        lines.append(f"## {page['title']}\n")
+        lines.append(f"**URL:** {page['url']}\n")
+        
+        # Table of contents from headings
+        if page.get('headings'):
+            lines.append("**Contents:**")
+            for h in page['headings'][:10]:
+                level = int(h['level'][1]) if len(h['level']) > 1 else 1
+                indent = "  " * max(0, level - 2)
+                lines.append(f"{indent}- {h['text']}")
+            lines.append("")
+        
+        # Content
+        if page.get('content'):
+            content = page['content'][:2500]
+            if len(page['content']) > 2500:
+                content += "\n\n*[Content truncated]*"
+            lines.append(content)
+            lines.append("")
+        
+        # Code examples with language
+        if page.get('code_samples'):
+            lines.append("**Examples:**\n")
+            for i, sample in enumerate(page['code_samples'][:4], 1):
+                lang = sample.get('language', 'unknown')
+                code = sample.get('code', sample if isinstance(sample, str) else '')
+                lines.append(f"Example {i} ({lang}):")
+                lines.append(f"```{lang}")
+                lines.append(code[:600])
+                if len(code) > 600:
+                    lines.append("...")
+                lines.append("```\n")
+        
+        lines.append("---\n")
+        return lines
     
     def create_enhanced_skill_md(self, categories, quick_ref):
         """Create SKILL.md with actual examples (IMPROVED)"""
@@ -669,36 +1426,61 @@ To refresh this skill with updated documentation:
         
         print("  ✓ index.md")
     
-    def build_skill(self):
-        """Build the skill from scraped data"""
+    def build_skill(self, incremental=False):
+        """
+        Build the skill from scraped data
+
+        With incremental=True only reference files of categories that
+        contain new, changed or removed pages are regenerated.
+        """
         print(f"\n{'='*60}")
         print(f"BUILDING SKILL: {self.name}")
         print(f"{'='*60}\n")
         
-        # Load data
-        print("Loading scraped data...")
-        pages = self.load_scraped_data()
-        
-        if not pages:
+        # Pages stay in the store: the build streams them in two passes
+        # (categorize, then render each category) and keeps only URLs
+        if not len(self.store):
             print("✗ No scraped data found!")
             return False
         
-        print(f"  ✓ Loaded {len(pages)} pages\n")
+        print(f"  ✓ Found {len(self.store)} pages\n")
         
-        # Categorize
-        print("Categorizing pages...")
-        categories = self.smart_categorize(pages)
-        print(f"  ✓ Created {len(categories)} categories\n")
-        
-        # Generate quick reference
+        # Generate quick reference (before classification rewrites pages to the end of the store)
         print("Generating quick reference...")
-        quick_ref = self.generate_quick_reference(pages)
+        quick_ref = self.generate_quick_reference(self.store.pages())
         print(f"  ✓ Extracted {len(quick_ref)} patterns\n")
         
+        # Categorize (classifying code samples in the same pass)
+        print("Categorizing pages...")
+        categories, classified = self.categorize_store()
+        if classified:
+            print(f"  🔤 Classified {classified} code samples")
+        print(f"  ✓ Created {len(categories)} categories\n")
+        category_urls = {cat: pages.urls for cat, pages in categories.items()}
+        
         # Create reference files
         print("Creating reference files...")
+        affected = None
+        if incremental and self.manifest:
+            affected = self.manifest.affected_categories(category_urls)
+            if affected is None:
+                print("  ℹ️  Category set changed - rebuilding all reference files")
+            else:
+                skipped = len(categories) - len(affected & set(categories))
+                print(f"  ℹ️  {len(affected)} categories affected, {skipped} unchanged")
+
         for cat, cat_pages in categories.items():
-            self.create_reference_file(cat, cat_pages)
+            if affected is None or cat in affected:
+                self.create_reference_file(cat, cat_pages)
+
+        # Drop reference files of categories that no longer exist
+        if self.manifest:
+            for cat in set(self.manifest.categories) - set(categories):
+                stale = os.path.join(self.skill_dir, "references", f"{cat}.md")
+                if os.path.exists(stale):
+                    os.remove(stale)
+            self.manifest.mark_built(category_urls)
+            self.manifest.save()
         
         # Create index
         self.create_index(categories)
@@ -712,6 +1494,65 @@ To refresh this skill with updated documentation:
         return True
 
 
+def extract_processes(config):
+    """Number of pipeline extraction processes: an int, or "auto" for one per core"""
+    value = config.get('extract_processes', 0)
+    if value == 'auto':
+        return os.cpu_count() or 1
+    return max(0, int(value or 0))
+
+
+def run_worker_process(config, frontier_spec, worker_index, num_workers):
+    """Entry point of one crawl worker process (or a --join invocation)"""
+    # Workers share the host, so each starts at 1/N of the politeness budget
+    # The coordinator alone writes corpus.sqlite (from the pages it collects)
+    config = dict(config, rate_limit=config.get('rate_limit', 0.5) * num_workers, corpus_db=False)
+    converter = DocToSkillConverter(config)
+    # The coordinator owns manifest.json; workers only write pages
+    converter.manifest = None
+    # One writer per archive file and per page store index
+    converter.store = PageStore(f"{converter.data_dir}/pages",
+                                writer=f"pages.{socket.gethostname()}-{os.getpid()}")
+    if converter.archive:
+        converter.archive = PageArchive(
+            f"{converter.data_dir}/raw_pages.{socket.gethostname()}-{os.getpid()}.archive")
+    frontier = open_frontier(frontier_spec, key=converter.canonicalizer.key)
+    if converter.dedup:
+        # Fingerprints go to the frontier's store, so a page repeating one
+        # that another worker (on any host) scraped is caught too
+        dedup = converter.dedup
+        converter.dedup = SharedDetector(partial(frontier.check_duplicate, max_distance=dedup.max_distance),
+                                         dedup.near_duplicates, dedup.max_distance)
+    try:
+        converter.run_worker(frontier, worker_index, num_workers)
+    finally:
+        frontier.close()
+
+
+# Converter of an extraction process (--replay or the scrape pipeline),
+# built once by the pool initializer
+_extract_converter = None
+
+
+def _init_extract_worker(config, shared_dedup=None):
+    global _extract_converter
+    _extract_converter = DocToSkillConverter(config, dry_run=True)
+    # Extractions are shared through the blob cache even though the converter is a dry run
+    _extract_converter.blob_cache = open_blob_cache(config)
+    if shared_dedup is not None:
+        dedup = _extract_converter.dedup
+        _extract_converter.dedup = SharedDetector(shared_dedup.check, dedup.near_duplicates, dedup.max_distance)
+
+
+def _replay_record(location):
+    header, body = read_record(*location)
+    return _extract_converter.extract_response(header['url'], body)
+
+
+def _extract_fetched(url, body):
+    return _extract_converter.extract_response(url, body, check_duplicates=True)
+
+
 def validate_config(config):
     """Validate configuration structure"""
     errors = []
@@ -786,6 +1627,116 @@ def validate_config(config):
         except (ValueError, TypeError):
             errors.append(f"'max_pages' must be an integer (got {config['max_pages']})")
 
+    # Validate concurrency
+    if 'concurrency' in config:
+        try:
+            workers = int(config['concurrency'])
+            if workers < 1:
+                errors.append(f"'concurrency' must be at least 1 (got {workers})")
+            elif workers > 32:
+                warnings.append(f"'concurrency' is very high ({workers}) - rate_limit still caps requests per host")
+        except (ValueError, TypeError):
+            errors.append(f"'concurrency' must be an integer (got {config['concurrency']})")
+
+    # Validate extraction pipeline
+    if 'extract_processes' in config and config['extract_processes'] != 'auto':
+        try:
+            processes = int(config['extract_processes'])
+            if processes < 0:
+                errors.append(f"'extract_processes' cannot be negative (got {processes})")
+        except (ValueError, TypeError):
+            errors.append(f"'extract_processes' must be an integer or \"auto\" (got {config['extract_processes']})")
+
+    # Validate http client options
+    if 'http' in config:
+        if not isinstance(config['http'], dict):
+            errors.append("'http' must be a dictionary")
+        else:
+            known = ['pool_size', 'max_connections_per_host', 'retries', 'backoff', 'http2']
+            for key in config['http']:
+                if key not in known:
+                    warnings.append(f"Unknown 'http' option: '{key}'")
+
+    if 'throttle' in config:
+        if not isinstance(config['throttle'], dict):
+            errors.append("'throttle' must be a dictionary")
+        else:
+            known = ['adaptive', 'min_delay', 'max_delay', 'increase', 'decrease', 'latency_factor', 'burst']
+            for key in config['throttle']:
+                if key not in known:
+                    warnings.append(f"Unknown 'throttle' option: '{key}'")
+            decrease = config['throttle'].get('decrease', 0.5)
+            if not isinstance(decrease, (int, float)) or not 0 < decrease < 1:
+                errors.append(f"'throttle.decrease' must be between 0 and 1 (got {decrease})")
+
+    if 'canonical' in config:
+        if not isinstance(config['canonical'], dict):
+            errors.append("'canonical' must be a dictionary")
+        else:
+            known = ['strip_fragment', 'drop_params', 'sort_query', 'index_files', 'fold_trailing_slash']
+            for key in config['canonical']:
+                if key not in known:
+                    warnings.append(f"Unknown 'canonical' option: '{key}'")
+
+    if 'sitemap' in config:
+        sitemap = config['sitemap']
+        if isinstance(sitemap, list):
+            for url in sitemap:
+                if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+                    errors.append(f"Invalid sitemap URL: '{url}' (must start with http:// or https://)")
+        elif not isinstance(sitemap, bool):
+            errors.append("'sitemap' must be true/false or a list of sitemap URLs")
+
+    if 'crawl_priority' in config:
+        priority = config['crawl_priority']
+        if priority not in ('depth', 'relevance') and not (
+                isinstance(priority, list) and all(isinstance(p, str) for p in priority)):
+            errors.append("'crawl_priority' must be \"depth\", \"relevance\" or a list of URL prefixes")
+
+    if 'fetch_limits' in config:
+        limits = config['fetch_limits']
+        if not isinstance(limits, dict):
+            errors.append("'fetch_limits' must be a dictionary")
+        else:
+            max_bytes = limits.get('max_bytes')
+            if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes < 1):
+                errors.append(f"'fetch_limits.max_bytes' must be a positive integer (got {max_bytes})")
+            types = limits.get('content_types')
+            if types is not None and not isinstance(types, list):
+                errors.append("'fetch_limits.content_types' must be a list of media types")
+
+    if 'http_cache' in config and not isinstance(config['http_cache'], bool):
+        errors.append(f"'http_cache' must be true or false (got {config['http_cache']})")
+
+    if 'parser' in config and config['parser'] not in PARSER_BACKENDS:
+        errors.append(f"Invalid parser: '{config['parser']}' (must be one of {', '.join(PARSER_BACKENDS)})")
+
+    if 'archive' in config and not isinstance(config['archive'], bool):
+        errors.append(f"'archive' must be true or false (got {config['archive']})")
+    if 'partial_parse' in config and not isinstance(config['partial_parse'], bool):
+        errors.append(f"'partial_parse' must be true or false (got {config['partial_parse']})")
+    if 'corpus_db' in config and not isinstance(config['corpus_db'], bool):
+        errors.append(f"'corpus_db' must be true or false (got {config['corpus_db']})")
+
+    if 'blob_cache' in config:
+        options = config['blob_cache']
+        if not isinstance(options, (bool, dict)):
+            errors.append(f"'blob_cache' must be true, false or a dictionary (got {options})")
+        elif isinstance(options, dict):
+            for key in ('max_age', 'max_bytes'):
+                value = options.get(key)
+                if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                    errors.append(f"'blob_cache.{key}' must be a positive number (got {value})")
+
+    if 'dedup' in config:
+        dedup = config['dedup']
+        if not isinstance(dedup, dict):
+            errors.append("'dedup' must be a dictionary")
+        else:
+            distance = dedup.get('max_distance', 3)
+            if not isinstance(distance, int) or not 0 <= distance < 64:
+                errors.append(f"'dedup.max_distance' must be an integer from 0 to 63 (got {distance})")
+
     # Validate start_urls if present
     if 'start_urls' in config:
         if not isinstance(config['start_urls'], list):
@@ -795,6 +1746,13 @@ def validate_config(config):
                 if not url.startswith(('http://', 'https://')):
                     errors.append(f"Invalid start_url: '{url}' (must start with http:// or https://)")
 
+    # Selectors and url_patterns must compile (only checked once the shapes above are right)
+    if not errors:
+        try:
+            CompiledConfig(config)
+        except ValueError as e:
+            errors.append(str(e))
+
     return errors, warnings
 
 
@@ -913,6 +1871,32 @@ def main():
                        help='Resume from last checkpoint (for interrupted scrapes)')
     parser.add_argument('--fresh', action='store_true',
                        help='Clear checkpoint and start fresh')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Re-scrape only new or changed pages and rebuild affected reference files')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Download every page in full instead of revalidating cached copies')
+    parser.add_argument('--workers', type=int, default=0,
+                       help='Crawl with N worker processes sharing an on-disk frontier')
+    parser.add_argument('--frontier', type=str,
+                       help='Shared frontier store: sqlite:///path (default: output/<name>_data/frontier.sqlite) or redis://host:port/db')
+    parser.add_argument('--join', action='store_true',
+                       help='Run one worker against a running crawl\'s --frontier, then exit (no build)')
+    parser.add_argument('--worker-index', type=int, default=0,
+                       help='With --join: this worker\'s index (0..workers-1), used for sharding')
+    parser.add_argument('--replay', action='store_true',
+                       help='Re-extract pages from the raw archive with the current selectors (no network)')
+    parser.add_argument('--no-archive', action='store_true',
+                       help='Do not keep raw responses for --replay')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS,
+                       help='HTML parser backend (default: config "parser" or html.parser)')
+    parser.add_argument('--partial-parse', action='store_true',
+                       help='Parse only the title and main content of each page (simple selectors only)')
+    parser.add_argument('--blob-cache', action='store_true',
+                       help='Share fetched bodies and extracted pages with other configs (~/.cache/skillseeker)')
+    parser.add_argument('--corpus-db', action='store_true',
+                       help='Also keep pages in a SQLite full-text corpus (corpus.sqlite)')
+    parser.add_argument('--extract-processes', type=lambda value: value if value == 'auto' else int(value), metavar='N',
+                       help='Extract pages in N processes while threads download (N or "auto")')
 
     args = parser.parse_args()
     
@@ -936,12 +1920,27 @@ def main():
             'max_pages': 500
         }
     
+    if args.no_cache:
+        config['http_cache'] = False
+    if args.no_archive:
+        config['archive'] = False
+    if args.parser:
+        config['parser'] = args.parser
+    if args.partial_parse:
+        config['partial_parse'] = True
+    if args.corpus_db:
+        config['corpus_db'] = True
+    if args.blob_cache and blob_cache_options(config) is None:
+        config['blob_cache'] = True
+    if args.extract_processes:
+        config['extract_processes'] = args.extract_processes
+
     # Dry run mode - preview only
     if args.dry_run:
         print(f"\n{'='*60}")
         print("DRY RUN MODE")
         print(f"{'='*60}")
-        print("This will show what would be scraped without saving anything.\n")
+        print("Nothing is scraped; discovered URLs are saved for the next real run.\n")
 
         converter = DocToSkillConverter(config, dry_run=True)
         converter.scrape_all()
@@ -954,26 +1953,40 @@ def main():
         print(f"   Categories: {len(config.get('categories', {}))}")
         return
 
+    # Extra worker for a crawl coordinated elsewhere (another host or terminal)
+    if args.join:
+        if not args.frontier:
+            print("❌ --join needs --frontier (the coordinator's frontier store)")
+            sys.exit(1)
+        run_worker_process(config, args.frontier, args.worker_index, max(1, args.workers))
+        return
+
     # Check for existing data
     exists, page_count = check_existing_data(config['name'])
 
-    if exists and not args.skip_scrape:
+    if exists and not args.skip_scrape and not args.incremental and not args.replay:
         print(f"\n✓ Found existing data: {page_count} pages")
         response = input("Use existing data? (y/n): ").strip().lower()
         if response == 'y':
             args.skip_scrape = True
 
     # Create converter
-    converter = DocToSkillConverter(config, resume=args.resume)
+    converter = DocToSkillConverter(config, resume=args.resume, incremental=args.incremental)
 
     # Handle fresh start (clear checkpoint)
     if args.fresh:
         converter.clear_checkpoint()
 
-    # Scrape or skip
-    if not args.skip_scrape:
+    # Scrape, re-extract from the archive, or skip
+    if args.replay:
+        if not converter.replay_archive():
+            sys.exit(1)
+    elif not args.skip_scrape:
         try:
-            converter.scrape_all()
+            if args.workers > 0:
+                converter.scrape_with_workers(args.workers, args.frontier)
+            else:
+                converter.scrape_all()
             # Save final checkpoint
             if converter.checkpoint_enabled:
                 converter.save_checkpoint()
@@ -983,6 +1996,7 @@ def main():
                 print("✅ Scraping complete - checkpoint cleared")
         except KeyboardInterrupt:
             print("\n\nScraping interrupted.")
+            converter.manifest.save()
             if converter.checkpoint_enabled:
                 converter.save_checkpoint()
                 print(f"💾 Progress saved to checkpoint")
@@ -994,7 +2008,7 @@ def main():
         print(f"\n⏭️  Skipping scrape, using existing data")
 
     # Build skill
-    success = converter.build_skill()
+    success = converter.build_skill(incremental=args.incremental)
 
     if not success:
         sys.exit(1)
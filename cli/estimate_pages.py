@@ -5,11 +5,27 @@ Quickly estimates how many pages a config will scrape without downloading conten
 """
 
 import sys
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
 import time
 import json
+from pathlib import Path
+
+try:
+    from http_client import get_client, fetch_limits
+    from sitemap import load_sitemap_urls, fetch_robots
+    from frontier import Frontier, make_priority
+    from canonical import UrlCanonicalizer
+    from throttle import make_throttle
+    from link_preview import preview_crawl, save_discovered
+    from compiled_config import CompiledConfig
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from http_client import get_client, fetch_limits
+    from sitemap import load_sitemap_urls, fetch_robots
+    from frontier import Frontier, make_priority
+    from canonical import UrlCanonicalizer
+    from throttle import make_throttle
+    from link_preview import preview_crawl, save_discovered
+    from compiled_config import CompiledConfig
 
 
 def estimate_pages(config, max_discovery=1000, timeout=30):
@@ -26,15 +42,18 @@ def estimate_pages(config, max_discovery=1000, timeout=30):
     """
     base_url = config['base_url']
     start_urls = config.get('start_urls', [base_url])
-    url_patterns = config.get('url_patterns', {'include': [], 'exclude': []})
     rate_limit = config.get('rate_limit', 0.5)
+    client = get_client(config)
+    throttle = make_throttle(config)
+    limits = fetch_limits(config)
 
-    visited = set()
-    pending = list(start_urls)
-    discovered = 0
+    canonicalizer = UrlCanonicalizer(config)
+    pending = Frontier((canonicalizer.canonicalize(url) for url in start_urls),
+                       priority=make_priority(config), key=canonicalizer.key)
 
-    include_patterns = url_patterns.get('include', [])
-    exclude_patterns = url_patterns.get('exclude', [])
+    # The scraper's own URL filter and selectors, so the estimate covers the same pages
+    compiled = CompiledConfig(config)
+    is_valid_url = compiled.is_valid_url
 
     print(f"🔍 Estimating pages for: {config['name']}")
     print(f"📍 Base URL: {base_url}")
@@ -45,63 +64,46 @@ def estimate_pages(config, max_discovery=1000, timeout=30):
 
     start_time = time.time()
 
-    while pending and discovered < max_discovery:
-        url = pending.pop(0)
-
-        # Skip if already visited
-        if url in visited:
-            continue
-
-        visited.add(url)
-        discovered += 1
-
-        # Progress indicator
-        if discovered % 10 == 0:
+    # A sitemap lists the whole site in one or a few requests
+    if config.get('sitemap'):
+        sitemap_urls = load_sitemap_urls(config, client, is_valid_url)
+        if sitemap_urls:
             elapsed = time.time() - start_time
-            rate = discovered / elapsed if elapsed > 0 else 0
-            print(f"⏳ Discovered: {discovered} pages ({rate:.1f} pages/sec)", end='\r')
-
-        try:
-            # HEAD request first to check if page exists (faster)
-            head_response = requests.head(url, timeout=timeout, allow_redirects=True)
-
-            # Skip non-HTML content
-            content_type = head_response.headers.get('Content-Type', '')
-            if 'text/html' not in content_type:
-                continue
-
-            # Now GET the page to find links
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Find all links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                full_url = urljoin(url, href)
-
-                # Normalize URL
-                parsed = urlparse(full_url)
-                full_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-
-                # Check if URL is valid
-                if not is_valid_url(full_url, base_url, include_patterns, exclude_patterns):
-                    continue
-
-                # Add to pending if not visited
-                if full_url not in visited and full_url not in pending:
-                    pending.append(full_url)
-
-            # Rate limiting
-            time.sleep(rate_limit)
+            print(f"🗺️  Sitemap: {len(sitemap_urls)} URLs in scope")
+            return {
+                'discovered': len(sitemap_urls),
+                'pending': 0,
+                'estimated_total': len(sitemap_urls),
+                'elapsed_seconds': round(elapsed, 2),
+                'discovery_rate': round(len(sitemap_urls) / elapsed if elapsed > 0 else 0, 2),
+                'hit_limit': False,
+                'source': 'sitemap'
+            }
+        print("🗺️  Sitemap: none found, falling back to crawling")
+
+    # Honor robots.txt Crawl-delay like the scraper does
+    throttle.set_crawl_delay(base_url, fetch_robots(base_url, client)['crawl_delay'])
+
+    def progress(url, visited):
+        if visited % 10 == 0:
+            elapsed = time.time() - start_time
+            rate = visited / elapsed if elapsed > 0 else 0
+            print(f"⏳ Discovered: {visited} pages ({rate:.1f} pages/sec, "
+                  f"{throttle.describe(url)})", end='\r')
+
+    # Link-only preview: no content extraction, downloads stop after the main region
+    stats = preview_crawl(
+        pending, client, throttle, canonicalizer,
+        is_valid_url,
+        main_selector=compiled.selectors['main_content'],
+        limits=limits, max_pages=max_discovery,
+        concurrency=int(config.get('concurrency', 1)), timeout=timeout, on_page=progress
+    )
+    discovered = stats['visited']
+    skipped = stats['skipped']
 
-        except requests.RequestException as e:
-            # Silently skip errors during estimation
-            pass
-        except Exception as e:
-            # Silently skip other errors
-            pass
+    # The next scrape of this config starts from what was found here
+    saved_to = save_discovered(config['name'], stats['urls'], pending, base_url)
 
     elapsed = time.time() - start_time
 
@@ -112,35 +114,15 @@ def estimate_pages(config, max_discovery=1000, timeout=30):
         'estimated_total': discovered + len(pending),
         'elapsed_seconds': round(elapsed, 2),
         'discovery_rate': round(discovered / elapsed if elapsed > 0 else 0, 2),
-        'hit_limit': discovered >= max_discovery
+        'hit_limit': discovered >= max_discovery,
+        'skipped': skipped,
+        'source': 'crawl',
+        'saved_to': saved_to
     }
 
     return results
 
 
-def is_valid_url(url, base_url, include_patterns, exclude_patterns):
-    """Check if URL should be crawled"""
-    # Must be same domain
-    if not url.startswith(base_url.rstrip('/')):
-        return False
-
-    # Check exclude patterns first
-    if exclude_patterns:
-        for pattern in exclude_patterns:
-            if pattern in url:
-                return False
-
-    # Check include patterns (if specified)
-    if include_patterns:
-        for pattern in include_patterns:
-            if pattern in url:
-                return True
-        return False
-
-    # If no include patterns, accept by default
-    return True
-
-
 def print_results(results, config):
     """Print estimation results"""
     print()
@@ -154,6 +136,12 @@ def print_results(results, config):
     print(f"✅ Pages Discovered: {results['discovered']}")
     print(f"⏳ Pages Pending: {results['pending']}")
     print(f"📈 Estimated Total: {results['estimated_total']}")
+    if results.get('source') == 'sitemap':
+        print("🗺️  Source: sitemap (exact count of in-scope URLs)")
+    if results.get('skipped'):
+        print(f"⏭️  Skipped (non-HTML or oversized): {results['skipped']}")
+    if results.get('saved_to'):
+        print(f"💾 URLs saved to {results['saved_to']} (the next scrape starts from them)")
     print()
     print(f"⏱️  Time Elapsed: {results['elapsed_seconds']}s")
     print(f"⚡ Discovery Rate: {results['discovery_rate']} pages/sec")
@@ -222,6 +210,9 @@ Examples:
 
   # Quick estimate (stop at 100 pages)
   python3 estimate_pages.py configs/vue.json --max-discovery 100
+
+  # Count pages from the site's sitemap instead of crawling
+  python3 estimate_pages.py configs/django.json --sitemap
         """
     )
 
@@ -230,11 +221,15 @@ Examples:
                        help='Maximum pages to discover (default: 1000)')
     parser.add_argument('--timeout', '-t', type=int, default=30,
                        help='HTTP request timeout in seconds (default: 30)')
+    parser.add_argument('--sitemap', action='store_true',
+                       help='Use robots.txt / sitemap.xml when available (same as "sitemap": true in config)')
 
     args = parser.parse_args()
 
     # Load config
     config = load_config(args.config)
+    if args.sitemap and not config.get('sitemap'):
+        config['sitemap'] = True
 
     # Run estimation
     try:
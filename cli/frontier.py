@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Crawl frontier for Skill Seeker
+An ordered queue of pending URLs plus a seen index, shared by the scraper and
+the page estimator. Membership checks and dedup are O(1) regardless of how
+many URLs are pending; ordering is FIFO (breadth-first) unless a priority
+function is given.
+
+A priority function takes (url, depth, inlinks) and returns a sort key, lowest
+first. inlinks counts the links seen to a pending URL; functions flagged
+`uses_inlinks` are re-evaluated each time another link to the URL turns up.
+
+Config:
+    "crawl_priority": "depth"                        # shallow pages first
+    "crawl_priority": ["/docs/api/", "/docs/guide/"]  # matching URLs first, in list order
+    "crawl_priority": "relevance"                    # best-first, see relevance.py
+"""
+
+import sys
+import heapq
+from collections import deque
+from pathlib import Path
+from urllib.parse import urlparse
+
+try:
+    from relevance import relevance_priority
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from relevance import relevance_priority
+
+
+# Rebuild the priority heap once it holds this many entries beyond twice the
+# pending URLs; the excess are stale entries left by re-ranking and discards
+COMPACT_MIN = 1024
+
+
+def depth_priority(url, depth, inlinks=1):
+    """Shallower pages first (link depth from the start URLs)"""
+    return depth
+
+
+def prefix_priority(prefixes):
+    """
+    Build a priority function that ranks URLs by the first matching prefix
+
+    Prefixes may be absolute URLs or paths ("/docs/api/"). URLs matching no
+    prefix come after all that do.
+    """
+    prefixes = list(prefixes)
+
+    def priority(url, depth, inlinks=1):
+        path = urlparse(url).path
+        for rank, prefix in enumerate(prefixes):
+            if url.startswith(prefix) or path.startswith(prefix):
+                return rank
+        return len(prefixes)
+
+    return priority
+
+
+def make_priority(config):
+    """Priority function for the config's crawl_priority, or None for FIFO"""
+    setting = config.get('crawl_priority')
+    if not setting:
+        return None
+    if setting == 'depth':
+        return depth_priority
+    if setting == 'relevance':
+        return relevance_priority(config)
+    if isinstance(setting, list):
+        return prefix_priority(setting)
+    raise ValueError(f"Unknown crawl_priority: {setting!r}")
+
+
+class Frontier:
+    """
+    Pending-URL queue with a seen index
+
+    A URL is accepted once: after it has been queued it is never queued again,
+    even after it was popped. `url in frontier` and `len(frontier)` refer to
+    URLs still pending. An optional key function (see canonical.py) decides
+    which spellings count as the same URL.
+    """
+
+    def __init__(self, urls=(), priority=None, key=None):
+        self.priority = priority
+        self.key = key or (lambda url: url)
+        self._queue = [] if priority else deque()
+        self._seq = 0            # tie-breaker keeps equal priorities FIFO
+        self._pending = set()    # keys still queued
+        self._depth = {}         # key -> link depth, for every seen URL
+        # Link-count priorities: pending key -> [inlinks, seq of its live heap entry]
+        self._links = {} if getattr(priority, 'uses_inlinks', False) else None
+        for url in urls:
+            self.add(url)
+
+    def add(self, url, depth=0):
+        """
+        Queue url unless it has been seen before
+
+        Returns:
+            bool: True if the URL was queued
+        """
+        k = self.key(url)
+        if k in self._depth:
+            if self._links is not None and k in self._pending:
+                # One more inbound link: re-rank; the old heap entry goes stale
+                self._links[k][0] += 1
+                self._push(url, k)
+            return False
+        self._depth[k] = depth
+        self._pending.add(k)
+        if self._links is not None:
+            self._links[k] = [1, None]
+        if self.priority:
+            self._push(url, k)
+        else:
+            self._queue.append((url, k))
+        return True
+
+    def _push(self, url, k):
+        inlinks = 1
+        if self._links is not None:
+            inlinks = self._links[k][0]
+            self._links[k][1] = self._seq
+        heapq.heappush(self._queue, (self.priority(url, self._depth[k], inlinks), self._seq, url, k))
+        self._seq += 1
+        if len(self._queue) > COMPACT_MIN + 2 * len(self._pending):
+            self._compact()
+
+    def _compact(self):
+        """Rebuild the heap without stale (re-ranked or discarded) entries"""
+        self._queue = [entry for entry in self._queue if self._live(entry)]
+        heapq.heapify(self._queue)
+
+    def _live(self, entry):
+        """True if a heap entry is the current one for a pending URL"""
+        k = entry[3]
+        if k not in self._pending:
+            return False
+        return self._links is None or self._links[k][1] == entry[1]
+
+    def _entries(self):
+        """Queue entries as (url, key), in crawl order, skipping discarded ones"""
+        if self.priority:
+            return ((entry[2], entry[3]) for entry in sorted(self._queue) if self._live(entry))
+        return ((url, k) for url, k in list(self._queue) if k in self._pending)
+
+    def _drop_discarded(self):
+        """Remove discarded entries from the head of the queue"""
+        while self._queue:
+            if self.priority:
+                if self._live(self._queue[0]):
+                    return
+                heapq.heappop(self._queue)
+            else:
+                if self._queue[0][1] in self._pending:
+                    return
+                self._queue.popleft()
+
+    def pop(self):
+        """Remove and return the next URL to crawl"""
+        self._drop_discarded()
+        if self.priority:
+            _, _, url, k = heapq.heappop(self._queue)
+        else:
+            url, k = self._queue.popleft()
+        self._pending.discard(k)
+        if self._links is not None:
+            del self._links[k]
+        return url
+
+    def peek(self):
+        """Next URL to crawl, without removing it"""
+        self._drop_discarded()
+        return self._queue[0][2] if self.priority else self._queue[0][0]
+
+    def discard(self, url):
+        """Stop a pending URL from being crawled (it stays seen)"""
+        k = self.key(url)
+        self._pending.discard(k)
+        if self._links is not None:
+            self._links.pop(k, None)
+
+    def seen(self, url):
+        """True if url was ever queued (pending or already popped)"""
+        return self.key(url) in self._depth
+
+    def mark_seen(self, urls):
+        """Record already-visited URLs so they are never queued"""
+        for url in urls:
+            self._depth.setdefault(self.key(url), 0)
+
+    def depth(self, url):
+        """Link depth of a seen URL (0 for start and sitemap URLs)"""
+        return self._depth.get(self.key(url), 0)
+
+    def clear(self):
+        """Drop every pending URL (they may be queued again later)"""
+        for k in self._pending:
+            del self._depth[k]
+        self._pending.clear()
+        if self._links is not None:
+            self._links.clear()
+        self._queue = [] if self.priority else deque()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __bool__(self):
+        return bool(self._pending)
+
+    def __contains__(self, url):
+        return self.key(url) in self._pending
+
+    def __iter__(self):
+        """Pending URLs in crawl order"""
+        return (url for url, _ in self._entries())
+
+    def dump(self):
+        """
+        Compact checkpoint form: pending URLs in crawl order plus their depths
+
+        Returns:
+            tuple: (urls, depths) as parallel lists
+        """
+        urls, depths = [], []
+        for url, k in self._entries():
+            urls.append(url)
+            depths.append(self._depth[k])
+        return urls, depths
+
+    def load(self, urls, depths=None):
+        """Queue URLs from a checkpoint (depths default to 0)"""
+        depths = depths or [0] * len(urls)
+        for url, depth in zip(urls, depths):
+            self.add(url, depth)
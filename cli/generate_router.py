@@ -10,7 +10,13 @@ import json
 import sys
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+try:
+    from corpus_db import open_corpus
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from corpus_db import open_corpus
 
 
 class RouterGenerator:
@@ -21,6 +27,7 @@ class RouterGenerator:
         self.configs = [self.load_config(p) for p in self.config_paths]
         self.router_name = router_name or self.infer_router_name()
         self.base_config = self.configs[0]  # Use first as template
+        self.data_root = Path('output')  # Where sub-skills' <name>_data directories live
 
     def load_config(self, path: Path) -> Dict[str, Any]:
         """Load a config file"""
@@ -61,6 +68,12 @@ class RouterGenerator:
                 skill_topic = name.split('-', 1)[1]
                 keywords.append(skill_topic)
 
+            # Most common words in the scraped page titles, if the skill has a corpus
+            corpus = open_corpus(self.data_root / f"{name}_data")
+            if corpus is not None:
+                keywords.extend(term for term in corpus.top_terms(limit=8) if term not in keywords)
+                corpus.close()
+
             routing[name] = keywords
 
         return routing
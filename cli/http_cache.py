@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Conditional-revalidation HTTP cache for Skill Seeker
+Stores response bodies with their ETag/Last-Modified validators in
+output/<name>_data/http_cache.sqlite. Re-scrapes send If-None-Match /
+If-Modified-Since and reuse the stored body on 304 Not Modified, so only
+changed pages are transferred.
+"""
+
+import sys
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    from http_client import guarded_get, release
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from http_client import guarded_get, release
+
+
+class ResponseCache:
+    """On-disk cache of page bodies keyed by URL, revalidated with conditional GETs"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " content_type TEXT,"
+            " body BLOB,"
+            " stored_at REAL,"
+            " final_url TEXT)"
+        )
+        # Caches created before final URLs were stored
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(responses)")]
+        if 'final_url' not in columns:
+            self._conn.execute("ALTER TABLE responses ADD COLUMN final_url TEXT")
+        self._conn.commit()
+
+        # Stats for the end-of-scrape report
+        self.revalidated = 0
+        self.fetched = 0
+        self.bytes_transferred = 0
+        self.bytes_saved = 0
+
+    def lookup(self, url):
+        """Return (etag, last_modified, content_type, body) for url, or None"""
+        entry = self._entry(url)
+        return entry[:4] if entry else None
+
+    def _entry(self, url):
+        """Return (etag, last_modified, content_type, body, final_url) for url, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_type, body, final_url FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, content_type, body, final_url = row
+        return etag, last_modified, content_type, zlib.decompress(body), final_url or url
+
+    def store(self, url, response):
+        """Store a 200 response if the server gave us a validator to revalidate with"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (url, etag, last_modified, content_type, body, stored_at, final_url)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, response.headers.get('Content-Type', ''),
+                 zlib.compress(response.content), time.time(), response.url or url)
+            )
+            self._conn.commit()
+
+    def fetch(self, client, url, limits=None, **kwargs):
+        """
+        GET url through client, revalidating any cached copy
+
+        Args:
+            client: HttpClient
+            url: URL to fetch
+            limits: Optional guarded_get limits (max_bytes, content_types)
+                applied to fresh downloads
+
+        Returns:
+            requests.Response: Fresh response, or the cached body on 304
+                (with from_cache=True)
+        """
+        cached = self._entry(url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cached:
+            etag, last_modified = cached[:2]
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        if limits:
+            response = guarded_get(client, url, headers=headers, **limits, **kwargs)
+        else:
+            response = client.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and cached:
+            # The 304 itself is dropped; give its connection back to the pool
+            release(response)
+            with self._lock:
+                self.revalidated += 1
+                self.bytes_saved += len(cached[3])
+            return self._cached_response(cached)
+
+        response.from_cache = False
+        if response.status_code == 200:
+            with self._lock:
+                self.fetched += 1
+                self.bytes_transferred += len(response.content)
+            self.store(url, response)
+        return response
+
+    def _cached_response(self, cached):
+        """Rebuild a 200 response from a cache entry, under its stored final URL"""
+        etag, last_modified, content_type, body, final_url = cached
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = final_url
+        response.headers = CaseInsensitiveDict({'Content-Type': content_type or 'text/html'})
+        if etag:
+            response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = last_modified
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def summary(self):
+        """One-line report of what the cache saved this run"""
+        total = self.revalidated + self.fetched
+        return (f"{self.revalidated}/{total} pages unchanged (304), "
+                f"{self.bytes_transferred / 1024:.1f} KB transferred, "
+                f"{self.bytes_saved / 1024:.1f} KB reused")
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
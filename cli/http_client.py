@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for Skill Seeker
+One pooled client used by the scraper, the page estimator and the uploader,
+so pages reuse keep-alive connections instead of paying a fresh TCP/TLS
+handshake per request.
+
+Config (optional "http" section):
+    {
+      "http": {
+        "pool_size": 10,                  # number of hosts kept in the pool
+        "max_connections_per_host": 10,   # open connections per host
+        "retries": 3,                     # retries on connection errors / 5xx
+        "backoff": 0.5,                   # exponential backoff factor (seconds)
+        "http2": false                    # use httpx HTTP/2 backend if installed
+      },
+      "fetch_limits": {
+        "max_bytes": 5242880,             # abort bodies larger than this
+        "content_types": ["text/html", "application/xhtml+xml"]
+      }
+    }
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Documentation Scraper)'
+
+# Server errors worth retrying; 4xx responses are returned to the caller
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Only idempotent methods are retried after the request was sent
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+DEFAULT_OPTIONS = {
+    'pool_size': 10,
+    'max_connections_per_host': 10,
+    'retries': 3,
+    'backoff': 0.5,
+    'http2': False,
+}
+
+# What a page fetch is allowed to download (see guarded_get)
+DEFAULT_LIMITS = {
+    'max_bytes': 5 * 1024 * 1024,
+    'content_types': ['text/html', 'application/xhtml+xml'],
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ContentSkipped(requests.RequestException):
+    """A response was abandoned because of its type or size"""
+
+    def __init__(self, url, reason):
+        super().__init__(f"Skipped {url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+def accept_encoding():
+    """Content codings this install can decode (gzip, deflate, plus br/zstd when available)"""
+    return make_headers(accept_encoding=True)['accept-encoding']
+
+
+def _make_retry(retries, backoff):
+    """Build a urllib3 retry policy for connection errors and 5xx responses"""
+    kwargs = dict(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(allowed_methods=IDEMPOTENT_METHODS, **kwargs)
+    except TypeError:
+        # urllib3 < 1.26 calls it method_whitelist
+        return Retry(method_whitelist=IDEMPOTENT_METHODS, **kwargs)
+
+
+class HttpClient:
+    """Thread-safe pooled HTTP client with retries and compression"""
+
+    def __init__(self, pool_size=10, max_connections_per_host=10, retries=3,
+                 backoff=0.5, http2=False, user_agent=DEFAULT_USER_AGENT):
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = {
+            'User-Agent': user_agent,
+            'Accept-Encoding': accept_encoding(),
+        }
+        self.backend = 'requests'
+        self._httpx = None
+
+        if http2:
+            self._httpx = self._make_httpx_client(pool_size, max_connections_per_host)
+            if self._httpx is not None:
+                self.backend = 'httpx-http2'
+
+        # pool_block caps open connections per host; extra threads wait for a free one
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=max_connections_per_host,
+            pool_block=True,
+            max_retries=_make_retry(retries, backoff),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _make_httpx_client(self, pool_size, max_connections_per_host):
+        """Create the optional HTTP/2 backend, or None if httpx/h2 are missing"""
+        try:
+            import httpx
+            import h2  # noqa: F401 - httpx needs it for http2=True
+        except ImportError:
+            print("⚠️  HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1")
+            print("   Install with: pip install 'httpx[http2]'")
+            return None
+
+        limits = httpx.Limits(
+            max_connections=pool_size * max_connections_per_host,
+            max_keepalive_connections=pool_size * max_connections_per_host,
+        )
+        return httpx.Client(
+            http2=True,
+            limits=limits,
+            headers=self.headers,
+            follow_redirects=True,
+            transport=httpx.HTTPTransport(http2=True, retries=self.retries, limits=limits),
+        )
+
+    def request(self, method, url, **kwargs):
+        """Send a request; returns a requests.Response for either backend"""
+        if self._httpx is not None:
+            return self._httpx_request(method, url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def _httpx_request(self, method, url, **kwargs):
+        """Send via httpx, retrying 5xx like the requests backend does"""
+        import httpx
+
+        kwargs.pop('allow_redirects', None)
+        kwargs.pop('stream', None)  # bodies are buffered; guarded_get checks them after the fact
+        attempts = 1 + (self.retries if method in IDEMPOTENT_METHODS else 0)
+
+        for attempt in range(attempts):
+            try:
+                response = self._httpx.request(method, url, **kwargs)
+            except httpx.TimeoutException as e:
+                raise requests.exceptions.Timeout(str(e))
+            except httpx.TransportError as e:
+                raise requests.exceptions.ConnectionError(str(e))
+            except httpx.HTTPError as e:
+                raise requests.exceptions.RequestException(str(e))
+
+            if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                return _to_requests_response(response)
+            time.sleep(self.backoff * (2 ** attempt))
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+        if self._httpx is not None:
+            self._httpx.close()
+
+
+def _to_requests_response(response):
+    """Adapt an httpx response so callers only ever see requests.Response"""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.url = str(response.url)
+    converted.encoding = response.encoding
+    converted._content = response.content
+    return converted
+
+
+def fetch_limits(config=None):
+    """Merge a config's "fetch_limits" section over the defaults"""
+    limits = dict(DEFAULT_LIMITS)
+    if config:
+        overrides = config.get('fetch_limits', {})
+        limits.update({k: v for k, v in overrides.items() if k in DEFAULT_LIMITS})
+    return limits
+
+
+def open_guarded(client, url, max_bytes=None, content_types=None, **kwargs):
+    """
+    Send a streaming GET and check its headers before any body is read
+
+    Returns:
+        requests.Response: Body not yet read (see iter_body); non-200
+            responses come back closed, with their body discarded
+
+    Raises:
+        ContentSkipped: Content-Type or Content-Length rules the page out
+    """
+    response = client.get(url, stream=True, **kwargs)
+    if response.status_code != 200:
+        # An unread streamed body holds its connection forever, and the pool
+        # blocks once max_connections_per_host of them pile up
+        response._content = b''
+        release(response)
+        return response
+
+    media_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if media_type and content_types and media_type not in content_types:
+        response.close()
+        raise ContentSkipped(url, f"content type {media_type}")
+
+    length = response.headers.get('Content-Length')
+    if max_bytes and length and length.isdigit() and int(length) > max_bytes:
+        response.close()
+        raise ContentSkipped(url, f"{int(length) // 1024} KB exceeds {max_bytes // 1024} KB limit")
+
+    return response
+
+
+def iter_body(response, url, max_bytes=None):
+    """
+    Yield the body of a response from open_guarded in chunks
+
+    Raises:
+        ContentSkipped: Body grew past max_bytes
+    """
+    if getattr(response, 'raw', None) is None:
+        # Already buffered (HTTP/2 backend or a rebuilt response)
+        if max_bytes and len(response.content) > max_bytes:
+            raise ContentSkipped(url, f"body exceeds {max_bytes // 1024} KB limit")
+        yield response.content
+        return
+
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            response.close()
+            raise ContentSkipped(url, f"body exceeds {max_bytes // 1024} KB limit")
+        yield chunk
+
+
+def release(response):
+    """Hand a streamed response's connection back to the pool (buffered responses need nothing)"""
+    if getattr(response, 'raw', None) is not None:
+        response.close()
+
+
+def guarded_get(client, url, max_bytes=None, content_types=None, **kwargs):
+    """
+    GET a page in one streaming request, giving up early on unwanted bodies
+
+    Content-Type and Content-Length are checked as soon as the headers
+    arrive; the body is then read in chunks and abandoned once it passes
+    max_bytes. Non-200 responses are returned as open_guarded gives them.
+
+    Args:
+        client: HttpClient (or anything with a requests-style get)
+        url: URL to fetch
+        max_bytes: Largest decoded body to accept (None for no limit)
+        content_types: Accepted media types (None/empty accepts any);
+            responses without a Content-Type are accepted
+
+    Returns:
+        requests.Response: With the body loaded
+
+    Raises:
+        ContentSkipped: Body was the wrong type or too large
+    """
+    response = open_guarded(client, url, max_bytes, content_types, **kwargs)
+    if response.status_code != 200:
+        return response
+
+    body = b''.join(iter_body(response, url, max_bytes))
+    if getattr(response, 'raw', None) is not None:
+        response._content = body
+    return response
+
+
+def http_options(config=None):
+    """Merge a config's "http" section over the defaults"""
+    options = dict(DEFAULT_OPTIONS)
+    if config:
+        overrides = config.get('http', {})
+        options.update({k: v for k, v in overrides.items() if k in DEFAULT_OPTIONS})
+    return options
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(config=None):
+    """
+    Get the shared client for a config's HTTP options
+
+    Clients are cached per option set, so every caller in a process shares
+    one connection pool.
+
+    Args:
+        config: Configuration dictionary (optional)
+
+    Returns:
+        HttpClient
+    """
+    options = http_options(config)
+    key = tuple(sorted(options.items()))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = HttpClient(**options)
+            _clients[key] = client
+        return client
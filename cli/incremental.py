@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Incremental scrape manifest for Skill Seeker
+Tracks a content hash, sitemap lastmod and reference category per URL in output/<name>_data/manifest.json, so re-scrapes can skip unchanged
+pages, drop pages that disappeared, and rebuild only the affected reference
+files.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+def page_hash(page):
+    """Stable content hash of an extracted page"""
+    data = json.dumps(page, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ScrapeManifest:
+    """Per-URL record of the last scrape plus changes not yet built"""
+
+    def __init__(self, path, store=None):
+        self.path = path
+        self.store = store     # PageStore holding the pages
+        self.entries = {}      # url -> {'hash', 'lastmod', 'category'}
+        self.categories = []   # category names of the last build
+        self.added = set()
+        self.changed = set()
+        self.removed = {}      # url -> entry it had before removal
+        self.load()
+
+    def load(self):
+        """Load manifest from disk (missing file means first scrape)"""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Failed to load manifest, treating every page as new: {e}")
+            return
+
+        self.entries = data.get('pages', {})
+        self.categories = data.get('categories', [])
+        changes = data.get('pending_changes', {})
+        self.added = set(changes.get('added', []))
+        self.changed = set(changes.get('changed', []))
+        self.removed = changes.get('removed', {})
+
+    def save(self):
+        """Write manifest to disk"""
+        data = {
+            'last_updated': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            'categories': self.categories,
+            'pending_changes': {
+                'added': sorted(self.added),
+                'changed': sorted(self.changed),
+                'removed': self.removed,
+            },
+            'pages': self.entries,
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def is_fresh(self, url, lastmod):
+        """True if the sitemap says url has not changed since we stored it"""
+        entry = self.entries.get(url)
+        return bool(entry and lastmod and entry.get('lastmod') == lastmod
+                    and self.store is not None and url in self.store)
+
+    def record(self, page, lastmod=None):
+        """
+        Record a freshly scraped page
+
+        Returns:
+            str: 'added', 'changed' or 'unchanged'
+        """
+        url = page['url']
+        digest = page_hash(page)
+        entry = self.entries.get(url)
+
+        if entry is None:
+            status = 'added'
+            self.added.add(url)
+        elif entry['hash'] != digest:
+            status = 'changed'
+            if url not in self.added:
+                self.changed.add(url)
+        else:
+            status = 'unchanged'
+
+        self.entries[url] = {
+            'hash': digest,
+            'lastmod': lastmod or (entry or {}).get('lastmod'),
+            'category': (entry or {}).get('category'),
+        }
+        self.removed.pop(url, None)
+        return status
+
+    def drop_missing(self, present_urls):
+        """
+        Forget URLs that were not seen in a complete crawl
+
+        Returns:
+            list: The dropped URLs
+        """
+        dropped = []
+        for url in list(self.entries):
+            if url not in present_urls:
+                entry = self.entries.pop(url)
+                self.added.discard(url)
+                self.changed.discard(url)
+                self.removed[url] = entry
+                dropped.append(url)
+        return dropped
+
+    def affected_categories(self, categories):
+        """
+        Categories whose reference files must be regenerated
+
+        Args:
+            categories: {category: [page URLs]} from the current build
+
+        Returns:
+            set: Category names, or None if everything must be rebuilt
+        """
+        if not self.categories or sorted(categories) != sorted(self.categories):
+            return None
+
+        url_category = {}
+        for cat, urls in categories.items():
+            for url in urls:
+                url_category[url] = cat
+
+        affected = set()
+        for url in self.added | self.changed:
+            affected.add(url_category.get(url))
+            affected.add(self.entries.get(url, {}).get('category'))
+        for entry in self.removed.values():
+            affected.add(entry.get('category'))
+        # A page can land in a different category when any page changes
+        for url, cat in url_category.items():
+            if self.entries.get(url, {}).get('category') != cat:
+                affected.add(cat)
+                affected.add(self.entries.get(url, {}).get('category'))
+
+        affected.discard(None)
+        return affected
+
+    def mark_built(self, categories):
+        """Remember each page's category ({category: [page URLs]}) and clear pending changes"""
+        for cat, urls in categories.items():
+            for url in urls:
+                entry = self.entries.get(url)
+                if entry is not None:
+                    entry['category'] = cat
+        self.categories = sorted(categories)
+        self.added.clear()
+        self.changed.clear()
+        self.removed = {}
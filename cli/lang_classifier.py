@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Code language classifier for Skill Seeker
+Multinomial naive Bayes over code tokens, token bigrams and identifier
+naming style (camelCase / snake_case). The tables ship
+precomputed in data/lang_model.json: the selected features and, per feature,
+one quantized cost (-log P(feature | language), in 1/16 nat steps) for each
+language, stored as a base64 byte array.
+
+Scoring is batched: each feature's costs are packed into a single integer,
+one 32-bit lane per language, so a sample's score for every language is one
+sum() over its features followed by unpacking the lanes. 100K samples
+classify in a few seconds without numpy.
+
+Retrain (source trees are split into short snippets by file extension;
+training/lang_samples holds doc-style snippets, weighted up because source
+files read differently from documentation examples):
+    python3 cli/lang_classifier.py train --corpus /usr/include --corpus ~/src \\
+        --samples training/lang_samples
+"""
+
+import argparse
+import base64
+import json
+import math
+import random
+import re
+import sys
+from collections import Counter, defaultdict
+from itertools import repeat
+from operator import add, mul
+from pathlib import Path
+
+
+MODEL_PATH = Path(__file__).parent / 'data' / 'lang_model.json'
+
+# Below this confidence the model's guess is dropped for keyword_language()
+MIN_CONFIDENCE = 0.6
+# Snippets shorter than this many tokens carry little evidence (print("hi")
+# is Python and GDScript alike), so the model must be surer of them
+SHORT_TOKENS = 8
+SHORT_MIN_CONFIDENCE = 0.75
+# Only the start of very long samples is scored
+MAX_CHARS = 4000
+
+# Languages whose code is often also valid in another: when a sample is
+# only confidently one of the pair, it is reported as the plainer one
+SUPERSETS = {'typescript': 'javascript', 'cpp': 'c'}
+
+# Lanes are read back as native unsigned ints ('I'), so 32 bits each
+LANE_BITS = 32
+
+_TOKEN = re.compile(r'[A-Za-z_]\w*|\d+|\n|[^\w\s]{1,3}')
+
+
+def keyword_language(code):
+    """The scraper's original keyword rules, for samples the model is unsure about"""
+    if 'import ' in code and 'from ' in code:
+        return 'python'
+    if 'const ' in code or 'let ' in code or '=>' in code:
+        return 'javascript'
+    if 'func ' in code and 'var ' in code:
+        return 'gdscript'
+    if 'def ' in code and ':' in code:
+        return 'python'
+    if '#include' in code or 'int main' in code:
+        return 'cpp'
+    return 'unknown'
+
+
+def tokenize(code):
+    """Identifiers, numbers, newlines and runs of up to 3 symbols"""
+    return _TOKEN.findall(code[:MAX_CHARS])
+
+
+# Identifier naming style is a strong hint on short snippets (myVar vs my_var)
+# whatever the identifier itself: each lower-to-upper step counts as one
+# <camel> feature and each lowercase underscore join as one <snake>
+_SHAPE = re.compile(r'[a-z](?:[A-Z]|_[a-z])')
+SHAPE_FEATURES = ('<camel>', '<snake>')
+
+
+def shapes(code):
+    """(camel, snake) counts for a snippet"""
+    joins = _SHAPE.findall(code[:MAX_CHARS])
+    snake = ''.join(joins).count('_')
+    return len(joins) - snake, snake
+
+
+def features(code):
+    """Unigrams, bigrams and identifier shapes of a snippet, with repeats"""
+    tokens = tokenize(code)
+    found = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for shape, count in zip(SHAPE_FEATURES, shapes(code)):
+        found += [shape] * count
+    return found
+
+
+class LanguageClassifier:
+    """
+    Naive Bayes code classifier
+
+    Args:
+        model: Model dict as saved by train(), or None for the shipped model
+    """
+
+    def __init__(self, model=None):
+        if model is None:
+            with open(MODEL_PATH, 'r', encoding='utf-8') as f:
+                model = json.load(f)
+
+        self.languages = model['languages']
+        self.scale = model['scale']
+        count = len(self.languages)
+        # Lane index -> (lane of the plainer language, lanes of its family)
+        self._families = []
+        for language in self.languages:
+            base = SUPERSETS.get(language, language)
+            family = [i for i, other in enumerate(self.languages)
+                      if other == base or SUPERSETS.get(other) == base]
+            self._families.append((self.languages.index(base) if base in self.languages else None, family))
+        costs = base64.b64decode(model['costs'])
+
+        # Tokens get ids (0 = not in the model); unigram costs are indexed by
+        # id and bigram costs keyed by a * size + b, so scoring needs no
+        # string building. Each cost is one packed integer: lane i holds the
+        # cost for language i.
+        parts = [feature.split(' ') for feature in model['features']]
+        self._ids = {}
+        for tokens in parts:
+            for token in tokens:
+                self._ids.setdefault(token, len(self._ids) + 1)
+        self._size = len(self._ids) + 1
+        self._unigrams = [0] * self._size
+        self._bigrams = {}
+        for index, tokens in enumerate(parts):
+            row = costs[index * count:(index + 1) * count]
+            packed = sum(cost << (LANE_BITS * lane) for lane, cost in enumerate(row))
+            ids = [self._ids[token] for token in tokens]
+            if len(ids) == 1:
+                self._unigrams[ids[0]] = packed
+            else:
+                self._bigrams[ids[0] * self._size + ids[1]] = packed
+
+    def classify_batch(self, codes):
+        """
+        Classify many code samples at once
+
+        Returns:
+            list: (language, confidence) per sample. Below MIN_CONFIDENCE
+                (SHORT_MIN_CONFIDENCE for snippets under SHORT_TOKENS tokens)
+                or when no known feature occurs, keyword_language() picks the
+                language, which may be 'unknown'; confidence stays the model's
+        """
+        ids_get, unigrams, bigrams_get = self._ids.get, self._unigrams, self._bigrams.get
+        size = self._size
+        shape_costs = [unigrams[ids_get(shape, 0)] for shape in SHAPE_FEATURES]
+        width = len(self.languages) * LANE_BITS // 8
+        results = []
+        seen = {}
+        for code in codes:
+            # Doc sites repeat snippets (install commands, imports)
+            if code in seen:
+                results.append(seen[code])
+                continue
+
+            # Everything per token runs in C: map/filter over dict and list lookups.
+            # Bigram keys with an unknown token (id 0) are never in the table.
+            ids = list(map(ids_get, tokenize(code), repeat(0)))
+            found = list(filter(None, map(unigrams.__getitem__, ids)))
+            found += filter(None, map(bigrams_get, map(add, map(mul, ids, repeat(size)), ids[1:]), repeat(0)))
+            for packed, count in zip(shape_costs, shapes(code)):
+                if packed:
+                    found += [packed] * count
+            if not found:
+                seen[code] = (keyword_language(code), 0.0)
+                results.append(seen[code])
+                continue
+
+            # Sum every language at once, then split the lanes
+            costs = memoryview(sum(found).to_bytes(width, sys.byteorder)).cast('I').tolist()
+            best = costs.index(min(costs))
+
+            # Posterior over languages; dividing by sqrt(n) tempers naive
+            # Bayes' overconfidence on long samples
+            temperature = self.scale * math.sqrt(len(found))
+            lowest = costs[best]
+            weights = [math.exp((lowest - cost) / temperature) for cost in costs]
+            total = sum(weights)
+            language, confidence = self.languages[best], 1.0 / total
+            if confidence < MIN_CONFIDENCE:
+                base, family = self._families[best]
+                if base is not None and len(family) > 1:
+                    language = self.languages[base]
+                    confidence = sum(weights[i] for i in family) / total
+            if confidence < (SHORT_MIN_CONFIDENCE if len(ids) < SHORT_TOKENS else MIN_CONFIDENCE):
+                language = keyword_language(code)
+            seen[code] = (language, round(confidence, 3))
+            results.append(seen[code])
+        return results
+
+    def classify(self, code):
+        return self.classify_batch([code])[0]
+
+
+_default = None
+
+
+def get_classifier():
+    """The shipped model, loaded once"""
+    global _default
+    if _default is None:
+        _default = LanguageClassifier()
+    return _default
+
+
+# --- Training ---------------------------------------------------------------
+
+EXTENSIONS = {
+    '.py': 'python', '.js': 'javascript', '.mjs': 'javascript', '.ts': 'typescript',
+    '.c': 'c', '.h': 'c', '.cpp': 'cpp', '.cc': 'cpp', '.hpp': 'cpp',
+    '.go': 'go', '.rs': 'rust', '.rb': 'ruby', '.sh': 'bash', '.bash': 'bash',
+    '.yaml': 'yaml', '.yml': 'yaml', '.json': 'json', '.css': 'css',
+    '.html': 'html', '.xml': 'xml', '.toml': 'toml', '.gd': 'gdscript',
+    '.sql': 'sql', '.php': 'php', '.java': 'java', '.cs': 'csharp',
+}
+SAMPLE_SEPARATOR = '%%%%'
+
+
+def corpus_snippets(roots, per_language=3000, seed=0):
+    """
+    Cut source files into doc-sized snippets (3-15 lines)
+
+    Returns:
+        dict: language -> list of snippets
+    """
+    rng = random.Random(seed)
+    files = defaultdict(list)
+    for root in roots:
+        for path in Path(root).expanduser().rglob('*'):
+            language = EXTENSIONS.get(path.suffix.lower())
+            if language and path.is_file():
+                files[language].append(path)
+
+    snippets = defaultdict(list)
+    for language, paths in files.items():
+        rng.shuffle(paths)
+        for path in paths:
+            if len(snippets[language]) >= per_language:
+                break
+            try:
+                lines = path.read_text(encoding='utf-8').splitlines()
+            except (OSError, UnicodeDecodeError):
+                continue
+            # A few windows per file keeps one large file from dominating
+            for _ in range(3):
+                if len(lines) < 3:
+                    break
+                size = rng.randint(3, 15)
+                start = rng.randint(0, max(0, len(lines) - size))
+                snippet = '\n'.join(lines[start:start + size]).strip()
+                if len(snippet) >= 20:
+                    snippets[language].append(snippet)
+    return snippets
+
+
+def sample_snippets(directory):
+    """Snippets from <language>.txt files, separated by %%%% lines"""
+    snippets = {}
+    for path in Path(directory).glob('*.txt'):
+        text = path.read_text(encoding='utf-8')
+        snippets[path.stem] = [s.strip() for s in re.split(rf'^{SAMPLE_SEPARATOR}$', text, flags=re.M) if s.strip()]
+    return snippets
+
+
+def train(snippets, per_language_features=600, min_samples=3, alpha=0.5, scale=16):
+    """
+    Fit the model
+
+    Each language's counts are rescaled to the same total, so languages
+    with few snippets are not favoured by smoothing.
+
+    Args:
+        snippets: language -> list of code snippets
+        per_language_features: Most frequent features kept per language
+
+    Returns:
+        dict: Model (see LanguageClassifier)
+    """
+    languages = sorted(language for language, items in snippets.items() if items)
+    counts = {}
+    document_frequency = Counter()
+    for language in languages:
+        counts[language] = Counter()
+        for snippet in snippets[language]:
+            found = features(snippet)
+            counts[language].update(found)
+            document_frequency.update(set(found))
+
+    vocabulary = set()
+    for language in languages:
+        common = [f for f, _ in counts[language].most_common()
+                  if document_frequency[f] >= min_samples]
+        vocabulary.update(common[:per_language_features])
+    vocabulary = sorted(vocabulary)
+
+    target = max(sum(counts[language].values()) for language in languages)
+    costs = bytearray()
+    rows = {}
+    for language in languages:
+        weight = target / max(1, sum(counts[language].values()))
+        denominator = target + alpha * len(vocabulary)
+        rows[language] = [
+            min(255, round(-math.log((counts[language][f] * weight + alpha) / denominator) * scale))
+            for f in vocabulary
+        ]
+    for index in range(len(vocabulary)):
+        costs.extend(rows[language][index] for language in languages)
+
+    return {
+        'version': 1,
+        'languages': languages,
+        'scale': scale,
+        'features': vocabulary,
+        'costs': base64.b64encode(bytes(costs)).decode('ascii'),
+    }
+
+
+def evaluate(model, snippets):
+    """Accuracy per language on held-out snippets"""
+    classifier = LanguageClassifier(model)
+    report = {}
+    for language, items in sorted(snippets.items()):
+        predicted = classifier.classify_batch(items)
+        correct = sum(1 for guess, _ in predicted if guess == language)
+        report[language] = (correct, len(items))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the code language classifier')
+    sub = parser.add_subparsers(dest='command')
+    train_cmd = sub.add_parser('train', help='Fit a model from source trees and sample files')
+    train_cmd.add_argument('--corpus', action='append', default=[], help='Source tree (repeatable)')
+    train_cmd.add_argument('--samples', help='Directory of <language>.txt snippet files')
+    train_cmd.add_argument('--per-language', type=int, default=3000, help='Snippets per language from --corpus')
+    train_cmd.add_argument('--sample-weight', type=int, default=20, help='Times each --samples snippet counts')
+    train_cmd.add_argument('--features', type=int, default=600, help='Features kept per language')
+    train_cmd.add_argument('--output', default=str(MODEL_PATH))
+    classify_cmd = sub.add_parser('classify', help='Classify a file')
+    classify_cmd.add_argument('file')
+    args = parser.parse_args()
+
+    if args.command == 'classify':
+        language, confidence = get_classifier().classify(Path(args.file).read_text(encoding='utf-8'))
+        print(f"{language} ({confidence:.0%})")
+        return
+    if args.command != 'train':
+        parser.print_help()
+        return
+
+    corpus = corpus_snippets(args.corpus, args.per_language)
+    samples = sample_snippets(args.samples) if args.samples else {}
+
+    def combine(select):
+        # Handwritten samples look like doc snippets, which the source trees
+        # mostly do not, so each one counts --sample-weight times
+        combined = {lang: select(items) for lang, items in corpus.items()}
+        for language, items in samples.items():
+            combined.setdefault(language, []).extend(select(items) * args.sample_weight)
+        return combined
+
+    # Hold out every fifth snippet to report accuracy (before weighting, so
+    # copies of a held-out sample never reach the training set)
+    train_set = combine(lambda items: [s for i, s in enumerate(items) if i % 5])
+    test_set = defaultdict(list)
+    for source in (corpus, samples):
+        for language, items in source.items():
+            test_set[language] += [s for i, s in enumerate(items) if not i % 5]
+    model = train(train_set, per_language_features=args.features)
+    for language, (correct, total) in evaluate(model, test_set).items():
+        print(f"  {language:<12} {correct}/{total} ({correct / max(1, total):.0%})")
+
+    model = train(combine(list), per_language_features=args.features)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(model, f, separators=(',', ':'))
+    print(f"✅ Saved {len(model['features'])} features x {len(model['languages'])} languages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
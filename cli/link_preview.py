@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Link-graph preview for --dry-run and estimate_pages
+Discovers a site's URLs without extracting content: each page is streamed
+through a tokenizer that only looks at <a href> inside the configured main
+content region, and the download stops as soon as that region closes.
+Pages are fetched concurrently under the usual per-host throttle.
+
+The URL set found is saved to output/<name>_data/discovered_urls.json so the
+next real scrape can seed its frontier with it instead of rediscovering it.
+The file is used once: the scrape that seeds from it deletes it, and a file
+older than DISCOVERED_MAX_AGE or saved for another base_url is ignored.
+"""
+
+import calendar
+import codecs
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin
+
+try:
+    from http_client import open_guarded, iter_body, release, ContentSkipped
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from http_client import open_guarded, iter_body, release, ContentSkipped
+
+
+# A saved preview older than this (seconds) no longer describes the site
+DISCOVERED_MAX_AGE = 7 * 24 * 3600
+
+# Previews are cheap, so overlap a few requests even when concurrency is 1;
+# the throttle still spaces them by rate_limit
+MIN_PREVIEW_CONCURRENCY = 4
+
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*)?((?:[#.][\w-]+|\[[^\]]+\])*)$')
+_SELECTOR_PART = re.compile(r'([#.])([\w-]+)|\[\s*([\w-]+)\s*(?:=\s*(["\']?)(.*?)\4)?\s*\]')
+
+
+def parse_simple_selector(selector):
+    """
+    Parse a selector the tokenizer can match on a single start tag
+
+    Supports tag, #id, .class and [attr] / [attr=value] and combinations of
+    them, plus comma-separated lists. Descendant combinators and pseudo
+    classes are not supported.
+
+    Returns:
+        list: (tag, {attr: value or None}, classes) per alternative, or
+            None if the selector is too complex
+    """
+    alternatives = []
+    for part in selector.split(','):
+        match = _SIMPLE_SELECTOR.match(part.strip())
+        if not match or not part.strip():
+            return None
+        tag, rest = match.group(1), match.group(2)
+        attrs, classes = {}, set()
+        for prefix, name, attr, _, value in _SELECTOR_PART.findall(rest):
+            if prefix == '#':
+                attrs['id'] = name
+            elif prefix == '.':
+                classes.add(name)
+            else:
+                attrs[attr] = value if value != '' else None
+        alternatives.append((tag.lower() if tag else None, attrs, classes))
+    return alternatives
+
+
+class LinkExtractor(HTMLParser):
+    """
+    Collects hrefs, preferring the first element matching the main selector
+
+    If the selector is too complex to match here, or never matches, all
+    links on the page are used instead.
+    """
+
+    def __init__(self, main_selector=None):
+        super().__init__(convert_charrefs=True)
+        self.region = parse_simple_selector(main_selector) if main_selector else None
+        self.region_hrefs = []
+        self.all_hrefs = []
+        self.found_region = False
+        self.done = False
+        self._region_tag = None
+        self._depth = 0
+
+    @property
+    def hrefs(self):
+        return self.region_hrefs if self.found_region else self.all_hrefs
+
+    def _matches(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get('class') or '').split())
+        for want_tag, want_attrs, want_classes in self.region:
+            if want_tag and want_tag != tag:
+                continue
+            if not want_classes <= classes:
+                continue
+            if all(name in attrs and (value is None or attrs[name] == value)
+                   for name, value in want_attrs.items()):
+                return True
+        return False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        inside = self._depth > 0
+        if inside and tag == self._region_tag:
+            self._depth += 1
+        elif not inside and not self.found_region and self.region and self._matches(tag, attrs):
+            self.found_region = True
+            self._region_tag = tag
+            self._depth = 1
+            inside = True
+
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.all_hrefs.append(href)
+                if inside:
+                    self.region_hrefs.append(href)
+
+    def handle_endtag(self, tag):
+        if self._depth > 0 and tag == self._region_tag:
+            self._depth -= 1
+            if self._depth == 0:
+                # Only the first match counts, as with select_one
+                self.done = True
+
+
+def _charset(response):
+    content_type = response.headers.get('Content-Type', '')
+    match = re.search(r'charset=["\']?([\w-]+)', content_type, re.I)
+    if match:
+        try:
+            codecs.lookup(match.group(1))
+            return match.group(1)
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def fetch_links(client, url, main_selector=None, limits=None, timeout=30):
+    """
+    Stream a page and return the links in its main content
+
+    Returns:
+        tuple: (response, list of raw href values); no links unless the
+            response is a 200
+
+    Raises:
+        ContentSkipped: Non-HTML or oversized page
+    """
+    limits = limits or {}
+    response = open_guarded(client, url, timeout=timeout, **limits)
+    if response.status_code != 200:
+        release(response)
+        return response, []
+
+    parser = LinkExtractor(main_selector)
+    decoder = codecs.getincrementaldecoder(_charset(response))(errors='replace')
+    try:
+        for chunk in iter_body(response, url, limits.get('max_bytes')):
+            parser.feed(decoder.decode(chunk))
+            if parser.done:
+                break
+        else:
+            parser.feed(decoder.decode(b'', final=True))
+            parser.close()
+    finally:
+        release(response)
+    return response, parser.hrefs
+
+
+def preview_crawl(frontier, client, throttle, canonicalizer, is_valid_url, main_selector=None,
+                  limits=None, max_pages=1000, concurrency=1, timeout=30, on_page=None):
+    """
+    Walk the link graph from the frontier's URLs without extracting pages
+
+    Args:
+        frontier: Frontier to pop from and add discovered URLs to
+        throttle: Per-host throttle (wait/record)
+        is_valid_url: Scope filter for discovered links
+        max_pages: Stop after visiting this many pages
+        on_page: Called with (url, pages visited so far) for progress output
+
+    Returns:
+        dict: 'visited' (pages counted), 'urls' (pages fetched successfully),
+            'skipped' (non-HTML/oversized), 'failed'
+    """
+    stats = {'visited': 0, 'urls': [], 'skipped': 0, 'failed': 0}
+
+    def visit(url):
+        throttle.wait(url)
+        started = time.monotonic()
+        response, hrefs = fetch_links(client, url, main_selector, limits, timeout)
+        throttle.record(url, response.status_code, time.monotonic() - started,
+                        response.headers.get('Retry-After'))
+        response.raise_for_status()
+        return response, hrefs
+
+    workers = max(MIN_PREVIEW_CONCURRENCY, concurrency)
+    futures = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while frontier and len(futures) < workers and stats['visited'] + len(futures) < max_pages:
+                url = frontier.pop()
+                futures[executor.submit(visit, url)] = url
+
+            if not futures:
+                break
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = futures.pop(future)
+                try:
+                    response, hrefs = future.result()
+                except ContentSkipped:
+                    stats['skipped'] += 1
+                    continue
+                except Exception:
+                    stats['failed'] += 1
+                    stats['visited'] += 1
+                    continue
+
+                # A redirect target is the same page: never count it twice
+                final_url = getattr(response, 'url', None)
+                if isinstance(final_url, str) and canonicalizer.record_redirect(url, final_url):
+                    if frontier.seen(final_url):
+                        continue
+                    frontier.mark_seen([final_url])
+                    url = canonicalizer.canonicalize(final_url)
+
+                stats['visited'] += 1
+                stats['urls'].append(url)
+                if on_page:
+                    on_page(url, stats['visited'])
+
+                depth = frontier.depth(url) + 1
+                for href in hrefs:
+                    link = canonicalizer.canonicalize(urljoin(url, href))
+                    if is_valid_url(link):
+                        frontier.add(link, depth)
+
+    return stats
+
+
+def discovered_path(name):
+    return f"output/{name}_data/discovered_urls.json"
+
+
+def save_discovered(name, visited, frontier, base_url=None):
+    """
+    Save the URLs a preview found (visited and still pending) for the next scrape
+
+    Returns:
+        str: Path written
+    """
+    pending, depths = frontier.dump()
+    path = discovered_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        'saved_at': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        'base_url': base_url,
+        'urls': list(visited) + pending,
+        'depths': [frontier.depth(url) for url in visited] + depths,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    return path
+
+
+def load_discovered(name, base_url=None, max_age=DISCOVERED_MAX_AGE):
+    """
+    URLs saved by the last preview, unless it is stale
+
+    A preview saved more than max_age seconds ago, or for a different
+    base_url than the one given, is ignored.
+
+    Returns:
+        list: (url, depth) pairs, empty if there is no usable saved preview
+    """
+    path = discovered_path(name)
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        saved_at = calendar.timegm(time.strptime(data['saved_at'], "%Y-%m-%dT%H:%M:%SZ"))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️  Ignoring unreadable {path}: {e}")
+        return []
+    if time.time() - saved_at > max_age:
+        print(f"⚠️  Ignoring {path}: saved {data['saved_at']}, too old to trust")
+        return []
+    if base_url and data.get('base_url') not in (None, base_url):
+        print(f"⚠️  Ignoring {path}: saved for {data['base_url']}")
+        return []
+    urls = data.get('urls', [])
+    depths = data.get('depths') or [0] * len(urls)
+    return list(zip(urls, depths))
+
+
+def discard_discovered(name):
+    """Delete the saved preview once a scrape has consumed it"""
+    try:
+        os.remove(discovered_path(name))
+    except OSError:
+        pass
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Page store for Skill Seeker
+Extracted pages live in output/<name>_data/pages/ as rolling compressed JSONL
+shards plus an offset index, instead of one pretty-printed JSON file per
+page:
+
+    pages-00001.jsonl.gz    shard: one gzip member per page, each holding
+                            one JSON line, so `zcat` streams a shard and a
+                            single page is read by seeking to its member
+    pages.idx               index log: one fixed-width entry per write
+
+Index entries are (URL key, write time, shard number, offset, length,
+CRC-32 of the JSON line); the URL key is the first 8 bytes of the URL's
+SHA-1. Loading the index gives O(1) lookup by URL, and the newest entry per
+URL wins, so re-saving a page (even under a new title) replaces it. A
+deletion is a tombstone entry (length 0). Rewritten and deleted pages leave
+dead bytes in old shards until compact() copies the live pages to new
+shards.
+
+Each index and shard series has one writer: worker processes of a
+multi-process crawl write pages.<host>-<pid>.idx and its shards next to the
+coordinator's. A crash can leave a half-written index entry or orphan shard
+bytes; both are ignored on load.
+
+Migrate an existing scrape from the old pages/*.json layout (also done
+automatically the first time the scraper opens it):
+    python3 cli/page_store.py migrate output/react_data/pages
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+
+
+ENTRY = struct.Struct('>8sdIQII')
+DEFAULT_WRITER = 'pages'
+# Start a new shard once the current one reaches this size (compressed)
+SHARD_BYTES = 64 * 1024 * 1024
+# Fast deflate: pages are written as they are scraped, and level 1 already
+# shrinks doc text about 4x
+COMPRESS_LEVEL = 1
+# zlib window bits for a gzip header and trailer
+GZIP_WBITS = 31
+# compact_if_needed() rewrites the store when more than this share of the
+# shard bytes is dead, and there is at least COMPACT_MIN_BYTES of it
+COMPACT_RATIO = 0.5
+COMPACT_MIN_BYTES = 1024 * 1024
+
+_SHARD_NAME = re.compile(r'^(.+)-(\d{5,})\.jsonl\.gz$')
+
+
+def url_key(url):
+    return hashlib.sha1(url.encode('utf-8')).digest()[:8]
+
+
+class PageStore:
+    """
+    Append-only store of extracted pages, keyed by URL
+
+    Args:
+        directory: Store directory (created on first write)
+        writer: Name of this process's index and shard series
+        shard_bytes: Shard size at which a new shard is started
+    """
+
+    def __init__(self, directory, writer=DEFAULT_WRITER, shard_bytes=SHARD_BYTES):
+        self.directory = str(directory)
+        self.writer = writer
+        self.shard_bytes = shard_bytes
+        self._lock = threading.Lock()
+        self._index = {}         # url key -> (written_at, shard path, offset, length, crc)
+        self._shard_number = 1   # this writer's current shard
+        self._shard_size = 0
+        self._index_end = None   # end of the last complete entry in this writer's index
+        self._shard_file = None
+        self._index_file = None
+        self.total_bytes = 0     # all shard bytes, live or dead
+        self.live_bytes = 0
+        self.load()
+
+    # --- Reading -------------------------------------------------------------
+
+    def _index_path(self, writer):
+        return os.path.join(self.directory, f"{writer}.idx")
+
+    def _shard_path(self, writer, number):
+        return os.path.join(self.directory, f"{writer}-{number:05d}.jsonl.gz")
+
+    def load(self):
+        """(Re)read every writer's index, e.g. after worker processes finished"""
+        self.close()
+        merged = {}
+        shard_sizes = {}
+        self._shard_number, self._shard_size, self._index_end = 1, 0, None
+
+        for path in glob.glob(os.path.join(self.directory, '*-*.jsonl.gz')):
+            match = _SHARD_NAME.match(os.path.basename(path))
+            if match:
+                shard_sizes[path] = os.path.getsize(path)
+                if match.group(1) == self.writer and int(match.group(2)) >= self._shard_number:
+                    self._shard_number, self._shard_size = int(match.group(2)), shard_sizes[path]
+
+        for index_path in sorted(glob.glob(os.path.join(self.directory, '*.idx'))):
+            writer = os.path.basename(index_path)[:-len('.idx')]
+            with open(index_path, 'rb') as f:
+                data = f.read()
+            # A partial entry at the end is a write cut short by a crash
+            complete = len(data) - len(data) % ENTRY.size
+            if writer == self.writer:
+                self._index_end = complete
+            paths = {}
+            for key, written_at, shard, offset, length, crc in ENTRY.iter_unpack(data[:complete]):
+                path = paths.get(shard)
+                if path is None:
+                    path = paths[shard] = self._shard_path(writer, shard)
+                if length and offset + length > shard_sizes.get(path, 0):
+                    continue
+                current = merged.get(key)
+                if current is None or written_at >= current[0]:
+                    merged[key] = (written_at, path, offset, length, crc)
+
+        self._index = {key: entry for key, entry in merged.items() if entry[3]}
+        self.total_bytes = sum(shard_sizes.values())
+        self.live_bytes = sum(entry[3] for entry in self._index.values())
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, url):
+        return url_key(url) in self._index
+
+    @staticmethod
+    def _read(f, offset, length):
+        """Page stored at offset, or None (with a warning) if it is unreadable"""
+        try:
+            f.seek(offset)
+            return json.loads(zlib.decompress(f.read(length), GZIP_WBITS).decode('utf-8'))
+        except (OSError, EOFError, zlib.error, ValueError) as e:
+            print(f"⚠ Error reading page at {f.name}:{offset}: {e}")
+            return None
+
+    def get(self, url):
+        """Stored page for url, or None"""
+        entry = self._index.get(url_key(url))
+        if entry is None:
+            return None
+        _, path, offset, length, _ = entry
+        with open(path, 'rb') as f:
+            page = self._read(f, offset, length)
+        if page is None:
+            return None
+        # Guard against the (astronomically unlikely) 64-bit key collision
+        return page if page.get('url') == url else None
+
+    def pages(self):
+        """
+        Stream every stored page, shard by shard in file order
+
+        Yields:
+            dict: Page
+        """
+        by_shard = {}
+        for _, path, offset, length, _ in self._index.values():
+            by_shard.setdefault(path, []).append((offset, length))
+        for path in sorted(by_shard):
+            with open(path, 'rb') as f:
+                for offset, length in sorted(by_shard[path]):
+                    page = self._read(f, offset, length)
+                    if page is not None:
+                        yield page
+
+    def get_many(self, urls):
+        """
+        Stream the stored pages for urls, in that order (missing URLs are skipped)
+
+        A shard stays open while consecutive URLs are in it, so URLs listed
+        in store order read as fast as pages().
+
+        Yields:
+            dict: Page
+        """
+        handle = None
+        try:
+            for url in urls:
+                entry = self._index.get(url_key(url))
+                if entry is None:
+                    continue
+                _, path, offset, length, _ = entry
+                if handle is None or handle.name != path:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(path, 'rb')
+                page = self._read(handle, offset, length)
+                if page is not None and page.get('url') == url:
+                    yield page
+        finally:
+            if handle is not None:
+                handle.close()
+
+    # --- Writing -------------------------------------------------------------
+
+    def _open_for_append(self):
+        if self._index_file is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        index_path = self._index_path(self.writer)
+        if self._index_end is not None and os.path.exists(index_path) \
+                and os.path.getsize(index_path) > self._index_end:
+            # Cut off a half-written entry, or later entries would be misaligned
+            with open(index_path, 'r+b') as f:
+                f.truncate(self._index_end)
+        self._index_file = open(index_path, 'ab')
+
+    def _append_entry(self, key, written_at, shard, offset, length, crc):
+        self._index_file.write(ENTRY.pack(key, written_at, shard, offset, length, crc))
+        self._index_file.flush()
+
+    def put(self, page):
+        """
+        Store a page, replacing any earlier version of its URL
+
+        Returns:
+            bool: False if the stored version was identical (nothing written)
+        """
+        line = (json.dumps(page, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        crc = zlib.crc32(line)
+        key = url_key(page['url'])
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+        member = compressor.compress(line) + compressor.flush()
+
+        with self._lock:
+            current = self._index.get(key)
+            if current is not None and current[4] == crc:
+                return False
+            self._open_for_append()
+
+            if self._shard_file is None or (self._shard_size and self._shard_size + len(member) > self.shard_bytes):
+                if self._shard_file is not None:
+                    self._shard_file.close()
+                    self._shard_number += 1
+                    self._shard_size = 0
+                self._shard_file = open(self._shard_path(self.writer, self._shard_number), 'ab')
+
+            offset = self._shard_size
+            # Page bytes first: an index entry never points at unwritten data
+            self._shard_file.write(member)
+            self._shard_file.flush()
+            self._shard_size += len(member)
+            written_at = time.time()
+            self._append_entry(key, written_at, self._shard_number, offset, len(member), crc)
+
+            if current is not None:
+                self.live_bytes -= current[3]
+            self._index[key] = (written_at, self._shard_path(self.writer, self._shard_number),
+                                offset, len(member), crc)
+            self.total_bytes += len(member)
+            self.live_bytes += len(member)
+        return True
+
+    def delete(self, url):
+        """
+        Remove a page (a tombstone entry; the bytes go at the next compaction)
+
+        Returns:
+            bool: True if the page was stored
+        """
+        key = url_key(url)
+        with self._lock:
+            current = self._index.pop(key, None)
+            if current is None:
+                return False
+            self._open_for_append()
+            self._append_entry(key, time.time(), 0, 0, 0, 0)
+            self.live_bytes -= current[3]
+        return True
+
+    def close(self):
+        for handle in (self._shard_file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._shard_file = self._index_file = None
+
+    def _store_files(self):
+        return (glob.glob(os.path.join(self.directory, '*.idx'))
+                + [path for path in glob.glob(os.path.join(self.directory, '*-*.jsonl.gz'))
+                   if _SHARD_NAME.match(os.path.basename(path))])
+
+    def clear(self):
+        """Delete every page of every writer"""
+        with self._lock:
+            self.close()
+            for path in self._store_files():
+                os.remove(path)
+            self.load()
+
+    # --- Maintenance ---------------------------------------------------------
+
+    def compact(self):
+        """
+        Copy the live pages into fresh shards of this writer and drop the rest
+
+        Only run it while no other process writes to the store.
+
+        Returns:
+            int: Bytes reclaimed
+        """
+        with self._lock:
+            before = self.total_bytes
+            self.close()
+            old_files = set(self._store_files())
+            number = max([self._shard_number] + [
+                int(match.group(2)) for match in map(_SHARD_NAME.match, map(os.path.basename, old_files))
+                if match and match.group(1) == self.writer]) + 1
+
+            entries = []
+            shard_file, shard_size = None, 0
+            live = sorted(self._index.items(), key=lambda item: (item[1][1], item[1][2]))
+            source_path, source = None, None
+            try:
+                for key, (written_at, path, offset, length, crc) in live:
+                    if path != source_path:
+                        if source is not None:
+                            source.close()
+                        source_path, source = path, open(path, 'rb')
+                    source.seek(offset)
+                    member = source.read(length)
+                    if shard_file is None or (shard_size and shard_size + length > self.shard_bytes):
+                        if shard_file is not None:
+                            shard_file.close()
+                            number += 1
+                        shard_file, shard_size = open(self._shard_path(self.writer, number), 'wb'), 0
+                    shard_file.write(member)
+                    # Original write times, so merging with any index left
+                    # behind by a crash still picks the same versions
+                    entries.append(ENTRY.pack(key, written_at, number, shard_size, length, crc))
+                    shard_size += length
+            finally:
+                for handle in (source, shard_file):
+                    if handle is not None:
+                        handle.close()
+
+            index_path = self._index_path(self.writer)
+            with open(index_path + '.tmp', 'wb') as f:
+                f.write(b''.join(entries))
+            os.replace(index_path + '.tmp', index_path)
+            for path in old_files - {index_path}:
+                os.remove(path)
+            self.load()
+            return before - self.total_bytes
+
+    def compact_if_needed(self):
+        """Compact when dead bytes dominate; returns bytes reclaimed (0 if skipped)"""
+        dead = self.total_bytes - self.live_bytes
+        if dead < COMPACT_MIN_BYTES or dead <= COMPACT_RATIO * self.total_bytes:
+            return 0
+        return self.compact()
+
+    def migrate_legacy(self):
+        """
+        Move pages from the old one-JSON-file-per-page layout into the store
+
+        Files are imported oldest first, so where a renamed title left two
+        files for one URL the newer one wins. Each file is deleted once
+        stored; unreadable files are left in place.
+
+        Returns:
+            int: Files migrated
+        """
+        legacy = sorted(glob.glob(os.path.join(self.directory, '*.json')), key=os.path.getmtime)
+        migrated = 0
+        for path in legacy:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    page = json.load(f)
+                self.put(page)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"⚠️  Not migrated {path}: {e}")
+                continue
+            os.remove(path)
+            migrated += 1
+        return migrated
+
+
+class StoredPages:
+    """
+    List of stored pages that holds only their URLs
+
+    Pages are read from the store each time the list is iterated, so a crawl
+    or build can pass "all pages" or "the pages of a category" around without
+    keeping them in memory.
+
+    Args:
+        store: PageStore the pages are in
+        urls: Page URLs, in list order
+    """
+
+    def __init__(self, store, urls=()):
+        self.store = store
+        self.urls = list(urls)
+
+    def append(self, page):
+        """Add a page (it must already be in the store)"""
+        self.urls.append(page['url'])
+
+    def __len__(self):
+        return len(self.urls)
+
+    def __iter__(self):
+        return self.store.get_many(self.urls)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StoredPages(self.store, self.urls[index])
+        return self.store.get(self.urls[index])
+
+    def __eq__(self, other):
+        if not isinstance(other, (StoredPages, list, tuple)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"StoredPages({len(self.urls)} pages in {self.store.directory})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain a scrape\'s page store')
+    parser.add_argument('command', choices=['migrate', 'compact', 'stats'])
+    parser.add_argument('directory', help='Store directory, e.g. output/react_data/pages')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Not a directory: {args.directory}")
+        sys.exit(1)
+
+    store = PageStore(args.directory)
+    if args.command == 'migrate':
+        count = store.migrate_legacy()
+        print(f"✅ Migrated {count} page files into {args.directory}")
+    elif args.command == 'compact':
+        reclaimed = store.compact()
+        print(f"✅ Compacted {len(store)} pages, reclaimed {reclaimed / 1024:.0f} KB")
+    else:
+        print(f"Pages: {len(store)}")
+        print(f"Shard bytes: {store.total_bytes} ({store.live_bytes} live)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
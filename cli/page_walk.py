@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Single-pass walk of a page's main content for extract_content
+One iterative traversal collects headings, code blocks, paragraphs, links
+and the elements pattern extraction needs, instead of a find_all per kind
+and a get_text() per element.
+
+Element text is never re-serialized per ancestor: the walk records the text
+strings once, and each element keeps the range of strings it spans. Pattern
+keywords are located once in the whole text, so checking a <div> is a
+binary search rather than a get_text() of its subtree. Deeply nested markup
+(Sphinx wraps content in many <div> levels) therefore costs linear time, and
+no recursion limit applies.
+"""
+
+from bisect import bisect_left, bisect_right
+
+import soupsieve
+from bs4 import NavigableString, Tag
+from bs4.element import CData
+
+
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+# Elements whose text may introduce a pattern, and what counts as one
+PATTERN_TAGS = frozenset(['p', 'div'])
+PATTERN_KEYWORDS = ('example:', 'pattern:', 'usage:', 'typical use')
+# Tags the code following a pattern description is taken from
+PATTERN_CODE_TAGS = frozenset(['pre', 'code'])
+
+
+def _text_types(main):
+    """String classes get_text() counts for elements in this tree"""
+    types = getattr(main, 'interesting_string_types', None) or (NavigableString, CData)
+    return (types,) if isinstance(types, type) else tuple(types)
+
+
+class PageWalk:
+    """
+    Everything extract_content needs from a main content element
+
+    Attributes:
+        headings: (tag, text) per h1-h6, in document order
+        code_blocks: (tag, text) per element matching the code selector
+        paragraphs: text of each <p>
+        hrefs: href of each <a href>, in document order
+    """
+
+    def __init__(self, main, code_selector='pre code'):
+        self.main = main
+        self.headings = []
+        self.code_blocks = []
+        self.paragraphs = []
+        self.hrefs = []
+
+        self._strings = []
+        self._lowered = []
+        self._offsets = [0]      # character offset where each string starts
+        self._candidates = []    # (tag, first string, end string, enter order) per p/div
+        self._code_order = []    # enter order of each pre/code, for find_next
+        self._code_tags = []
+        self._after_main = False
+
+        # The code selector is arbitrary CSS, so soupsieve resolves it. Matching
+        # element by element would re-find the document root for every tag,
+        # which is quadratic in depth; one select() over main is linear.
+        # A precompiled selector (CompiledConfig.code_blocks) is used as is.
+        if isinstance(code_selector, str):
+            code_selector = soupsieve.compile(code_selector)
+        self._walk({id(tag) for tag in code_selector.select(main)})
+
+    def _walk(self, code_ids):
+        types = _text_types(self.main)
+        strings, lowered, offsets = self._strings, self._lowered, self._offsets
+        headings, code_blocks, paragraphs = [], [], []
+        tag_entries = {}         # id(tag) -> entries waiting for its end string
+        order = 0
+
+        # Explicit stack of (tag, remaining children, first string index); entries
+        # are [tag, first string, end string, ...] with the end filled on close
+        stack = [(self.main, iter(self.main.contents), 0)]
+        while stack:
+            tag, children, start = stack[-1]
+            child = next(children, None)
+
+            if child is None:
+                stack.pop()
+                if len(stack) == 0:
+                    break
+                # Closing tag: its text is strings[start:end]
+                end = len(strings)
+                for entry in tag_entries.pop(id(tag), ()):
+                    entry[2] = end
+                continue
+
+            if isinstance(child, Tag):
+                order += 1
+                name = child.name
+                start = len(strings)
+                entries = []
+                if name in HEADING_TAGS:
+                    entries.append(self._entry(headings, child, start))
+                if id(child) in code_ids:
+                    entries.append(self._entry(code_blocks, child, start))
+                if name in PATTERN_TAGS:
+                    if name == 'p':
+                        entries.append(self._entry(paragraphs, child, start))
+                    candidate = [child, start, None, order]
+                    self._candidates.append(candidate)
+                    entries.append(candidate)
+                elif name in PATTERN_CODE_TAGS:
+                    self._code_order.append(order)
+                    self._code_tags.append(child)
+                elif name == 'a':
+                    href = child.get('href')
+                    if href is not None:
+                        self.hrefs.append(href)
+                if entries:
+                    tag_entries[id(child)] = entries
+                stack.append((child, iter(child.contents), start))
+
+            elif type(child) in types:
+                strings.append(child)
+                lowered.append(child.lower())
+                offsets.append(offsets[-1] + len(lowered[-1]))
+
+        self.headings = [(tag, self._text(start, end)) for tag, start, end in headings]
+        self.code_blocks = [(tag, self._text(start, end)) for tag, start, end in code_blocks]
+        self.paragraphs = [self._text(start, end) for _, start, end in paragraphs]
+
+    @staticmethod
+    def _entry(entries, tag, start):
+        entry = [tag, start, None]
+        entries.append(entry)
+        return entry
+
+    def _text(self, start, end):
+        """get_text() of an element spanning strings[start:end]"""
+        return ''.join(self._strings[start:end])
+
+    def pattern_candidates(self, limit=None):
+        """
+        p/div elements whose text mentions a pattern keyword
+
+        Args:
+            limit: Stop after this many candidates that have code after them
+
+        Returns:
+            list: (description text, next pre/code element) in document order
+        """
+        text = ''.join(self._lowered)
+        occurrences = []
+        for keyword in PATTERN_KEYWORDS:
+            found, position = [], text.find(keyword)
+            while position != -1:
+                found.append(position)
+                position = text.find(keyword, position + 1)
+            if found:
+                occurrences.append((keyword, found))
+
+        results = []
+        for tag, start, end, order in self._candidates:
+            if not self._mentions(occurrences, self._offsets[start], self._offsets[end]):
+                continue
+            code = self._next_code(order)
+            if code is not None:
+                results.append((self._text(start, end), code))
+                if limit and len(results) >= limit:
+                    break
+        return results
+
+    @staticmethod
+    def _mentions(occurrences, begin, end):
+        """True if a keyword lies entirely within text[begin:end]"""
+        for keyword, positions in occurrences:
+            index = bisect_left(positions, begin)
+            if index < len(positions) and positions[index] <= end - len(keyword):
+                return True
+        return False
+
+    def _next_code(self, order):
+        """First pre/code after the element entered at `order`, as find_next would return"""
+        index = bisect_right(self._code_order, order)
+        if index < len(self._code_tags):
+            return self._code_tags[index]
+        if self._after_main is False:
+            # Past the main element: continue after its last descendant
+            last = self.main
+            while getattr(last, 'contents', None):
+                last = last.contents[-1]
+            self._after_main = last.find_next(list(PATTERN_CODE_TAGS))
+        return self._after_main
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends for Skill Seeker
+extract_content works on a BeautifulSoup tree; the backend decides how that
+tree is built.
+
+    html.parser  Python's built-in parser (default, always available)
+    lxml         C parser behind BeautifulSoup (pip install lxml)
+    selectolax   lexbor parses the whole page and finds the title and main
+                 content; only those elements (with their ancestor tags, so
+                 selectors like "div.content > article" still match) are
+                 handed to BeautifulSoup (pip install selectolax)
+
+Partial parsing (html.parser and lxml): a regex pre-scan finds the title
+and main content elements in the raw markup, and only those slices are
+parsed. Navigation, footers and scripts never become tree nodes. The scan
+needs simple selectors (tag, #id, .class, [attr=value]); for anything else,
+or markup it cannot balance, the whole page is parsed as usual.
+
+Config:
+    "parser": "lxml",
+    "partial_parse": true
+"""
+
+import re
+import sys
+from html import escape, unescape
+from pathlib import Path
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+try:
+    from link_preview import parse_simple_selector
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from link_preview import parse_simple_selector
+
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_BACKEND = 'html.parser'
+
+_INSTALL_HINTS = {
+    'lxml': "pip install lxml",
+    'selectolax': "pip install selectolax",
+}
+
+
+def backend_available(name):
+    """True if the backend's library is installed"""
+    try:
+        if name == 'lxml':
+            import lxml  # noqa: F401
+        elif name == 'selectolax':
+            from selectolax.lexbor import LexborHTMLParser  # noqa: F401
+        elif name != 'html.parser':
+            return False
+    except ImportError:
+        return False
+    return True
+
+
+def available_backends():
+    return [name for name in PARSER_BACKENDS if backend_available(name)]
+
+
+def resolve_backend(name):
+    """
+    Backend to use for a configured name, falling back to html.parser
+
+    Raises:
+        ValueError: Unknown backend name
+    """
+    name = name or DEFAULT_BACKEND
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"unknown parser '{name}' (choose from {', '.join(PARSER_BACKENDS)})")
+    if not backend_available(name):
+        print(f"⚠️  Parser '{name}' is not installed, using html.parser")
+        print(f"   Install with: {_INSTALL_HINTS[name]}")
+        return DEFAULT_BACKEND
+    return name
+
+
+# Tokens the pre-scan cares about; script/style bodies and comments are
+# skipped whole so markup inside them is never mistaken for tags
+_SCAN_TOKEN = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>.*?</\1\s*>'
+    r'|<([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>'
+    r'|</([a-zA-Z][^\s/>]*)\s*>',
+    re.S | re.I)
+_SCAN_ATTR = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+
+def _scan_matches(alternatives, name, attr_text):
+    """True if a start tag matches one alternative of a simple selector"""
+    attrs = None
+    for want_tag, want_attrs, want_classes in alternatives:
+        if want_tag and want_tag != name:
+            continue
+        if attrs is None:
+            attrs = {key.lower(): unescape(next((v for v in values if v), ''))
+                     for key, *values in _SCAN_ATTR.findall(attr_text)}
+        if not want_classes <= set(attrs.get('class', '').split()):
+            continue
+        if all(key in attrs and (value is None or attrs[key] == value)
+               for key, value in want_attrs.items()):
+            return True
+    return False
+
+
+def find_element(markup, selector, start=0):
+    """
+    Locate the first element matching a simple selector in raw markup
+
+    Args:
+        markup: Page as str
+        selector: CSS selector (see link_preview.parse_simple_selector)
+
+    Returns:
+        tuple: (start, end) offsets of the element's outer HTML, or None if
+            the selector is too complex, nothing matches, or the element
+            is never closed
+    """
+    alternatives = parse_simple_selector(selector)
+    if not alternatives:
+        return None
+
+    region_tag, region_start, depth = None, None, 0
+    for token in _SCAN_TOKEN.finditer(markup, start):
+        name, attr_text, end_name = token.group(2), token.group(3), token.group(4)
+        if name:
+            name = name.lower()
+            self_closing = attr_text.rstrip().endswith('/')
+            if region_tag is None:
+                if _scan_matches(alternatives, name, attr_text):
+                    if self_closing:
+                        return token.start(), token.end()
+                    region_tag, region_start, depth = name, token.start(), 1
+            elif name == region_tag and not self_closing:
+                depth += 1
+        elif end_name and region_tag and end_name.lower() == region_tag:
+            depth -= 1
+            if depth == 0:
+                return region_start, token.end()
+    return None
+
+
+def partial_markup(markup, selectors):
+    """
+    The title and main content elements of a page, in document order
+
+    Returns:
+        str: Markup to parse instead of the page, or None to parse it all
+    """
+    main = find_element(markup, selectors.get('main_content', 'div[role="main"]'))
+    if main is None:
+        return None
+    title = find_element(markup, selectors.get('title', 'title'))
+    if title is None or (main[0] <= title[0] and title[1] <= main[1]):
+        # No title, or the title is inside main anyway
+        return markup[main[0]:main[1]]
+    if title[1] <= main[0]:
+        return markup[title[0]:title[1]] + markup[main[0]:main[1]]
+    if title[0] >= main[1]:
+        return markup[main[0]:main[1]] + markup[title[0]:title[1]]
+    return None
+
+
+def _with_ancestors(node):
+    """Outer HTML of node wrapped in bare copies of its ancestors (no siblings)"""
+    html = node.html
+    parent = node.parent
+    while parent is not None and not parent.tag.startswith(('-', '#')):
+        attrs = ''.join(f' {key}' if value is None else f' {key}="{escape(value)}"'
+                        for key, value in parent.attributes.items())
+        html = f"<{parent.tag}{attrs}>{html}</{parent.tag}>"
+        parent = parent.parent
+    return html
+
+
+def _lexbor_soup(markup, selectors):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(markup)
+    parts = []
+    for selector in (selectors.get('title', 'title'),
+                     selectors.get('main_content', 'div[role="main"]')):
+        node = tree.css_first(selector)
+        if node is not None:
+            parts.append(_with_ancestors(node))
+    return BeautifulSoup(''.join(parts), 'html.parser')
+
+
+def make_soup(markup, backend=DEFAULT_BACKEND, selectors=None, partial=False):
+    """
+    Parse a page for extract_content
+
+    Args:
+        markup: Response body (bytes or str)
+        backend: One of PARSER_BACKENDS (already resolved)
+        selectors: Config selectors; the selectolax path keeps only the
+            title and main_content elements
+        partial: Parse only the title and main_content elements found by
+            the pre-scan (html.parser and lxml)
+
+    Returns:
+        BeautifulSoup
+    """
+    if (backend == 'selectolax' or partial) and isinstance(markup, bytes):
+        # Same encoding detection BeautifulSoup applies to bytes
+        markup = UnicodeDammit(markup, is_html=True).unicode_markup
+    if backend == 'selectolax':
+        return _lexbor_soup(markup, selectors or {})
+    if partial:
+        markup = partial_markup(markup, selectors or {}) or markup
+    return BeautifulSoup(markup, backend)
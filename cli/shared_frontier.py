@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Shared crawl frontier for multi-process and multi-host scraping
+Worker processes claim URLs from one store instead of each keeping its own
+queue. Claims are leases: a worker that crashes or is killed simply stops
+renewing, and its URLs return to the queue when the lease expires.
+
+URLs are sharded by a hash of their canonical key. A worker claims from its
+own shards first and takes from the others only when its shards are empty,
+so workers on different hosts mostly touch disjoint rows.
+
+Stores:
+    sqlite:///output/react_data/frontier.sqlite   # one machine, N processes
+    redis://host:6379/0                           # several hosts (pip install redis)
+
+Any path without a scheme is treated as a SQLite file.
+
+The store also holds the crawl's duplicate-content index (see dedup.py), so
+workers on every host detect pages that repeat one another worker scraped.
+"""
+
+import hashlib
+import os
+import sys
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+try:
+    from dedup import band_keys, hamming
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from dedup import band_keys, hamming
+
+
+# Fixed shard space; workers map onto it with shard % num_workers
+NUM_SHARDS = 64
+
+DEFAULT_LEASE_SECONDS = 300
+
+
+def shard_of(key):
+    """Stable shard number for a URL key"""
+    return int(hashlib.sha1(key.encode('utf-8')).hexdigest()[:8], 16) % NUM_SHARDS
+
+
+def _own_shards(worker_index, num_workers):
+    return [s for s in range(NUM_SHARDS) if s % num_workers == worker_index]
+
+
+def _bands(signature, max_distance):
+    """Band names of a signature's SimHash ([] for exact-only signatures)"""
+    value = signature[1]
+    return [] if value is None else [f"{i}:{v}" for i, v in band_keys(value, max_distance)]
+
+
+class SqliteFrontier:
+    """Shared frontier in a SQLite file (WAL mode, safe across processes)"""
+
+    def __init__(self, path, key=None, lease_seconds=DEFAULT_LEASE_SECONDS):
+        self.path = str(path)
+        self.key = key or (lambda url: url)
+        self.lease_seconds = lease_seconds
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            " key TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " depth INTEGER NOT NULL DEFAULT 0,"
+            " shard INTEGER NOT NULL,"
+            " state TEXT NOT NULL DEFAULT 'pending',"   # pending | leased | done | failed
+            " owner TEXT,"
+            " lease_expires REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS frontier_claim ON frontier (state, shard)"
+        )
+        # Duplicate-content index: sha1 -> first URL, SimHash bands, and aliases found
+        self._conn.execute("CREATE TABLE IF NOT EXISTS dedup (digest TEXT PRIMARY KEY, url TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dedup_bands (band TEXT NOT NULL, simhash TEXT NOT NULL, url TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS dedup_band ON dedup_bands (band)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS duplicates (url TEXT PRIMARY KEY, original TEXT NOT NULL)")
+        # Fetch threads check duplicates while the worker thread claims URLs,
+        # so the checks get their own connection
+        self._dedup_conn = None
+        self._dedup_lock = threading.Lock()
+
+    def add(self, url, depth=0):
+        """Queue url unless its key is already known; returns True if queued"""
+        return self.add_many([(url, depth)]) == 1
+
+    def add_many(self, items, done=False):
+        """
+        Queue (url, depth) pairs in one transaction
+
+        Args:
+            done: Record the URLs as already scraped (e.g. redirect targets)
+                instead of queuing them
+
+        Returns:
+            int: Number of URLs that were new
+        """
+        state = 'done' if done else 'pending'
+        rows = []
+        for url, depth in items:
+            k = self.key(url)
+            rows.append((k, url, depth, shard_of(k), state))
+        if not rows:
+            return 0
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO frontier (key, url, depth, shard, state) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            added = self._conn.total_changes - before
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self, worker_id, worker_index=0, num_workers=1, limit=1, budget=None):
+        """
+        Lease up to limit pending URLs for worker_id
+
+        Expired leases are returned to the queue first. Own shards are
+        preferred; other shards are used only when they are empty.
+
+        Args:
+            budget: Stop handing out URLs once this many are leased or done
+                (max_pages across all workers)
+
+        Returns:
+            list: (url, depth) tuples, empty when nothing is claimable
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "UPDATE frontier SET state = 'pending', owner = NULL, lease_expires = NULL"
+                " WHERE state = 'leased' AND lease_expires < ?", (now,)
+            )
+            if budget is not None:
+                used = self._conn.execute(
+                    "SELECT COUNT(*) FROM frontier WHERE state IN ('leased', 'done', 'failed')"
+                ).fetchone()[0]
+                limit = min(limit, max(0, budget - used))
+
+            rows = []
+            if limit > 0:
+                shards = _own_shards(worker_index, num_workers)
+                marks = ','.join('?' * len(shards))
+                rows = self._conn.execute(
+                    f"SELECT key, url, depth FROM frontier WHERE state = 'pending'"
+                    f" AND shard IN ({marks}) ORDER BY rowid LIMIT ?",
+                    shards + [limit]
+                ).fetchall()
+                if len(rows) < limit:
+                    # Steal from other shards rather than sit idle
+                    rows += self._conn.execute(
+                        f"SELECT key, url, depth FROM frontier WHERE state = 'pending'"
+                        f" AND shard NOT IN ({marks}) ORDER BY rowid LIMIT ?",
+                        shards + [limit - len(rows)]
+                    ).fetchall()
+
+            self._conn.executemany(
+                "UPDATE frontier SET state = 'leased', owner = ?, lease_expires = ? WHERE key = ?",
+                [(worker_id, now + self.lease_seconds, k) for k, _, _ in rows]
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return [(url, depth) for _, url, depth in rows]
+
+    def renew(self, worker_id):
+        """Extend every lease held by worker_id"""
+        self._conn.execute(
+            "UPDATE frontier SET lease_expires = ? WHERE state = 'leased' AND owner = ?",
+            (time.time() + self.lease_seconds, worker_id)
+        )
+
+    def complete(self, url, worker_id, ok=True):
+        """Mark a leased URL done (or failed); ignored if the lease was lost"""
+        self._conn.execute(
+            "UPDATE frontier SET state = ?, lease_expires = NULL"
+            " WHERE key = ? AND state = 'leased' AND owner = ?",
+            ('done' if ok else 'failed', self.key(url), worker_id)
+        )
+
+    def check_duplicate(self, url, signature, max_distance=3):
+        """
+        Register url's content signature, or report the page it duplicates
+
+        Same contract as DuplicateDetector.check, against the index every
+        worker shares; safe to call from fetch threads.
+
+        Returns:
+            str: URL of the earlier page with the same content, or None
+        """
+        if signature is None:
+            return None
+        digest, value = signature
+        bands = _bands(signature, max_distance)
+
+        with self._dedup_lock:
+            if self._dedup_conn is None:
+                self._dedup_conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                                   check_same_thread=False)
+            conn = self._dedup_conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                original = None
+                row = conn.execute("SELECT url FROM dedup WHERE digest = ?", (digest,)).fetchone()
+                if row and row[0] != url:
+                    original = row[0]
+                for band in bands:
+                    if original is not None:
+                        break
+                    for simhash, other_url in conn.execute(
+                            "SELECT simhash, url FROM dedup_bands WHERE band = ?", (band,)):
+                        if other_url != url and hamming(value, int(simhash, 16)) <= max_distance:
+                            original = other_url
+                            break
+
+                if original is None:
+                    conn.execute("INSERT OR IGNORE INTO dedup (digest, url) VALUES (?, ?)", (digest, url))
+                    conn.executemany("INSERT INTO dedup_bands (band, simhash, url) VALUES (?, ?, ?)",
+                                     [(band, format(value, 'x'), url) for band in bands])
+                else:
+                    conn.execute("INSERT OR REPLACE INTO duplicates (url, original) VALUES (?, ?)",
+                                 (url, original))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return original
+
+    def duplicates(self):
+        """Every duplicate found so far, as {url: earlier URL}"""
+        return dict(self._conn.execute("SELECT url, original FROM duplicates").fetchall())
+
+    def reset(self):
+        """Forget every URL and fingerprint (start a fresh crawl)"""
+        for table in ('frontier', 'dedup', 'dedup_bands', 'duplicates'):
+            self._conn.execute(f"DELETE FROM {table}")
+
+    def counts(self):
+        """URLs per state, e.g. {'pending': 10, 'leased': 4, 'done': 120}"""
+        rows = self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state")
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def close(self):
+        self._conn.close()
+        if self._dedup_conn is not None:
+            self._dedup_conn.close()
+
+
+# Claim up to ARGV[3] keys from one shard queue in one atomic step, so a
+# worker dying mid-claim never leaves a key in neither the queue nor the
+# leases. KEYS: queue, leases, owners, seen; ARGV: expiry, worker, limit.
+CLAIM_SCRIPT = """
+local claimed = {}
+for i = 1, tonumber(ARGV[3]) do
+    local k = redis.call('LPOP', KEYS[1])
+    if not k then break end
+    redis.call('ZADD', KEYS[2], ARGV[1], k)
+    redis.call('HSET', KEYS[3], k, ARGV[2])
+    local entry = redis.call('HGET', KEYS[4], k)
+    if entry then claimed[#claimed + 1] = entry end
+end
+return claimed
+"""
+
+# Return one expired lease to its queue atomically (only the caller whose
+# ZREM succeeds requeues it). KEYS: leases, owners, queue; ARGV: key.
+REQUEUE_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    redis.call('HDEL', KEYS[2], ARGV[1])
+    redis.call('LPUSH', KEYS[3], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+class RedisFrontier:
+    """
+    Shared frontier in Redis (or any server speaking its protocol)
+
+    Keys under prefix: seen (hash key -> url|depth), q:<shard> (lists of
+    keys), leases (sorted set key -> expiry), owners (hash key -> worker),
+    done/failed (counters), and for dedup: dedup (hash sha1 -> url),
+    band:<band> (lists of simhash|url), duplicates (hash url -> original).
+    Claims and requeues run as Lua scripts, so each is atomic like the SQLite
+    backend's BEGIN IMMEDIATE transactions.
+    """
+
+    def __init__(self, url, key=None, lease_seconds=DEFAULT_LEASE_SECONDS, prefix='skillseeker'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Redis frontier requires the redis package: pip install redis")
+        self.redis = redis.Redis.from_url(url)
+        self.key = key or (lambda url: url)
+        self.lease_seconds = lease_seconds
+        self.prefix = prefix
+        self._claim = self.redis.register_script(CLAIM_SCRIPT)
+        self._requeue = self.redis.register_script(REQUEUE_SCRIPT)
+
+    def _k(self, name):
+        return f"{self.prefix}:{name}"
+
+    def add(self, url, depth=0):
+        return self.add_many([(url, depth)]) == 1
+
+    def add_many(self, items, done=False):
+        added = 0
+        pipe = self.redis.pipeline()
+        keys = []
+        for url, depth in items:
+            k = self.key(url)
+            keys.append(k)
+            pipe.hsetnx(self._k('seen'), k, f"{url}|{depth}")
+        results = pipe.execute()
+        pipe = self.redis.pipeline()
+        for k, new in zip(keys, results):
+            if new:
+                if not done:
+                    pipe.rpush(self._k(f"q:{shard_of(k)}"), k)
+                added += 1
+        pipe.execute()
+        return added
+
+    def _requeue_expired(self):
+        expired = self.redis.zrangebyscore(self._k('leases'), '-inf', time.time())
+        for k in expired:
+            k = k.decode('utf-8')
+            self._requeue(keys=[self._k('leases'), self._k('owners'), self._k(f"q:{shard_of(k)}")], args=[k])
+
+    def claim(self, worker_id, worker_index=0, num_workers=1, limit=1, budget=None):
+        self._requeue_expired()
+        if budget is not None:
+            used = (self.redis.zcard(self._k('leases'))
+                    + int(self.redis.get(self._k('done')) or 0)
+                    + int(self.redis.get(self._k('failed')) or 0))
+            limit = min(limit, max(0, budget - used))
+
+        own = _own_shards(worker_index, num_workers)
+        others = [s for s in range(NUM_SHARDS) if s not in own]
+        claimed = []
+        for shard in own + others:
+            if len(claimed) >= limit:
+                break
+            entries = self._claim(
+                keys=[self._k(f"q:{shard}"), self._k('leases'), self._k('owners'), self._k('seen')],
+                args=[time.time() + self.lease_seconds, worker_id, limit - len(claimed)])
+            for entry in entries:
+                url, depth = entry.decode('utf-8').rsplit('|', 1)
+                claimed.append((url, int(depth)))
+        return claimed
+
+    def renew(self, worker_id):
+        owners = self.redis.hgetall(self._k('owners'))
+        expires = time.time() + self.lease_seconds
+        mine = {k: expires for k, owner in owners.items() if owner.decode('utf-8') == worker_id}
+        if mine:
+            self.redis.zadd(self._k('leases'), mine, xx=True)
+
+    def complete(self, url, worker_id, ok=True):
+        k = self.key(url)
+        owner = self.redis.hget(self._k('owners'), k)
+        if owner is None or owner.decode('utf-8') != worker_id:
+            return
+        if self.redis.zrem(self._k('leases'), k):
+            self.redis.hdel(self._k('owners'), k)
+            self.redis.incr(self._k('done' if ok else 'failed'))
+
+    def check_duplicate(self, url, signature, max_distance=3):
+        if signature is None:
+            return None
+        digest, value = signature
+        bands = _bands(signature, max_distance)
+
+        original = self.redis.hget(self._k('dedup'), digest)
+        original = original.decode('utf-8') if original is not None else None
+        if original == url:
+            original = None
+        for band in bands:
+            if original is not None:
+                break
+            for entry in self.redis.lrange(self._k(f"band:{band}"), 0, -1):
+                simhash, other_url = entry.decode('utf-8').split('|', 1)
+                if other_url != url and hamming(value, int(simhash, 16)) <= max_distance:
+                    original = other_url
+                    break
+
+        # hsetnx settles exact duplicates fetched at the same moment; two
+        # near-duplicates checked at the same moment may both be kept
+        if original is None and not self.redis.hsetnx(self._k('dedup'), digest, url):
+            original = self.redis.hget(self._k('dedup'), digest).decode('utf-8')
+            if original == url:
+                original = None
+        if original is not None:
+            self.redis.hset(self._k('duplicates'), url, original)
+            return original
+
+        if bands:
+            pipe = self.redis.pipeline()
+            for band in bands:
+                pipe.rpush(self._k(f"band:{band}"), f"{value:x}|{url}")
+            pipe.execute()
+        return None
+
+    def duplicates(self):
+        return {url.decode('utf-8'): original.decode('utf-8')
+                for url, original in self.redis.hgetall(self._k('duplicates')).items()}
+
+    def reset(self):
+        for name in self.redis.scan_iter(match=self._k('*')):
+            self.redis.delete(name)
+
+    def counts(self):
+        pending = sum(self.redis.llen(self._k(f"q:{s}")) for s in range(NUM_SHARDS))
+        return {
+            'pending': pending,
+            'leased': self.redis.zcard(self._k('leases')),
+            'done': int(self.redis.get(self._k('done')) or 0),
+            'failed': int(self.redis.get(self._k('failed')) or 0),
+        }
+
+    def close(self):
+        self.redis.close()
+
+
+def open_frontier(spec, key=None, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Open a shared frontier from a store spec
+
+    Args:
+        spec: 'sqlite:///path', 'redis://...' / 'rediss://...', or a file path
+        key: Canonical key function (see canonical.py)
+    """
+    if spec.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisFrontier(spec, key=key, lease_seconds=lease_seconds)
+    if spec.startswith('sqlite:///'):
+        spec = spec[len('sqlite:///'):]
+    return SqliteFrontier(spec, key=key, lease_seconds=lease_seconds)
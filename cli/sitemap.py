@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Sitemap source for Skill Seeker
+Seeds the crawl frontier from robots.txt sitemap hints, sitemap.xml and
+nested sitemap indexes instead of discovering every URL by fetching and
+parsing pages.
+
+Config:
+    "sitemap": true                       # auto-discover via robots.txt / sitemap.xml
+    "sitemap": ["https://.../sitemap.xml"]  # explicit sitemap URLs
+"""
+
+import gzip
+import io
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+try:
+    from http_client import release
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from http_client import release
+
+
+# Guard against index cycles and pathological nesting
+MAX_SITEMAP_DEPTH = 3
+
+
+def _local_name(tag):
+    """Strip the XML namespace from an element tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def fetch_robots(base_url, client, timeout=10):
+    """
+    Read sitemap hints and crawl delay from robots.txt
+
+    Returns:
+        dict: {'sitemaps': [urls], 'crawl_delay': float or None}
+    """
+    parsed = urlparse(base_url)
+    robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+    result = {'sitemaps': [], 'crawl_delay': None}
+
+    try:
+        response = client.get(robots_url, timeout=timeout)
+    except Exception:
+        return result
+    try:
+        if response.status_code != 200:
+            return result
+        text = response.text
+    except Exception:
+        return result
+    finally:
+        release(response)
+
+    applies = False
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        key, value = key.strip().lower(), value.strip()
+
+        if key == 'sitemap':
+            result['sitemaps'].append(urljoin(robots_url, value))
+        elif key == 'user-agent':
+            applies = value == '*'
+        elif key == 'crawl-delay' and applies and result['crawl_delay'] is None:
+            try:
+                result['crawl_delay'] = float(value)
+            except ValueError:
+                pass
+
+    return result
+
+
+def sitemap_candidates(config, client):
+    """Sitemap URLs to read: explicit config list, else robots.txt hints, else /sitemap.xml"""
+    setting = config.get('sitemap')
+    if isinstance(setting, list):
+        return setting
+
+    base_url = config['base_url']
+    sitemaps = fetch_robots(base_url, client)['sitemaps']
+    if sitemaps:
+        return sitemaps
+
+    parsed = urlparse(base_url)
+    candidates = [urljoin(base_url, 'sitemap.xml')]
+    root_sitemap = f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"
+    if root_sitemap not in candidates:
+        candidates.append(root_sitemap)
+    return candidates
+
+
+def iter_sitemap(sitemap_url, client, timeout=30, depth=0, seen=None):
+    """
+    Stream (url, lastmod) pairs from a sitemap or sitemap index
+
+    The body is parsed incrementally and elements are cleared as soon as
+    they are read, so a 50K-URL sitemap never sits in memory as a tree.
+    """
+    seen = seen if seen is not None else set()
+    if depth > MAX_SITEMAP_DEPTH or sitemap_url in seen:
+        return
+    seen.add(sitemap_url)
+
+    try:
+        response = client.get(sitemap_url, timeout=timeout, stream=True)
+    except Exception:
+        return
+    if response.status_code != 200:
+        # A streamed body left unread holds its pooled connection
+        release(response)
+        return
+
+    if response.raw is not None:
+        response.raw.decode_content = True
+        source = response.raw
+    else:
+        source = io.BytesIO(response.content)
+    if urlparse(sitemap_url).path.endswith('.gz'):
+        source = gzip.GzipFile(fileobj=source)
+
+    nested = []
+    loc = lastmod = None
+    try:
+        for _, elem in ET.iterparse(source, events=('end',)):
+            name = _local_name(elem.tag)
+            # First <loc> wins: image/video extensions nest their own <loc> later
+            if name == 'loc' and loc is None:
+                loc = (elem.text or '').strip()
+            elif name == 'lastmod' and lastmod is None:
+                lastmod = (elem.text or '').strip() or None
+            elif name == 'url':
+                if loc:
+                    yield loc, lastmod
+                loc = lastmod = None
+                elem.clear()
+            elif name == 'sitemap':
+                if loc:
+                    nested.append(loc)
+                loc = lastmod = None
+                elem.clear()
+    except (ET.ParseError, OSError, EOFError):
+        pass
+    finally:
+        release(response)
+
+    for child in nested:
+        for entry in iter_sitemap(child, client, timeout, depth + 1, seen):
+            yield entry
+
+
+def load_sitemap_urls(config, client, is_valid_url):
+    """
+    Collect in-scope URLs from the config's sitemaps
+
+    Args:
+        config: Configuration dictionary
+        client: Shared HttpClient
+        is_valid_url: Filter applying base_url and url_patterns
+
+    Returns:
+        dict: url -> lastmod (None when the sitemap has none), in sitemap order
+    """
+    urls = {}
+    seen = set()
+    for sitemap_url in sitemap_candidates(config, client):
+        for url, lastmod in iter_sitemap(sitemap_url, client, seen=seen):
+            if url not in urls and is_valid_url(url):
+                urls[url] = lastmod
+    return urls
@@ -131,6 +131,20 @@ def scrape_run(ctx, config, skip_scrape, resume, fresh, max_pages):
     run_scrape(console, config, skip_scrape, resume, fresh, max_pages)
 
 
+@scrape_group.command(name='batch')
+@click.argument('configs', nargs=-1, required=True)
+@click.option('--max-connections', default=16, help='Requests in flight across all configs')
+@click.option('--per-host', type=int, help="Requests in flight per host (default: each config's concurrency)")
+@click.option('--max-pages', type=int, help='Override max_pages for every config')
+@click.option('--resume', is_flag=True, help='Resume each config from its checkpoint')
+@click.option('--skip-build', is_flag=True, help='Scrape only, do not build skills')
+@click.pass_context
+def scrape_batch(ctx, configs, max_connections, per_host, max_pages, resume, skip_build):
+    """Scrape many configs at once, interleaving hosts"""
+    from cli.commands.scrape_cmd import batch_scrape
+    batch_scrape(console, configs, max_connections, per_host, max_pages, resume, skip_build)
+
+
 @scrape_group.command(name='estimate')
 @click.argument('config', type=str)
 @click.option('--max-discovery', default=1000, help='Max pages to discover')
@@ -319,11 +333,13 @@ def workflow_full(ctx, config, enhance, upload):
 @click.option('--enhance', type=click.Choice(['local', 'api', 'none']), default='local',
               help='Enhancement type')
 @click.option('--upload', is_flag=True, help='Upload after packaging')
+@click.option('--incremental', is_flag=True,
+              help='Re-scrape only changed pages and rebuild affected reference files')
 @click.pass_context
-def workflow_rebuild(ctx, skill_name, enhance, upload):
+def workflow_rebuild(ctx, skill_name, enhance, upload, incremental):
     """Fast rebuild from cache: build → enhance → package"""
     from cli.commands.workflow_cmd import rebuild_workflow
-    rebuild_workflow(console, skill_name, enhance, upload)
+    rebuild_workflow(console, skill_name, enhance, upload, incremental)
 
 
 # ============================================================================
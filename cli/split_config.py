@@ -13,6 +13,12 @@ from pathlib import Path
 from typing import Dict, List, Any, Tuple
 from collections import defaultdict
 
+try:
+    from compiled_config import CompiledConfig
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from compiled_config import CompiledConfig
+
 
 class ConfigSplitter:
     """Splits large documentation configs into multiple focused configs"""
@@ -23,6 +29,7 @@ class ConfigSplitter:
         self.target_pages = target_pages
         self.config = self.load_config()
         self.base_name = self.config['name']
+        self.compiled = self.compile_config()
 
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file"""
@@ -36,6 +43,14 @@ class ConfigSplitter:
             print(f"❌ Error: Invalid JSON in config file: {e}")
             sys.exit(1)
 
+    def compile_config(self) -> CompiledConfig:
+        """Compile selectors and URL patterns, which every split config inherits"""
+        try:
+            return CompiledConfig(self.config)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
     def get_split_strategy(self) -> str:
         """Determine split strategy"""
         # Check if strategy is defined in config
@@ -84,22 +99,23 @@ class ConfigSplitter:
             new_config['name'] = f"{self.base_name}-{category_name}"
             new_config['description'] = f"{self.base_name.capitalize()} - {category_name.replace('_', ' ').title()}. {self.config.get('description', '')}"
 
-            # Update URL patterns to focus on this category
-            url_patterns = new_config.get('url_patterns', {})
-
-            # Add category keywords to includes
-            includes = url_patterns.get('include', [])
+            # Update URL patterns to focus on this category: the parent's
+            # includes (copied, so categories don't accumulate each other's)
+            # plus the category's path keywords
+            includes = list(self.compiled.is_valid_url.includes)
             for keyword in keywords:
-                if keyword.startswith('/'):
+                if keyword.startswith('/') and keyword not in includes:
                     includes.append(keyword)
 
             if includes:
-                url_patterns['include'] = list(set(includes))
-                new_config['url_patterns'] = url_patterns
+                new_config['url_patterns'] = dict(new_config.get('url_patterns', {}), include=includes)
 
             # Keep only this category
             new_config['categories'] = {category_name: keywords}
 
+            # Sibling configs crawl the same site: share bodies and extracted pages
+            new_config.setdefault('blob_cache', True)
+
             # Remove split config from child
             if 'split_strategy' in new_config:
                 del new_config['split_strategy']
@@ -135,6 +151,7 @@ class ConfigSplitter:
             new_config['name'] = f"{self.base_name}-part{part_num}"
             new_config['description'] = f"{self.base_name.capitalize()} - Part {part_num}. {self.config.get('description', '')}"
             new_config['max_pages'] = self.target_pages
+            new_config.setdefault('blob_cache', True)
 
             # Remove split config from child
             if 'split_strategy' in new_config:
@@ -159,6 +176,7 @@ class ConfigSplitter:
             "url_patterns": self.config.get('url_patterns', {}),
             "rate_limit": self.config.get('rate_limit', 0.5),
             "max_pages": 500,  # Router only needs overview pages
+            "blob_cache": self.config.get('blob_cache', True),
             "_router": True,
             "_sub_skills": [cfg['name'] for cfg in sub_configs],
             "_routing_keywords": {
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Per-host request throttling for Skill Seeker
+Replaces the serialized sleep after every page with a politeness budget
+that is shared by all crawl threads. The adaptive throttle tunes that budget
+per host from 429/503 responses, Retry-After, Crawl-delay and latency.
+
+Config (all optional):
+    "throttle": {"adaptive": true, "min_delay": 0.1, "max_delay": 30}
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+class HostThrottle:
+    """Enforce a minimum delay between request starts to the same host"""
+
+    def __init__(self, delay=0.5):
+        self.delay = max(0.0, float(delay))
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """
+        Block until a request to url's host is allowed
+
+        Slots are reserved under a lock so concurrent callers queue up
+        behind each other instead of all firing at once.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+
+        wait_time = slot - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def record(self, url, status=None, latency=None, retry_after=None):
+        """Feedback hook for adaptive throttles; a fixed delay ignores it"""
+
+    def set_crawl_delay(self, url, delay):
+        """Never go faster than a robots.txt Crawl-delay for url's host"""
+        if delay:
+            self.delay = max(self.delay, float(delay))
+
+    def describe(self, url):
+        """Short live state for progress output"""
+        return f"{self.delay:.2f}s/req"
+
+
+# Throttle options under the 'throttle' config key
+DEFAULT_OPTIONS = {
+    'adaptive': True,
+    'min_delay': None,      # default: rate_limit / 4
+    'max_delay': 30.0,
+    'increase': 0.1,        # requests/sec added per healthy response
+    'decrease': 0.5,        # rate multiplier on 429/503 or a latency spike
+    'latency_factor': 2.0,  # spike = latency above this multiple of the baseline
+    'burst': 1,
+}
+
+# Statuses that mean "slow down"
+BACKOFF_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostState:
+    """Token bucket and AIMD state for one host"""
+
+    def __init__(self, delay, now):
+        self.delay = delay           # current seconds per request (1 / rate)
+        self.floor = 0.0             # Crawl-delay: delay never drops below this
+        self.tokens = 1.0
+        self.updated = now
+        self.blocked_until = 0.0     # Retry-After / backoff pause
+        self.latency = None          # EWMA of response time
+        self.baseline = None         # lowest EWMA seen: the host's healthy latency
+
+
+class AdaptiveThrottle(HostThrottle):
+    """
+    Per-host token bucket whose rate follows AIMD
+
+    Each healthy response adds a little to the host's request rate; a 429 or
+    503, or latency climbing well above the host's baseline, cuts it
+    multiplicatively. Retry-After pauses the host outright, and a robots.txt
+    Crawl-delay is a floor the rate never exceeds. rate_limit is the starting
+    delay.
+    """
+
+    def __init__(self, delay=0.5, min_delay=None, max_delay=30.0, increase=0.1,
+                 decrease=0.5, latency_factor=2.0, burst=1):
+        super().__init__(delay)
+        self.min_delay = self.delay / 4 if min_delay is None else max(0.0, float(min_delay))
+        self.max_delay = max(float(max_delay), self.delay)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.latency_factor = float(latency_factor)
+        self.burst = max(1, int(burst))
+        self._hosts = {}
+
+    def _state(self, host, now):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.delay, now)
+        return state
+
+    def wait(self, url):
+        """
+        Block until url's host has a token and is not paused
+
+        Tokens refill at 1/delay per second up to burst; a caller that finds
+        the bucket empty reserves the next token (the balance goes negative)
+        so concurrent callers queue up in order.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(host, now)
+            if state.delay > 0:
+                elapsed = now - state.updated
+                state.tokens = min(self.burst, state.tokens + elapsed / state.delay)
+            else:
+                state.tokens = self.burst
+            state.updated = now
+
+            wait_time = 0.0
+            if state.tokens < 1:
+                wait_time = (1 - state.tokens) * state.delay
+            state.tokens -= 1
+            wait_time = max(wait_time, state.blocked_until - now)
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def record(self, url, status=None, latency=None, retry_after=None):
+        """
+        Adjust url's host rate from one response
+
+        Args:
+            url: Requested URL
+            status: HTTP status code (None for a network error)
+            latency: Seconds the request took
+            retry_after: Retry-After header value, if any
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(host, now)
+
+            spike = False
+            if latency is not None and status not in BACKOFF_STATUSES:
+                state.latency = latency if state.latency is None else 0.7 * state.latency + 0.3 * latency
+                if state.baseline is None or state.latency < state.baseline:
+                    state.baseline = state.latency
+                spike = state.latency > self.latency_factor * max(state.baseline, 0.05)
+
+            if status in BACKOFF_STATUSES or spike:
+                # Multiplicative decrease: slow to the next slower rate
+                slower = max(state.delay, self.min_delay, 0.1) / self.decrease
+                state.delay = min(self.max_delay, max(state.floor, slower))
+                if spike:
+                    # Judge the next spike against today's latency, not the best ever
+                    state.baseline = state.latency
+                pause = parse_retry_after(retry_after)
+                if pause is None and status in BACKOFF_STATUSES:
+                    pause = state.delay
+                if pause:
+                    state.blocked_until = max(state.blocked_until, now + pause)
+                    state.tokens = min(state.tokens, 0.0)
+            elif status is not None and status < 400 and state.delay > 0:
+                # Additive increase of the request rate
+                faster = 1.0 / (1.0 / state.delay + self.increase)
+                state.delay = max(self.min_delay, state.floor, faster)
+
+    def set_crawl_delay(self, url, delay):
+        """Never go faster than a robots.txt Crawl-delay for url's host"""
+        if not delay:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._state(host, time.monotonic())
+            state.floor = min(float(delay), self.max_delay)
+            state.delay = max(state.delay, state.floor)
+
+    def describe(self, url):
+        """Short live state for progress output, e.g. '0.31s/req' or 'paused 4s'"""
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                return f"{self.delay:.2f}s/req"
+            paused = state.blocked_until - time.monotonic()
+            if paused > 0:
+                return f"{state.delay:.2f}s/req, paused {paused:.0f}s"
+            return f"{state.delay:.2f}s/req"
+
+
+def make_throttle(config):
+    """Throttle for a config: adaptive unless throttle.adaptive is false"""
+    options = dict(DEFAULT_OPTIONS)
+    options.update({k: v for k, v in config.get('throttle', {}).items() if k in DEFAULT_OPTIONS})
+    delay = config.get('rate_limit', 0.5)
+    if not options.pop('adaptive'):
+        return HostThrottle(delay)
+    return AdaptiveThrottle(delay, **options)
@@ -49,6 +49,7 @@ def upload_skill_api(zip_path):
     # Check for requests library
     try:
         import requests
+        from http_client import get_client
     except ImportError:
         return False, "requests library not installed. Run: pip install requests"
 
@@ -89,7 +90,7 @@ def upload_skill_api(zip_path):
             'skill': (zip_path.name, zip_data, 'application/zip')
         }
 
-        response = requests.post(
+        response = get_client().post(
             api_url,
             headers=headers,
             files=files,
@@ -464,6 +464,7 @@ async def validate_config_tool(args: dict) -> list[TextContent]:
     # Import validation function
     sys.path.insert(0, str(CLI_DIR))
     from doc_scraper import validate_config
+    from compiled_config import CompiledConfig
     import json
 
     try:
@@ -487,6 +488,8 @@ async def validate_config_tool(args: dict) -> list[TextContent]:
             result += f"  Base URL: {config['base_url']}\n"
             result += f"  Max pages: {config.get('max_pages', 'Not set')}\n"
             result += f"  Rate limit: {config.get('rate_limit', 'Not set')}s\n"
+            # validate_config compiled it already, so this cannot raise
+            result += f"  URL filter: {CompiledConfig(config).is_valid_url.describe()}\n"
 
             if warnings:
                 result += f"\n⚠️  Warnings:\n"
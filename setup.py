@@ -32,6 +32,16 @@ extras_require = {
     'mcp': [
         'mcp>=0.1.0',
     ],
+    'http2': [
+        'httpx[http2]>=0.24.0',
+    ],
+    'redis': [
+        'redis>=4.0.0',
+    ],
+    'fast': [
+        'lxml>=4.6.0',
+        'selectolax>=0.3.12',
+    ],
 }
 
 setup(
@@ -46,6 +56,7 @@ setup(
 
     packages=find_packages(exclude=['tests', 'docs']),
     package_dir={'': '.'},
+    package_data={'cli': ['data/*.json']},
 
     install_requires=requirements,
     extras_require=extras_require,
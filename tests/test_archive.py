@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test suite for the raw page archive
+Tests framing, dedup of unchanged bodies, crash recovery and --replay
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.archive import PageArchive, scan_archives, read_record
+from cli.doc_scraper import DocToSkillConverter
+from cli.page_store import PageStore
+
+
+BASE = 'https://docs.example.com/'
+
+
+def html_response(url, body):
+    return Mock(url=url, status_code=200, headers={'Content-Type': 'text/html'},
+                raw=None, content=body.encode())
+
+
+class TestPageArchive(unittest.TestCase):
+    """Test writing and indexing archive files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'raw_pages.archive')
+        self.archive = PageArchive(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_latest_record_wins(self):
+        """Test that a changed body appends and replaces the URL's record"""
+        self.assertTrue(self.archive.record(BASE + 'a', html_response(BASE + 'a', 'v1')))
+        self.assertTrue(self.archive.record(BASE + 'b', html_response(BASE + 'b', 'b')))
+        self.assertTrue(self.archive.record(BASE + 'a', html_response(BASE + 'a', 'v2')))
+
+        records = self.archive.scan()
+        self.assertEqual(list(records), [BASE + 'a', BASE + 'b'])
+        header, body = read_record(self.path, records[BASE + 'a'][0])
+        self.assertEqual(body, b'v2')
+        self.assertEqual(header['headers']['Content-Type'], 'text/html')
+
+    def test_unchanged_body_not_appended(self):
+        """Test that a re-scrape of an unchanged page adds nothing"""
+        self.archive.record(BASE + 'a', html_response(BASE + 'a', 'same'))
+        size = os.path.getsize(self.path)
+
+        reopened = PageArchive(self.path)
+        self.assertFalse(reopened.record(BASE + 'a', html_response(BASE + 'a', 'same')))
+        self.assertEqual(os.path.getsize(self.path), size)
+
+    def test_truncated_frame_is_repaired(self):
+        """Test that a half-written record is dropped and later writes stay readable"""
+        self.archive.record(BASE + 'a', html_response(BASE + 'a', 'a'))
+        self.archive.record(BASE + 'b', html_response(BASE + 'b', 'b' * 100))
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+
+        reopened = PageArchive(self.path)
+        self.assertEqual(list(reopened.scan()), [BASE + 'a'])
+        reopened.record(BASE + 'c', html_response(BASE + 'c', 'c'))
+        self.assertEqual(list(PageArchive(self.path).scan()), [BASE + 'a', BASE + 'c'])
+
+    def test_newest_record_across_files(self):
+        """Test that per-worker archive files are merged by fetch time"""
+        self.archive.record(BASE + 'a', html_response(BASE + 'a', 'old'))
+        PageArchive(os.path.join(self.temp_dir, 'raw_pages.host-1.archive')).record(
+            BASE + 'a', html_response(BASE + 'a', 'new'))
+
+        path, offset, _ = scan_archives(self.temp_dir)[BASE + 'a']
+        self.assertEqual(read_record(path, offset)[1], b'new')
+
+
+class TestReplay(unittest.TestCase):
+    """Test re-extracting a scrape offline"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.config = {
+            'name': 'test-replay',
+            'base_url': BASE,
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0,
+            'max_pages': 100
+        }
+        links = ''.join(f'<a href="{BASE}p{i}">p{i}</a>' for i in range(3))
+        self.site = {BASE: f'<h1>Home</h1><article>{links}</article>'}
+        for i in range(3):
+            self.site[BASE + f'p{i}'] = (f'<h1>Page {i}</h1><article><p>Body {i}</p></article>'
+                                         f'<div class="real"><p>Real {i} content from the new selector</p></div>')
+
+        converter = DocToSkillConverter(self.config)
+        converter.http_cache = None
+        converter.http = Mock()
+        converter.http.get.side_effect = lambda url, **kwargs: html_response(url, self.site[url])
+        converter.scrape_all()
+        self.assertEqual(len(converter.pages), 4)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def replay(self, **kwargs):
+        config = dict(self.config, selectors={'main_content': 'div.real', 'title': 'h1'})
+        converter = DocToSkillConverter(config)
+        converter.http = Mock()
+        converter.http.get.side_effect = AssertionError("replay must not touch the network")
+        converter.replay_archive(**kwargs)
+        return converter
+
+    def test_replay_uses_new_selectors(self):
+        """Test that pages are re-extracted from the archive without fetching"""
+        converter = self.replay(processes=1)
+
+        pages = {p['url']: p for p in converter.pages}
+        self.assertEqual(len(pages), 4)
+        self.assertIn('Real 1', pages[BASE + 'p1']['content'])
+        self.assertEqual(len(PageStore('output/test-replay_data/pages')), 4)
+
+    def test_replay_with_process_pool(self):
+        """Test the multi-process path gives the same pages"""
+        DocToSkillConverter.REPLAY_POOL_MIN, old_min = 0, DocToSkillConverter.REPLAY_POOL_MIN
+        try:
+            converter = self.replay(processes=2)
+        finally:
+            DocToSkillConverter.REPLAY_POOL_MIN = old_min
+
+        self.assertEqual(sorted(p['url'] for p in converter.pages),
+                         sorted(self.site))
+        self.assertIn('Real 0', next(p for p in converter.pages if p['url'] == BASE + 'p0')['content'])
+
+
+if __name__ == '__main__':
+    unittest.main()
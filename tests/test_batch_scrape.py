@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test suite for the batch scrape scheduler
+Tests host interleaving, connection caps, shared throttles and reports
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.batch_scrape import BatchScheduler
+from cli.doc_scraper import DocToSkillConverter
+
+
+class TestBatchScheduler(unittest.TestCase):
+    """Test several configs scraped in one process"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.fetched = []
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_converter(self, name, base, pages, delay=0.0, **config):
+        """Converter for a fake site: base -> base/0 .. base/(pages-2)"""
+        config = dict({
+            'name': name,
+            'base_url': base,
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0,
+            'max_pages': 100
+        }, **config)
+        converter = DocToSkillConverter(config)
+        children = [f"{base}{i}" for i in range(pages - 1)]
+        host = base.split('/')[2]
+
+        def fake_fetch(url):
+            with self.lock:
+                self.fetched.append(url)
+                self.active[host] = self.active.get(host, 0) + 1
+                self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+            time.sleep(delay)
+            with self.lock:
+                self.active[host] -= 1
+            return {'url': url, 'title': url, 'content': '', 'headings': [],
+                    'code_samples': [], 'patterns': [],
+                    'links': children if url == base else []}
+        converter.fetch_page = fake_fetch
+        return converter
+
+    def test_hosts_take_turns(self):
+        """Test that one connection alternates between configs"""
+        a = self.make_converter('site-a', 'https://a.example.com/', 4)
+        b = self.make_converter('site-b', 'https://b.example.com/', 4)
+
+        jobs = BatchScheduler([a, b], max_connections=1).run()
+
+        hosts = [url.split('/')[2][0] for url in self.fetched]
+        self.assertEqual(hosts, ['a', 'b'] * 4)
+        self.assertEqual([job.fetched for job in jobs], [4, 4])
+        self.assertTrue(os.path.exists('output/site-a_data/summary.json'))
+
+    def test_slow_host_does_not_stall_batch(self):
+        """Test the per-host cap leaves connections for other sites"""
+        slow = self.make_converter('slow', 'https://slow.example.com/', 3, delay=0.2)
+        fast = self.make_converter('fast', 'https://fast.example.com/', 20, delay=0.01)
+
+        jobs = BatchScheduler([slow, fast], max_connections=4, per_host=2).run()
+
+        self.assertLessEqual(self.peak['slow.example.com'], 2)
+        self.assertLessEqual(self.peak['fast.example.com'], 2)
+        slow_job, fast_job = jobs
+        self.assertLess(fast_job.finished_at, slow_job.finished_at)
+        self.assertEqual(len(fast.pages), 20)
+
+    def test_same_host_shares_throttle(self):
+        """Test configs on one host share its politeness throttle"""
+        a = self.make_converter('docs-api', 'https://docs.example.com/api/', 2)
+        b = self.make_converter('docs-guide', 'https://docs.example.com/guide/', 2)
+
+        BatchScheduler([a, b]).run()
+
+        self.assertIs(a.throttle, b.throttle)
+
+    def test_max_pages_per_config(self):
+        """Test each config keeps its own page budget"""
+        capped = self.make_converter('capped', 'https://a.example.com/', 10, max_pages=3)
+        full = self.make_converter('full', 'https://b.example.com/', 5)
+
+        jobs = BatchScheduler([capped, full], max_connections=4).run()
+
+        self.assertEqual([job.fetched for job in jobs], [3, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared blob cache
+Tests content addressing, URL reuse within max_age, LRU eviction and two
+configs crawling the same site through one cache
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.blob_cache import BlobCache, open_blob_cache, cache_dir
+from cli.doc_scraper import DocToSkillConverter, validate_config
+from cli.split_config import ConfigSplitter
+
+
+BASE = 'https://docs.example.com/'
+
+
+def make_response(url, body, content_type='text/html'):
+    return Mock(url=url, status_code=200, headers={'Content-Type': content_type}, raw=None, content=body)
+
+
+class TestBlobCache(unittest.TestCase):
+    """Test the cache on its own"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = BlobCache(self.temp_dir)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_content_addressed(self):
+        """Test equal bodies are stored once"""
+        first = self.cache.put_blob(b'same body')
+        self.assertEqual(self.cache.put_blob(b'same body'), first)
+        self.assertEqual(self.cache.get_blob(first), b'same body')
+        self.assertEqual(self.cache.counts()['blobs'], 1)
+
+    def test_response_reuse(self):
+        self.cache.store_response(BASE + 'old', make_response(BASE + 'new', b'<h1>Hi</h1>'))
+
+        response = self.cache.response(BASE + 'old')
+        self.assertEqual((response.status_code, response.url, response.content),
+                         (200, BASE + 'new', b'<h1>Hi</h1>'))
+        self.assertTrue(response.from_cache)
+        self.assertIsNone(self.cache.response(BASE + 'other'))
+
+        # Too old to reuse without a request
+        self.cache.max_age = 0.01
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.response(BASE + 'old'))
+
+    def test_extracted(self):
+        key = BlobCache.extract_key(BASE, b'body', 'settings')
+        self.assertNotEqual(key, BlobCache.extract_key(BASE, b'body', 'other settings'))
+        self.assertIsNone(self.cache.get_extracted(key))
+        self.cache.put_extracted(key, {'page': {'url': BASE}, 'signature': None})
+        self.assertEqual(self.cache.get_extracted(key), {'page': {'url': BASE}, 'signature': None})
+
+    def test_lru_eviction(self):
+        """Test the least recently used blobs go first, with their URL mappings"""
+        for i in range(5):
+            self.cache.store_response(BASE + str(i), make_response(BASE + str(i), os.urandom(1000)))
+            time.sleep(0.01)
+        self.cache.response(BASE + '0')   # now the most recently used
+
+        size = self.cache.total_bytes() // 5
+        freed = self.cache.evict(max_bytes=size * 3)
+        self.assertGreater(freed, 0)
+        self.assertLessEqual(self.cache.total_bytes(), size * 3)
+        self.assertIsNotNone(self.cache.response(BASE + '0'))
+        self.assertIsNone(self.cache.response(BASE + '1'))
+        self.assertEqual(self.cache.counts()['urls'], self.cache.counts()['blobs'])
+
+    def test_missing_blob_is_a_miss(self):
+        self.cache.store_response(BASE, make_response(BASE, b'body'))
+        shutil.rmtree(os.path.join(self.temp_dir, 'blobs'))
+        self.assertIsNone(self.cache.response(BASE))
+
+    def test_config(self):
+        self.assertIsNone(open_blob_cache({}))
+        self.assertEqual(open_blob_cache({'blob_cache': {'dir': self.temp_dir, 'max_age': 5}}).max_age, 5)
+        errors, _ = validate_config({'name': 'x', 'base_url': BASE, 'blob_cache': {'max_bytes': -1}})
+        self.assertTrue(any('blob_cache.max_bytes' in e for e in errors))
+
+        os.environ['SKILLSEEKER_CACHE'] = self.temp_dir
+        try:
+            self.assertEqual(str(cache_dir()), self.temp_dir)
+        finally:
+            del os.environ['SKILLSEEKER_CACHE']
+
+
+class TestSharedCrawl(unittest.TestCase):
+    """Test a second config reuses what the first one fetched"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.site = {
+            BASE: f'<h1>Home</h1><article><p>Start here and read every guide.</p>'
+                  f'<a href="{BASE}a">a</a><a href="{BASE}b">b</a></article>',
+            BASE + 'a': '<h1>Page A</h1><article><p>Everything about the first topic.</p></article>',
+            BASE + 'b': '<h1>Page B</h1><article><p>Everything about the second topic.</p></article>',
+        }
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def scrape(self, name, http_get, **config):
+        config = dict({'name': name, 'base_url': BASE, 'rate_limit': 0, 'max_pages': 10,
+                       'selectors': {'main_content': 'article', 'title': 'h1'},
+                       'blob_cache': {'dir': os.path.join(self.temp_dir, 'cache')}}, **config)
+        converter = DocToSkillConverter(config)
+        converter.http_cache = None
+        converter.http = Mock()
+        converter.http.get.side_effect = http_get
+        converter.scrape_all()
+        return converter
+
+    def test_second_config_fetches_nothing(self):
+        first = self.scrape('godot', lambda url, **kwargs: make_response(url, self.site[url].encode()))
+
+        def offline(url, **kwargs):
+            raise AssertionError(f"fetched {url}")
+        second = self.scrape('godot-large', offline)
+
+        by_url = lambda pages: sorted(pages, key=lambda p: p['url'])
+        self.assertEqual(by_url(second.pages), by_url(first.pages))
+        self.assertEqual(second.blob_cache.bodies_reused, 3)
+        self.assertEqual(second.blob_cache.pages_reused, 3)
+
+        # Different selectors reuse the bodies but extract again
+        third = self.scrape('godot-titles', offline, selectors={'main_content': 'article', 'title': 'title'})
+        self.assertEqual(third.blob_cache.bodies_reused, 3)
+        self.assertEqual(third.blob_cache.pages_reused, 0)
+        self.assertEqual(len(third.pages), 3)
+
+    def test_split_children_share_cache(self):
+        with open('godot.json', 'w') as f:
+            json.dump({'name': 'godot', 'base_url': BASE, 'selectors': {'main_content': 'article'},
+                       'categories': {'a': ['/a'], 'b': ['/b']}}, f)
+        configs = ConfigSplitter('godot.json', strategy='router').split()
+        self.assertTrue(all(config['blob_cache'] is True for config in configs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test suite for URL canonicalization
+Tests fragment/query/path folding, redirect aliases and crawl dedup
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.canonical import UrlCanonicalizer
+from cli.doc_scraper import DocToSkillConverter
+
+
+BASE = 'https://docs.example.com/'
+
+
+class TestUrlCanonicalizer(unittest.TestCase):
+    """Test canonical URLs and dedup keys"""
+
+    def setUp(self):
+        self.canon = UrlCanonicalizer()
+
+    def test_fragment_and_query(self):
+        """Test anchors and dropped params disappear, other params are sorted"""
+        self.assertEqual(self.canon.canonicalize(BASE + 'page.html#section'), BASE + 'page.html')
+        self.assertEqual(self.canon.canonicalize(BASE + 'page.html?highlight=x&utm_source=a'),
+                         BASE + 'page.html')
+        self.assertEqual(self.canon.canonicalize(BASE + 'search?q=a&lang=py'),
+                         BASE + 'search?lang=py&q=a')
+
+    def test_scheme_host_and_port(self):
+        """Test case-insensitive parts and default ports are normalized"""
+        self.assertEqual(self.canon.canonicalize('HTTPS://Docs.Example.com:443/Guide'),
+                         'https://docs.example.com/Guide')
+        self.assertEqual(self.canon.canonicalize('http://localhost:8000'), 'http://localhost:8000/')
+
+    def test_key_folds_index_and_slash(self):
+        """Test that index.html and trailing slashes share one key"""
+        keys = {self.canon.key(BASE + path)
+                for path in ['guide/', 'guide', 'guide/index.html', 'guide/#top']}
+        self.assertEqual(len(keys), 1)
+        self.assertNotEqual(self.canon.key(BASE + 'guide'), self.canon.key(BASE + 'guides'))
+
+    def test_redirect_alias(self):
+        """Test that a recorded redirect maps the old spelling to the target"""
+        self.assertTrue(self.canon.record_redirect(BASE + 'old', BASE + 'new/'))
+        self.assertEqual(self.canon.key(BASE + 'old#x'), self.canon.key(BASE + 'new'))
+        self.assertFalse(self.canon.record_redirect(BASE + 'a', BASE + 'a/'))
+
+    def test_config_overrides(self):
+        """Test that config options replace the defaults"""
+        canon = UrlCanonicalizer({'canonical': {'drop_params': ['v'], 'strip_fragment': False}})
+        self.assertEqual(canon.canonicalize(BASE + 'p?v=1&highlight=x#a'),
+                         BASE + 'p?highlight=x#a')
+
+
+class TestCanonicalCrawl(unittest.TestCase):
+    """Test that the scraper fetches each page once"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.config = {
+            'name': 'test-canonical',
+            'base_url': BASE,
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'checkpoint': {'enabled': True, 'interval': 1000},
+            'rate_limit': 0,
+            'max_pages': 100
+        }
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_response(self, url, body):
+        return Mock(url=url, status_code=200, headers={}, raw=None,
+                    content=f'<h1>{url}</h1><article>{body}</article>'.encode())
+
+    def test_anchor_and_redirect_duplicates_fetched_once(self):
+        """Test anchors, index.html and redirect aliases cost no extra fetch"""
+        links = ''.join(f'<a href="{href}">x</a>' for href in
+                        ['api.html#a', 'api.html#b', 'api.html?highlight=x',
+                         'guide/index.html', 'guide/', 'old-api'])
+        site = {
+            BASE: self.make_response(BASE, links),
+            BASE + 'api.html': self.make_response(BASE + 'api.html', ''),
+            BASE + 'guide/index.html': self.make_response(BASE + 'guide/index.html', ''),
+            BASE + 'old-api': self.make_response(BASE + 'api.html', ''),
+        }
+        converter = DocToSkillConverter(self.config)
+        converter.http_cache = None
+        converter.http = Mock()
+        converter.http.get.side_effect = lambda url, **kwargs: site[url]
+
+        converter.scrape_all()
+
+        fetched = [call.args[0] for call in converter.http.get.call_args_list
+                   if not call.args[0].endswith('robots.txt')]
+        self.assertEqual(sorted(fetched),
+                         sorted([BASE, BASE + 'api.html', BASE + 'guide/index.html', BASE + 'old-api']))
+        self.assertEqual(len(converter.pages), 3)
+
+    def test_redirects_saved_in_checkpoint(self):
+        """Test that redirect aliases survive a resume"""
+        converter = DocToSkillConverter(self.config)
+        converter.canonicalizer.record_redirect(BASE + 'old', BASE + 'new')
+        converter.save_checkpoint()
+
+        with open(converter.checkpoint_file) as f:
+            self.assertIn('redirects', json.load(f))
+
+        resumed = DocToSkillConverter(self.config, resume=True)
+        self.assertEqual(resumed.canonicalizer.key(BASE + 'old'), resumed.canonicalizer.key(BASE + 'new'))
+
+
+if __name__ == '__main__':
+    unittest.main()
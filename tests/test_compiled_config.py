@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test suite for the compiled config
+Tests that the regex URL filter agrees with per-pattern substring checks and
+that bad selectors and patterns are rejected up front
+"""
+
+import sys
+import os
+import random
+import unittest
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.compiled_config import CompiledConfig, UrlFilter, DEFAULT_SELECTORS
+from cli.doc_scraper import validate_config
+
+
+BASE = 'https://docs.example.com/'
+
+
+def substring_filter(url, includes, excludes):
+    """The per-pattern loop the scraper used before"""
+    if not url.startswith(BASE):
+        return False
+    if includes and not any(pattern in url for pattern in includes):
+        return False
+    return not any(pattern in url for pattern in excludes)
+
+
+class TestUrlFilter(unittest.TestCase):
+    """Test the include/exclude alternations"""
+
+    def test_matches_substring_checks(self):
+        """Test random URLs, including regex metacharacters in patterns"""
+        includes = ['/guide/', '/api/', '?page=', 'a+b', '/v1.0/']
+        excludes = ['/blog/', '.pdf', '(old)', '/api/internal', '*']
+        url_filter = UrlFilter(BASE, includes, excludes)
+
+        rng = random.Random(0)
+        parts = ['guide', 'api', 'blog', 'v1.0', 'v1x0', 'internal', 'a+b', 'aab', '(old)', 'x.pdf', '*', 'index']
+        for i in range(2000):
+            path = '/'.join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+            url = rng.choice([BASE, 'https://other.example.com/']) + path + rng.choice(['', '?page=2', '/'])
+            self.assertEqual(url_filter(url), substring_filter(url, includes, excludes), url)
+
+    def test_no_patterns(self):
+        url_filter = UrlFilter(BASE)
+        self.assertTrue(url_filter(BASE + 'anything'))
+        self.assertFalse(url_filter('https://other.com/'))
+        self.assertEqual(url_filter.describe(), '0 include, 0 exclude patterns')
+
+
+class TestCompiledConfig(unittest.TestCase):
+    """Test selector compilation and validation"""
+
+    def test_selectors(self):
+        compiled = CompiledConfig({'base_url': BASE, 'selectors': {'main_content': 'article', 'title': ''}})
+        self.assertEqual(compiled.selectors['main_content'], 'article')
+        # Empty or missing selectors fall back to the defaults
+        self.assertEqual(compiled.selectors['title'], DEFAULT_SELECTORS['title'])
+
+        soup = BeautifulSoup('<title>T</title><article><pre><code>x</code></pre></article>', 'html.parser')
+        self.assertEqual(compiled.title.select_one(soup).get_text(), 'T')
+        self.assertEqual(len(compiled.code_blocks.select(compiled.main_content.select_one(soup))), 1)
+
+    def test_rejects_bad_config(self):
+        for bad in ({'selectors': {'code_blocks': 'pre:bogus('}},
+                    {'selectors': 'article'},
+                    {'url_patterns': {'include': '/guide/'}},
+                    {'url_patterns': {'exclude': [3]}}):
+            with self.subTest(config=bad):
+                with self.assertRaises(ValueError):
+                    CompiledConfig(dict(bad, base_url=BASE))
+
+    def test_validate_config(self):
+        """Test validate_config reports a selector that does not compile"""
+        errors, _ = validate_config({'name': 'x', 'base_url': BASE, 'selectors': {'title': 'h1[', 'main_content': 'main'}})
+        self.assertEqual(len(errors), 1)
+        self.assertIn('selectors.title', errors[0])
+
+        errors, _ = validate_config({'name': 'x', 'base_url': BASE, 'url_patterns': {'include': ['/a/']}})
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -261,6 +261,27 @@ class TestConfigValidation(unittest.TestCase):
             max_errors = [e for e in errors if 'max_pages' in e.lower()]
             self.assertEqual(len(max_errors), 0, f"Max pages {max_p} should be valid")
 
+    def test_invalid_concurrency_zero(self):
+        """Test invalid concurrency (zero)"""
+        config = {
+            'name': 'test',
+            'base_url': 'https://example.com/',
+            'concurrency': 0
+        }
+        errors, _ = validate_config(config)
+        self.assertTrue(any('concurrency' in error.lower() for error in errors))
+
+    def test_valid_concurrency(self):
+        """Test valid concurrency values"""
+        for workers in [1, 4, 16]:
+            config = {
+                'name': 'test',
+                'base_url': 'https://example.com/',
+                'concurrency': workers
+            }
+            errors, warnings = validate_config(config)
+            self.assertFalse(any('concurrency' in e.lower() for e in errors + warnings))
+
     def test_invalid_start_urls_not_list(self):
         """Test invalid start_urls (not a list)"""
         config = {
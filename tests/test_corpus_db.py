@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test suite for the corpus database
+Tests batched writes, the SQL versions of the build queries against their
+Python originals, full-text search and read-only access during a scrape
+"""
+
+import sys
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.corpus_db import CorpusDB, open_corpus
+from cli.doc_scraper import DocToSkillConverter
+from cli.generate_router import RouterGenerator
+
+
+BASE = 'https://docs.example.com/'
+
+
+def make_page(path, title, content, code=None):
+    page = {'url': BASE + path, 'title': title, 'content': content,
+            'headings': [{'level': 'h2', 'text': f'{title} basics'}],
+            'code_samples': [], 'patterns': [], 'links': [BASE + 'signals/intro', BASE + 'physics/areas']}
+    if code:
+        page['code_samples'].append({'code': code, 'language': 'gdscript'})
+        page['patterns'].append({'description': f'Example: {title}', 'code': code})
+    return page
+
+
+PAGES = [
+    make_page('signals/intro', 'Signals Introduction', 'Connect a signal to a method.', 'connect("pressed", self, "_on")'),
+    make_page('signals/custom', 'Custom Signals', 'Declare your own SIGNAL with emit.', 'signal health_changed'),
+    make_page('physics/bodies', 'Rigid Bodies', 'Physics bodies move under forces.', 'apply_impulse(Vector2())'),
+    make_page('physics/areas', 'Areas', 'Detect overlaps with an area.', 'signal health_changed'),
+    make_page('tutorials/first', 'Your First Game', 'Make a game with signals and physics.'),
+    make_page('misc/faq', 'FAQ', 'Frequently asked questions. ' + 'x' * 600 + ' signal'),
+]
+
+
+class TestCorpusDB(unittest.TestCase):
+    """Test the database on its own"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'corpus.sqlite')
+        self.corpus = CorpusDB(self.path, batch_size=4)
+        self.corpus.rebuild(PAGES)
+
+    def tearDown(self):
+        self.corpus.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def converter(self, config):
+        return DocToSkillConverter(dict(config, name='corpus-test', base_url=BASE), dry_run=True)
+
+    def test_tables(self):
+        self.assertEqual(len(self.corpus), 6)
+        self.assertEqual(self.corpus.urls(), [page['url'] for page in PAGES])
+        stats = self.corpus.stats()
+        self.assertEqual((stats['code_samples'], stats['links']), (4, 12))
+        self.assertEqual(stats['languages'], [('gdscript', 4)])
+
+    def test_categorize_matches_python(self):
+        for category_defs in ({'signals': ['signal'], 'physics': ['physics', 'body']},
+                              {'physics': ['physics'], 'signals': ['signal', 'emit']},
+                              {'empty': [], 'faq': ['questions']}):
+            with self.subTest(categories=category_defs):
+                expected = self.converter({'categories': category_defs}).smart_categorize(PAGES)
+                self.assertEqual(self.corpus.categorize(category_defs),
+                                 {cat: [p['url'] for p in pages] for cat, pages in expected.items()})
+
+    def test_quick_reference_matches_python(self):
+        expected = self.converter({}).generate_quick_reference(PAGES)
+        self.assertEqual(self.corpus.quick_reference(), expected)
+        self.assertEqual(len(expected), 3)
+
+    def test_replace_and_delete(self):
+        """Test re-adding a URL replaces its rows, and delete removes them everywhere"""
+        self.corpus.add(dict(PAGES[0], title='Signals Renamed', code_samples=[]))
+        self.corpus.delete(PAGES[1]['url'])
+
+        self.assertEqual(len(self.corpus), 5)
+        self.assertEqual(self.corpus.stats()['code_samples'], 2)
+        titles = [title for _, title, _ in self.corpus.search('signals')]
+        self.assertIn('Signals Renamed', titles)
+        self.assertNotIn('Custom Signals', titles)
+        self.assertEqual(self.corpus.search('emit'), [])
+
+    def test_search(self):
+        results = self.corpus.search('physics', limit=5)
+        self.assertEqual(results[0][0], BASE + 'physics/bodies')
+        self.assertIn('[Physics]', results[0][2])
+
+    def test_top_terms(self):
+        self.assertEqual(self.corpus.top_terms(limit=2), ['signals', 'areas'])
+
+    def test_reader_during_writes(self):
+        """Test a read-only connection sees committed batches, not queued pages"""
+        reader = open_corpus(self.temp_dir)
+        self.corpus.add(make_page('new/one', 'New One', 'queued'))
+        self.assertEqual(len(reader), 6)
+        for i in range(3):
+            self.corpus.add(make_page(f'new/{i}', 'New', 'batch'))
+        self.assertEqual(len(reader), 10)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            reader._conn.execute("DELETE FROM pages")
+        reader.close()
+
+    def test_no_corpus(self):
+        self.assertIsNone(open_corpus(os.path.join(self.temp_dir, 'missing')))
+
+
+class TestScraperCorpus(unittest.TestCase):
+    """Test the scraper keeps the corpus in step with the page store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.config = {'name': 'godot-corpus', 'base_url': BASE, 'start_urls': [BASE + 'signals/intro'],
+                       'categories': {'signals': ['signal'], 'physics': ['physics']},
+                       'rate_limit': 0, 'corpus_db': True}
+        self.site = {page['url']: dict(page, links=[p['url'] for p in PAGES]) for page in PAGES}
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_scrape_and_build(self):
+        converter = DocToSkillConverter(self.config)
+        converter.fetch_page = lambda url: self.site.get(url)
+        converter.scrape_all()
+
+        corpus = open_corpus(converter.data_dir)
+        self.assertEqual(sorted(corpus.urls()), sorted(page['url'] for page in converter.store.pages()))
+        corpus.close()
+
+        self.assertTrue(converter.build_skill())
+        with open(os.path.join(converter.skill_dir, 'references', 'signals.md'), encoding='utf-8') as f:
+            self.assertIn('Custom Signals', f.read())
+
+    def test_indexes_existing_pages(self):
+        """Test enabling the corpus on an existing scrape indexes the stored pages"""
+        converter = DocToSkillConverter(dict(self.config, corpus_db=False))
+        for page in PAGES:
+            converter.save_page(page)
+        converter.store.close()
+
+        converter = DocToSkillConverter(self.config)
+        self.assertEqual(len(converter.corpus), len(PAGES))
+
+    def test_router_keywords(self):
+        configs = []
+        for name in ('godot-corpus', 'godot-other'):
+            path = os.path.join(self.temp_dir, f'{name}.json')
+            with open(path, 'w') as f:
+                json.dump({'name': name, 'base_url': BASE}, f)
+            configs.append(path)
+        os.makedirs('output/godot-corpus_data')
+        corpus = CorpusDB('output/godot-corpus_data/corpus.sqlite')
+        corpus.rebuild(PAGES)
+        corpus.close()
+
+        routing = RouterGenerator(configs).extract_routing_keywords()
+        self.assertEqual(routing['godot-corpus'][:2], ['corpus', 'signals'])
+        self.assertEqual(routing['godot-other'], ['other'])
+
+
+if __name__ == '__main__':
+    unittest.main()
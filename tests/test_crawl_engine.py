@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test suite for the crawl engine
+Tests per-host throttling and the concurrent scrape loop
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.doc_scraper import DocToSkillConverter
+from cli.throttle import HostThrottle, AdaptiveThrottle, parse_retry_after
+from cli.http_client import HttpClient
+from tests.test_http_client import LocalSite, finishes
+from unittest.mock import Mock
+
+
+def make_site(num_pages):
+    """Build a fake site where every page links to the next two pages"""
+    base = 'https://docs.example.com/'
+    site = {}
+    for i in range(num_pages):
+        links = [f"{base}page{j}" for j in (2 * i + 1, 2 * i + 2) if j < num_pages]
+        site[f"{base}page{i}"] = links
+    return site
+
+
+class TestHostThrottle(unittest.TestCase):
+    """Test per-host politeness budget"""
+
+    def test_first_request_does_not_wait(self):
+        """Test that the first request to a host goes out immediately"""
+        throttle = HostThrottle(delay=1.0)
+        self.assertEqual(throttle.wait('https://a.example.com/x'), 0)
+
+    def test_same_host_is_spaced(self):
+        """Test that consecutive requests to one host are spaced by the delay"""
+        throttle = HostThrottle(delay=0.05)
+        start = time.monotonic()
+        for _ in range(3):
+            throttle.wait('https://a.example.com/x')
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_hosts_are_independent(self):
+        """Test that different hosts do not share a budget"""
+        throttle = HostThrottle(delay=1.0)
+        throttle.wait('https://a.example.com/x')
+        self.assertEqual(throttle.wait('https://b.example.com/x'), 0)
+
+
+class TestAdaptiveThrottle(unittest.TestCase):
+    """Test AIMD rate adjustment"""
+
+    URL = 'https://a.example.com/x'
+
+    def delay(self, throttle):
+        return throttle._hosts['a.example.com'].delay
+
+    def test_ramps_up_while_healthy(self):
+        """Test that healthy responses shrink the delay down to min_delay"""
+        throttle = AdaptiveThrottle(delay=0.5, min_delay=0.2, increase=1.0)
+        for _ in range(20):
+            throttle.record(self.URL, 200, 0.1)
+        self.assertAlmostEqual(self.delay(throttle), 0.2)
+
+    def test_backs_off_on_429(self):
+        """Test multiplicative decrease and Retry-After pause on 429"""
+        throttle = AdaptiveThrottle(delay=0.5)
+        throttle.record(self.URL, 429, 0.1, retry_after='0.05')
+        self.assertAlmostEqual(self.delay(throttle), 1.0)
+        self.assertIn('paused', throttle.describe(self.URL))
+        self.assertGreaterEqual(throttle.wait(self.URL), 0.04)
+
+    def test_backs_off_on_latency_spike(self):
+        """Test that latency far above the baseline slows the host"""
+        throttle = AdaptiveThrottle(delay=0.5)
+        for _ in range(5):
+            throttle.record(self.URL, 200, 0.1)
+        before = self.delay(throttle)
+        for _ in range(3):
+            throttle.record(self.URL, 200, 2.0)
+        self.assertGreater(self.delay(throttle), before)
+
+    def test_crawl_delay_is_a_floor(self):
+        """Test that ramping never beats robots.txt Crawl-delay"""
+        throttle = AdaptiveThrottle(delay=0.1, min_delay=0)
+        throttle.set_crawl_delay(self.URL, 1.5)
+        for _ in range(20):
+            throttle.record(self.URL, 200, 0.1)
+        self.assertEqual(self.delay(throttle), 1.5)
+
+    def test_parse_retry_after(self):
+        """Test delta-seconds and HTTP-date Retry-After values"""
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+class TestConcurrentScrape(unittest.TestCase):
+    """Test the thread-pool scrape loop"""
+
+    def setUp(self):
+        """Run each test in a scratch directory"""
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        """Restore working directory and remove scratch files"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_converter(self, num_pages, **overrides):
+        """Create a converter whose fetches are served from a fake site"""
+        config = {
+            'name': 'test-crawl',
+            'base_url': 'https://docs.example.com/',
+            'start_urls': ['https://docs.example.com/page0'],
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0,
+            'max_pages': 100,
+            'concurrency': 4
+        }
+        config.update(overrides)
+        converter = DocToSkillConverter(config)
+        site = make_site(num_pages)
+
+        def fake_fetch(url):
+            return {'url': url, 'title': url.rsplit('/', 1)[-1], 'content': '',
+                    'headings': [], 'code_samples': [], 'patterns': [],
+                    'links': site.get(url, [])}
+
+        converter.fetch_page = fake_fetch
+        return converter
+
+    def test_crawls_whole_site(self):
+        """Test that every reachable page is scraped once"""
+        converter = self.make_converter(25)
+        converter.scrape_all()
+
+        self.assertEqual(converter.pages_scraped, 25)
+        self.assertEqual(len({p['url'] for p in converter.pages}), 25)
+
+    def test_respects_max_pages(self):
+        """Test that the page budget holds with several workers in flight"""
+        converter = self.make_converter(50, max_pages=7)
+        converter.scrape_all()
+
+        self.assertEqual(len(converter.visited_urls), 7)
+        self.assertEqual(converter.pages_scraped, 7)
+
+    def test_retries_after_429(self):
+        """Test that a 429 page is retried after backing off instead of lost"""
+        converter = DocToSkillConverter({
+            'name': 'test-crawl',
+            'base_url': 'https://docs.example.com/',
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0
+        })
+        page_html = b'<h1>Hi</h1><article><p>x</p></article>'
+        converter.http_cache = None
+        converter.http = Mock()
+        converter.http.get.side_effect = [
+            Mock(status_code=404, headers={}),     # robots.txt
+            Mock(status_code=429, headers={'Retry-After': '0'}),
+            Mock(status_code=200, headers={}, raw=None, content=page_html, url=None),
+        ]
+
+        page = converter.fetch_page('https://docs.example.com/page0')
+
+        self.assertEqual(page['title'], 'Hi')
+        self.assertEqual(converter.http.get.call_count, 3)
+
+    def test_backoff_and_errors_release_connections(self):
+        """Test that 429 retries and 404s against a real server do not exhaust the pool"""
+        pages = {'/limited': (429, {'Retry-After': '0'}, b'slow down')}
+        with LocalSite(pages) as site:
+            converter = DocToSkillConverter({
+                'name': 'test-crawl',
+                'base_url': site.base_url,
+                'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+                'rate_limit': 0
+            })
+            converter.http_cache = None
+            converter.http = HttpClient(max_connections_per_host=2, retries=0)
+            urls = [site.base_url + 'limited'] + [site.base_url + f'gone{i}' for i in range(3)]
+            finishes(self, lambda: [converter.fetch_page(url) for url in urls])
+            converter.http.close()
+
+        self.assertEqual([status for path, status in site.requests if path == '/limited'],
+                         [429] * (converter.BACKOFF_RETRIES + 1))
+        self.assertEqual(converter.gone_urls, set(urls[1:]))
+
+    def test_checkpoint_requeues_in_flight_urls(self):
+        """Test that in-flight URLs are saved as pending, not visited"""
+        converter = self.make_converter(5, checkpoint={'enabled': True, 'interval': 1000})
+        converter.visited_urls = {'https://docs.example.com/page0', 'https://docs.example.com/page1'}
+        converter.in_flight_urls = {'https://docs.example.com/page1'}
+        converter.pending_urls.clear()
+        converter.save_checkpoint()
+
+        with open(converter.checkpoint_file) as f:
+            data = json.load(f)
+
+        self.assertEqual(data['visited_urls'], ['https://docs.example.com/page0'])
+        self.assertEqual(data['pending_urls'], ['https://docs.example.com/page1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
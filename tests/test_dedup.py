@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test suite for duplicate page detection
+Tests fingerprints, near-duplicate matching and alias handling in the crawl
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.dedup import DuplicateDetector, make_detector, simhash, hamming, normalize_text
+from cli.doc_scraper import DocToSkillConverter, validate_config
+from cli.page_store import PageStore
+
+
+BASE = 'https://docs.example.com/'
+
+TEXT = ' '.join(f"word{i % 37} token{i % 11} item{i}" for i in range(80))
+
+
+class TestDuplicateDetector(unittest.TestCase):
+    """Test fingerprints and lookups"""
+
+    def test_exact_duplicates(self):
+        """Test that layout-only differences map to the first URL"""
+        detector = DuplicateDetector()
+        self.assertIsNone(detector.check(BASE + 'stable/a', detector.signature('Hello  World\n')))
+        self.assertEqual(detector.check(BASE + 'latest/a', detector.signature('hello world')),
+                         BASE + 'stable/a')
+        # Seeing the first URL again is not a duplicate of itself
+        self.assertIsNone(detector.check(BASE + 'stable/a', detector.signature('hello world')))
+        self.assertIsNone(detector.signature('  \n '))
+
+    def test_near_duplicates(self):
+        """Test that a one-word edit matches only when near-duplicate mode is on"""
+        edited = TEXT.replace('item40', 'changed')
+        self.assertLessEqual(hamming(simhash(normalize_text(TEXT)), simhash(normalize_text(edited))), 3)
+
+        near = DuplicateDetector(near_duplicates=True, max_distance=3)
+        near.check(BASE + 'a', near.signature(TEXT))
+        self.assertEqual(near.check(BASE + 'print/a', near.signature(edited)), BASE + 'a')
+        self.assertIsNone(near.check(BASE + 'b', near.signature('something else entirely ' * 20)))
+
+        exact = DuplicateDetector()
+        exact.check(BASE + 'a', exact.signature(TEXT))
+        self.assertIsNone(exact.check(BASE + 'print/a', exact.signature(edited)))
+
+    def test_config(self):
+        """Test enabling, disabling and validating the dedup section"""
+        self.assertIsNone(make_detector({'dedup': {'enabled': False}}))
+        self.assertTrue(make_detector({'dedup': {'near_duplicates': True}}).near_duplicates)
+        errors, _ = validate_config({'name': 'x', 'base_url': BASE, 'dedup': {'max_distance': 64}})
+        self.assertTrue(any('max_distance' in e for e in errors))
+
+
+class TestDuplicateCrawl(unittest.TestCase):
+    """Test that aliases are fetched but not saved or expanded"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_alias_recorded_not_expanded(self):
+        """Test /latest/ copy of a /stable/ page is skipped with its links"""
+        self.scrape_site({})
+
+    def test_duplicates_not_extracted_or_cached(self):
+        """Test a duplicate skips extract_content and the blob cache alike"""
+        converter = self.scrape_site({'blob_cache': {'dir': os.path.join(self.temp_dir, 'cache')}})
+        self.assertEqual(converter.blob_cache.counts()['extracted'], 2)
+
+    def scrape_site(self, extra_config):
+        body = '<p>Install the package and import the widget module to begin.</p>'
+        site = {
+            BASE: f'<h1>Home</h1><article><a href="{BASE}stable/">s</a><a href="{BASE}latest/">l</a></article>',
+            BASE + 'stable/': f'<h1>Stable</h1><article>{body}</article>',
+            # Same text; the extra (icon) link adds no text but must not be followed
+            BASE + 'latest/': f'<h1>Latest</h1><article>{body}<a href="{BASE}only-from-latest"></a></article>',
+        }
+        config = {
+            'name': 'test-dedup',
+            'base_url': BASE,
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0,
+            'max_pages': 100
+        }
+        converter = DocToSkillConverter(dict(config, **extra_config))
+        converter.http_cache = None
+        converter.http = Mock()
+        converter.http.get.side_effect = lambda url, **kwargs: Mock(
+            url=url, status_code=200, headers={}, raw=None, content=site[url].encode())
+
+        with patch.object(converter, 'extract_content', wraps=converter.extract_content) as extract:
+            converter.scrape_all()
+
+        self.assertEqual(sorted(call.args[1] for call in extract.call_args_list), [BASE, BASE + 'stable/'])
+        self.assertEqual(sorted(p['url'] for p in converter.pages), [BASE, BASE + 'stable/'])
+        self.assertEqual(converter.duplicate_urls, {BASE + 'latest/': BASE + 'stable/'})
+        fetched = [call.args[0] for call in converter.http.get.call_args_list]
+        self.assertNotIn(BASE + 'only-from-latest', fetched)
+        self.assertEqual(len(PageStore('output/test-dedup_data/pages')), 2)
+
+        with open('output/test-dedup_data/summary.json') as f:
+            self.assertEqual(json.load(f)['duplicates'],
+                             [{'url': BASE + 'latest/', 'duplicate_of': BASE + 'stable/'}])
+        return converter
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test suite for the crawl frontier
+Tests dedup, priority ordering, checkpoint round-trips and estimator use
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.frontier import Frontier, make_priority, prefix_priority, COMPACT_MIN
+from cli.doc_scraper import DocToSkillConverter, validate_config
+from cli.estimate_pages import estimate_pages
+
+
+BASE = 'https://docs.example.com/'
+
+
+class TestFrontier(unittest.TestCase):
+    """Test queue and index behaviour"""
+
+    def test_fifo_and_dedup(self):
+        """Test FIFO order and that seen URLs are never queued again"""
+        frontier = Frontier([BASE + 'a', BASE + 'b', BASE + 'a'])
+        self.assertEqual(len(frontier), 2)
+
+        self.assertEqual(frontier.pop(), BASE + 'a')
+        self.assertNotIn(BASE + 'a', frontier)
+        self.assertFalse(frontier.add(BASE + 'a'))
+        self.assertTrue(frontier.seen(BASE + 'a'))
+        self.assertEqual(frontier.pop(), BASE + 'b')
+        self.assertFalse(frontier)
+
+    def test_depth_priority(self):
+        """Test shallow pages are crawled before deep ones"""
+        frontier = Frontier(priority=make_priority({'crawl_priority': 'depth'}))
+        frontier.add(BASE + 'deep', 3)
+        frontier.add(BASE + 'root')
+        frontier.add(BASE + 'mid', 1)
+
+        self.assertEqual([frontier.pop() for _ in range(3)],
+                         [BASE + 'root', BASE + 'mid', BASE + 'deep'])
+
+    def test_prefix_priority(self):
+        """Test URLs are ranked by the first matching prefix, ties FIFO"""
+        frontier = Frontier(priority=prefix_priority(['/api/', '/guide/']))
+        for path in ['blog/x', 'guide/1', 'api/1', 'guide/2']:
+            frontier.add(BASE + path)
+
+        self.assertEqual(list(frontier),
+                         [BASE + 'api/1', BASE + 'guide/1', BASE + 'guide/2', BASE + 'blog/x'])
+
+    def test_dump_and_load(self):
+        """Test pending URLs and depths survive a checkpoint round-trip"""
+        frontier = Frontier(priority=make_priority({'crawl_priority': 'depth'}))
+        frontier.add(BASE + 'a', 2)
+        frontier.add(BASE + 'b', 1)
+        urls, depths = frontier.dump()
+
+        restored = Frontier(priority=make_priority({'crawl_priority': 'depth'}))
+        restored.mark_seen([BASE + 'done'])
+        restored.load(urls, depths)
+
+        self.assertEqual(list(restored), [BASE + 'b', BASE + 'a'])
+        self.assertEqual(restored.depth(BASE + 'a'), 2)
+        self.assertFalse(restored.add(BASE + 'done'))
+
+    def test_invalid_priority(self):
+        """Test unknown crawl_priority values are rejected"""
+        with self.assertRaises(ValueError):
+            make_priority({'crawl_priority': 'random'})
+        errors, _ = validate_config({'name': 'test', 'base_url': BASE, 'crawl_priority': 'random'})
+        self.assertTrue(any('crawl_priority' in e for e in errors))
+
+
+class TestRelevancePriority(unittest.TestCase):
+    """Test best-first ordering"""
+
+    def setUp(self):
+        self.config = {
+            'categories': {'api': ['api', 'reference'], 'guides': ['tutorial']},
+            'url_patterns': {'include': [], 'exclude': []},
+            'crawl_priority': 'relevance'
+        }
+
+    def test_category_urls_first(self):
+        """Test URLs matching category keywords outrank the rest"""
+        frontier = Frontier(priority=make_priority(self.config))
+        for path in ['blog/post', 'about', 'api/widget', 'learn/tutorial-1']:
+            frontier.add(BASE + path)
+
+        self.assertEqual(set(list(frontier)[:2]), {BASE + 'api/widget', BASE + 'learn/tutorial-1'})
+
+    def test_inlinks_rerank_pending_urls(self):
+        """Test that a URL linked from many pages moves up the queue"""
+        frontier = Frontier(priority=make_priority(self.config))
+        frontier.add(BASE + 'a')
+        frontier.add(BASE + 'hub')
+        for _ in range(3):
+            frontier.add(BASE + 'hub')
+
+        self.assertEqual(len(frontier), 2)
+        self.assertEqual(frontier.pop(), BASE + 'hub')
+        self.assertEqual(frontier.pop(), BASE + 'a')
+        self.assertFalse(frontier)
+
+    def test_stale_entries_compacted(self):
+        """Test that re-ranking a URL many times does not grow the heap without bound"""
+        frontier = Frontier(priority=make_priority(self.config))
+        frontier.add(BASE + 'a')
+        frontier.add(BASE + 'hub')
+        for _ in range(5 * COMPACT_MIN):
+            frontier.add(BASE + 'hub')
+
+        self.assertLessEqual(len(frontier._queue), COMPACT_MIN + 4)
+        self.assertEqual(list(frontier), [BASE + 'hub', BASE + 'a'])
+        self.assertEqual(frontier.pop(), BASE + 'hub')
+        self.assertEqual(frontier.pop(), BASE + 'a')
+        self.assertFalse(frontier)
+
+    def test_capped_crawl_fills_categories(self):
+        """Test that max_pages goes to category pages under best-first"""
+        old_cwd = os.getcwd()
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        try:
+            links = [BASE + f'blog/{i}' for i in range(5)] + [BASE + 'api/a', BASE + 'api/b']
+            site = {BASE: links}
+            config = dict(self.config, name='test-relevance', base_url=BASE, max_pages=3,
+                          rate_limit=0, selectors={'main_content': 'article', 'title': 'h1'})
+            converter = DocToSkillConverter(config)
+            converter.fetch_page = lambda url: {
+                'url': url, 'title': url, 'content': '', 'headings': [],
+                'code_samples': [], 'patterns': [], 'links': site.get(url, [])}
+            converter.scrape_all()
+            # Pages are read back from the store, so check before it is deleted
+            self.assertEqual({p['url'] for p in converter.pages}, {BASE, BASE + 'api/a', BASE + 'api/b'})
+        finally:
+            os.chdir(old_cwd)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestFrontierIntegration(unittest.TestCase):
+    """Test the scraper and estimator on top of the frontier"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.config = {
+            'name': 'test-frontier',
+            'base_url': BASE,
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'checkpoint': {'enabled': True, 'interval': 1000},
+            'rate_limit': 0,
+            'max_pages': 100
+        }
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_checkpoint_resume_keeps_depths(self):
+        """Test that a resumed scrape continues with the saved frontier"""
+        converter = DocToSkillConverter(self.config)
+        converter.visited_urls.add(converter.pending_urls.pop())
+        converter.pending_urls.add(BASE + 'child', 1)
+        converter.save_checkpoint()
+
+        resumed = DocToSkillConverter(self.config, resume=True)
+        self.assertEqual(list(resumed.pending_urls), [BASE + 'child'])
+        self.assertEqual(resumed.pending_urls.depth(BASE + 'child'), 1)
+        self.assertFalse(resumed.pending_urls.add(BASE))
+
+    def test_estimator_visits_each_url_once(self):
+        """Test that duplicate links do not inflate the estimate"""
+        pages = {
+            BASE: f'<a href="{BASE}a">a</a><a href="{BASE}b">b</a><a href="{BASE}a">a</a>',
+            BASE + 'a': f'<a href="{BASE}b">b</a><a href="{BASE}">home</a>',
+            BASE + 'b': f'<a href="{BASE}a">a</a>',
+        }
+        client = Mock()
+        client.head.return_value = Mock(headers={'Content-Type': 'text/html'})
+        client.get.side_effect = lambda url, **kwargs: Mock(
+            status_code=200, headers={}, raw=None, content=pages[url].encode())
+
+        import cli.estimate_pages as estimator
+        original = estimator.get_client
+        estimator.get_client = lambda config: client
+        try:
+            results = estimate_pages(self.config)
+        finally:
+            estimator.get_client = original
+
+        self.assertEqual(results['discovered'], 3)
+        self.assertEqual(results['pending'], 0)
+        fetched = [call.args[0] for call in client.get.call_args_list]
+        self.assertEqual(len([url for url in fetched if not url.endswith('robots.txt')]), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test suite for the conditional-revalidation HTTP cache
+Tests validator storage, conditional requests and 304 reuse
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.http_cache import ResponseCache
+from cli.http_client import HttpClient, DEFAULT_LIMITS
+from tests.test_http_client import LocalSite, finishes
+
+
+def make_response(status, body=b'', headers=None):
+    """Build a requests.Response without touching the network"""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test conditional revalidation"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ResponseCache(os.path.join(self.temp_dir, 'http_cache.sqlite'))
+        self.client = Mock()
+        self.url = 'https://docs.example.com/page'
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_first_fetch_is_unconditional(self):
+        """Test that an uncached URL is fetched without validators"""
+        self.client.get.return_value = make_response(200, b'<html>v1</html>', {'ETag': '"v1"'})
+
+        response = self.cache.fetch(self.client, self.url, timeout=5)
+
+        headers = self.client.get.call_args.kwargs['headers']
+        self.assertNotIn('If-None-Match', headers)
+        self.assertFalse(response.from_cache)
+        self.assertEqual(self.cache.fetched, 1)
+
+    def test_refetch_sends_validators(self):
+        """Test that a cached URL is revalidated with ETag and Last-Modified"""
+        self.client.get.return_value = make_response(
+            200, b'<html>v1</html>',
+            {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+        )
+        self.cache.fetch(self.client, self.url)
+        self.cache.fetch(self.client, self.url)
+
+        headers = self.client.get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+
+    def test_304_reuses_cached_body(self):
+        """Test that Not Modified returns the stored body as a 200"""
+        self.client.get.return_value = make_response(
+            200, b'<html>v1</html>', {'ETag': '"v1"', 'Content-Type': 'text/html'}
+        )
+        self.cache.fetch(self.client, self.url)
+
+        self.client.get.return_value = make_response(304)
+        response = self.cache.fetch(self.client, self.url)
+
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'<html>v1</html>')
+        self.assertEqual(response.headers['Content-Type'], 'text/html')
+        self.assertEqual(self.cache.revalidated, 1)
+
+    def test_304_keeps_final_url(self):
+        """Test that a revalidated redirect comes back under its final URL"""
+        response = make_response(200, b'<html>v1</html>', {'ETag': '"v1"'})
+        response.url = self.url + '/'
+        self.client.get.return_value = response
+        self.cache.fetch(self.client, self.url)
+
+        self.client.get.return_value = make_response(304)
+        response = self.cache.fetch(self.client, self.url)
+
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.url, self.url + '/')
+
+    def test_many_304s_do_not_exhaust_pool(self):
+        """Test more revalidations than max_connections_per_host against a real server"""
+        client = HttpClient(max_connections_per_host=2, retries=0)
+        pages = {f'/page{i}': (200, {'ETag': f'"{i}"', 'Content-Type': 'text/html'}, b'<html>v1</html>')
+                 for i in range(6)}
+        responses = []
+
+        def work():
+            for path in pages:
+                self.cache.fetch(client, site.base_url + path[1:], limits=DEFAULT_LIMITS, timeout=5)
+            for path in pages:
+                responses.append(self.cache.fetch(client, site.base_url + path[1:], limits=DEFAULT_LIMITS, timeout=5))
+
+        with LocalSite(pages) as site:
+            finishes(self, work)
+            self.assertEqual([status for _, status in site.requests].count(304), 6)
+        client.close()
+        self.assertEqual([r.content for r in responses], [b'<html>v1</html>'] * 6)
+        self.assertEqual(self.cache.revalidated, 6)
+
+    def test_changed_page_replaces_entry(self):
+        """Test that a 200 on revalidation stores the new body"""
+        self.client.get.return_value = make_response(200, b'v1', {'ETag': '"v1"'})
+        self.cache.fetch(self.client, self.url)
+        self.client.get.return_value = make_response(200, b'v2', {'ETag': '"v2"'})
+        self.cache.fetch(self.client, self.url)
+
+        etag, _, _, body = self.cache.lookup(self.url)
+        self.assertEqual(etag, '"v2"')
+        self.assertEqual(body, b'v2')
+
+    def test_no_validators_not_stored(self):
+        """Test that responses without ETag/Last-Modified are not cached"""
+        self.client.get.return_value = make_response(200, b'v1')
+        self.cache.fetch(self.client, self.url)
+        self.assertIsNone(self.cache.lookup(self.url))
+
+    def test_errors_not_stored(self):
+        """Test that error responses are never cached"""
+        self.client.get.return_value = make_response(500, b'oops', {'ETag': '"x"'})
+        self.cache.fetch(self.client, self.url)
+        self.assertIsNone(self.cache.lookup(self.url))
+
+    def test_cache_persists(self):
+        """Test that entries survive reopening the cache file"""
+        self.client.get.return_value = make_response(200, b'v1', {'ETag': '"v1"'})
+        self.cache.fetch(self.client, self.url)
+        self.cache.close()
+
+        self.cache = ResponseCache(os.path.join(self.temp_dir, 'http_cache.sqlite'))
+        self.assertEqual(self.cache.lookup(self.url)[3], b'v1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared HTTP client
+Tests pooling, retry policy, compression negotiation and client sharing
+"""
+
+import io
+import sys
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.http_client import (HttpClient, get_client, http_options,
+                             guarded_get, ContentSkipped)
+
+
+class CountingStream(io.BytesIO):
+    """Body stream that remembers how much was read"""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def streamed_response(body, headers):
+    """A 200 response whose body is read from a stream, like stream=True"""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers)
+    response.raw = CountingStream(body)
+    return response
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Serve LocalSite pages over keep-alive HTTP/1.1"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status, headers, body = self.server.pages.get(self.path, (404, {}, b'not found'))
+        etag = headers.get('ETag')
+        if status == 200 and etag and self.headers.get('If-None-Match') == etag:
+            status, body = 304, b''
+        self.server.requests.append((self.path, status))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalSite:
+    """
+    Real HTTP server on localhost, for tests that need real pooled connections
+
+    pages maps a path to (status, headers, body); other paths are 404s, and a
+    200 with an ETag answers a matching If-None-Match with 304.
+    """
+
+    def __init__(self, pages=None):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _SiteHandler)
+        self.server.daemon_threads = True
+        self.server.pages = pages or {}
+        self.server.requests = []
+        self.requests = self.server.requests
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def finishes(test, work, timeout=10):
+    """Run work in a thread and fail the test if it is still blocked after timeout"""
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    test.assertFalse(thread.is_alive(), "requests blocked waiting for a pooled connection")
+
+
+class TestHttpClientSetup(unittest.TestCase):
+    """Test how the pooled session is configured"""
+
+    def setUp(self):
+        self.client = HttpClient(pool_size=4, max_connections_per_host=3, retries=2, backoff=0.1)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_pool_limits_per_host(self):
+        """Test that the adapter caps and blocks on per-host connections"""
+        adapter = self.client.session.get_adapter('https://docs.example.com/')
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertTrue(adapter._pool_block)
+
+    def test_retry_policy(self):
+        """Test retries on connection errors and 5xx for idempotent methods only"""
+        retry = self.client.session.get_adapter('https://docs.example.com/').max_retries
+        self.assertEqual(retry.total, 2)
+        self.assertIn(503, retry.status_forcelist)
+        self.assertNotIn(404, retry.status_forcelist)
+        self.assertGreater(retry.backoff_factor, 0)
+        methods = getattr(retry, 'allowed_methods', None) or retry.method_whitelist
+        self.assertIn('GET', methods)
+        self.assertNotIn('POST', methods)
+
+    def test_accepts_compressed_responses(self):
+        """Test that compressed transfer is negotiated"""
+        self.assertIn('gzip', self.client.session.headers['Accept-Encoding'])
+
+    def test_user_agent(self):
+        """Test that the scraper user agent is sent"""
+        self.assertIn('Documentation Scraper', self.client.session.headers['User-Agent'])
+
+    def test_http2_falls_back_without_httpx(self):
+        """Test that a missing httpx keeps the requests backend"""
+        with patch.dict(sys.modules, {'httpx': None}):
+            client = HttpClient(http2=True)
+        self.assertEqual(client.backend, 'requests')
+        client.close()
+
+
+class TestSharedClient(unittest.TestCase):
+    """Test client sharing across callers"""
+
+    def test_same_options_share_client(self):
+        """Test that configs with equal http options share one pool"""
+        a = get_client({'name': 'a'})
+        b = get_client({'name': 'b'})
+        self.assertIs(a, b)
+
+    def test_different_options_get_own_client(self):
+        """Test that different http options get a separate pool"""
+        a = get_client({'http': {'retries': 1}})
+        b = get_client({'http': {'retries': 5}})
+        self.assertIsNot(a, b)
+
+    def test_unknown_options_ignored(self):
+        """Test that unknown http keys do not reach the client"""
+        options = http_options({'http': {'retries': 1, 'bogus': True}})
+        self.assertEqual(options['retries'], 1)
+        self.assertNotIn('bogus', options)
+
+
+class TestGuardedGet(unittest.TestCase):
+    """Test the streaming content-type and size guard"""
+
+    def setUp(self):
+        self.client = Mock()
+        self.url = 'https://docs.example.com/file'
+        self.limits = {'max_bytes': 1000, 'content_types': ['text/html']}
+
+    def test_html_within_limit(self):
+        """Test that an acceptable page is read in full"""
+        self.client.get.return_value = streamed_response(b'<html>ok</html>', {'Content-Type': 'text/html; charset=utf-8'})
+        response = guarded_get(self.client, self.url, **self.limits)
+        self.assertEqual(response.content, b'<html>ok</html>')
+        self.assertTrue(self.client.get.call_args.kwargs['stream'])
+
+    def test_wrong_type_rejected_before_body(self):
+        """Test that non-HTML is abandoned without reading the body"""
+        response = streamed_response(b'%PDF' * 10, {'Content-Type': 'application/pdf'})
+        self.client.get.return_value = response
+        with self.assertRaises(ContentSkipped) as ctx:
+            guarded_get(self.client, self.url, **self.limits)
+        self.assertIn('application/pdf', ctx.exception.reason)
+        self.assertEqual(response.raw.bytes_read, 0)
+
+    def test_declared_length_rejected(self):
+        """Test that a Content-Length over the limit aborts immediately"""
+        self.client.get.return_value = streamed_response(b'', {'Content-Type': 'text/html', 'Content-Length': '5000'})
+        with self.assertRaises(ContentSkipped):
+            guarded_get(self.client, self.url, **self.limits)
+
+    def test_streamed_body_capped(self):
+        """Test that a body without Content-Length stops at the limit"""
+        self.client.get.return_value = streamed_response(b'x' * 100000, {'Content-Type': 'text/html'})
+        with self.assertRaises(ContentSkipped):
+            guarded_get(self.client, self.url, **self.limits)
+        self.assertLess(self.client.get.return_value.raw.bytes_read, 100000)
+
+    def test_scraper_reports_skipped(self):
+        """Test that the scraper records skipped URLs instead of parsing them"""
+        from cli.doc_scraper import DocToSkillConverter
+        converter = DocToSkillConverter({'name': 'test', 'base_url': 'https://docs.example.com/',
+                                         'rate_limit': 0}, dry_run=True)
+        converter.http = Mock()
+        converter.http.get.return_value = streamed_response(b'PK', {'Content-Type': 'application/zip'})
+
+        self.assertIsNone(converter.fetch_page(self.url))
+        self.assertIn(self.url, converter.skipped_urls)
+
+
+class TestPooledConnectionsReleased(unittest.TestCase):
+    """Test that non-200 responses give their connection back to the pool"""
+
+    def test_many_404s_do_not_exhaust_pool(self):
+        """Test more 404s than max_connections_per_host against a real server"""
+        client = HttpClient(max_connections_per_host=2, retries=0)
+        statuses = []
+
+        def work():
+            for i in range(6):
+                statuses.append(guarded_get(client, site.base_url + f'missing{i}', timeout=5).status_code)
+
+        with LocalSite() as site:
+            finishes(self, work)
+        client.close()
+        self.assertEqual(statuses, [404] * 6)
+
+
+class TestScraperUsesSharedClient(unittest.TestCase):
+    """Test that the scraper fetches through the shared client"""
+
+    def test_fetch_page_uses_client(self):
+        """Test that fetch_page goes through the pooled client"""
+        from cli.doc_scraper import DocToSkillConverter
+        config = {
+            'name': 'test',
+            'base_url': 'https://docs.example.com/',
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0
+        }
+        converter = DocToSkillConverter(config, dry_run=True)
+        response = Mock(status_code=200, headers={}, raw=None,
+                        content=b'<html><h1>Hi</h1><article><p>x</p></article></html>')
+        converter.http = Mock()
+        converter.http.get.return_value = response
+
+        page = converter.fetch_page('https://docs.example.com/page')
+
+        converter.http.get.assert_called_once()
+        self.assertEqual(page['title'], 'Hi')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test suite for incremental re-scrape and rebuild
+Tests the content-hash manifest and selective reference rebuilding
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.doc_scraper import DocToSkillConverter
+from cli.incremental import ScrapeManifest
+from cli.page_store import PageStore
+
+
+BASE = 'https://docs.example.com/'
+
+
+def make_page(url, content='', links=None):
+    """Build an extracted page dict"""
+    return {'url': url, 'title': url.rsplit('/', 1)[-1], 'content': content,
+            'headings': [], 'code_samples': [], 'patterns': [], 'links': links or []}
+
+
+class TestScrapeManifest(unittest.TestCase):
+    """Test change tracking in the manifest"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manifest = ScrapeManifest(os.path.join(self.temp_dir, 'manifest.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_record_statuses(self):
+        """Test added, unchanged and changed classification"""
+        page = make_page(BASE + 'a', 'one')
+        self.assertEqual(self.manifest.record(page), 'added')
+        self.manifest.mark_built({'other': [page['url']]})
+
+        self.assertEqual(self.manifest.record(page), 'unchanged')
+        self.assertEqual(self.manifest.record(make_page(BASE + 'a', 'two')), 'changed')
+
+    def test_fresh_needs_stored_page(self):
+        """Test that a matching lastmod only counts if the page is in the store"""
+        store = PageStore(os.path.join(self.temp_dir, 'pages'))
+        manifest = ScrapeManifest(self.manifest.path, store)
+        manifest.record(make_page(BASE + 'a'), '2024-01-01')
+        self.assertFalse(manifest.is_fresh(BASE + 'a', '2024-01-01'))
+
+        store.put(make_page(BASE + 'a'))
+        self.assertTrue(manifest.is_fresh(BASE + 'a', '2024-01-01'))
+        self.assertFalse(manifest.is_fresh(BASE + 'a', '2024-02-01'))
+        store.close()
+
+    def test_drop_missing(self):
+        """Test that unseen URLs are dropped and reported as removed"""
+        self.manifest.record(make_page(BASE + 'a'))
+        self.manifest.record(make_page(BASE + 'b'))
+
+        dropped = self.manifest.drop_missing({BASE + 'a'})
+
+        self.assertEqual(dropped, [BASE + 'b'])
+        self.assertIn(BASE + 'b', self.manifest.removed)
+        self.assertNotIn(BASE + 'b', self.manifest.entries)
+
+    def test_affected_categories(self):
+        """Test that only categories touched by changes are affected"""
+        a, b = make_page(BASE + 'a', 'one'), make_page(BASE + 'b', 'one')
+        self.manifest.record(a)
+        self.manifest.record(b)
+        categories = {'api': [a['url']], 'guides': [b['url']]}
+        self.manifest.mark_built(categories)
+
+        self.manifest.record(make_page(BASE + 'a', 'two'))
+        self.assertEqual(self.manifest.affected_categories(categories), {'api'})
+
+    def test_new_category_set_forces_full_build(self):
+        """Test that a changed category list rebuilds everything"""
+        a = make_page(BASE + 'a')
+        self.manifest.record(a)
+        self.manifest.mark_built({'api': [a['url']]})
+        self.assertIsNone(self.manifest.affected_categories({'api': [a['url']], 'new': [a['url']]}))
+
+    def test_persistence(self):
+        """Test that entries and pending changes survive a reload"""
+        self.manifest.record(make_page(BASE + 'a'))
+        self.manifest.save()
+
+        reloaded = ScrapeManifest(self.manifest.path)
+        self.assertIn(BASE + 'a', reloaded.entries)
+        self.assertIn(BASE + 'a', reloaded.added)
+
+
+class TestIncrementalScrape(unittest.TestCase):
+    """Test incremental scrape and build end to end with a fake site"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.config = {
+            'name': 'test-incremental',
+            'base_url': BASE,
+            'start_urls': [BASE + 'index'],
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'categories': {'api': ['api'], 'guides': ['guide']},
+            'rate_limit': 0,
+            'max_pages': 100
+        }
+        self.site = {
+            BASE + 'index': make_page(BASE + 'index', 'home', [BASE + 'api-a', BASE + 'guide-a']),
+            BASE + 'api-a': make_page(BASE + 'api-a', 'api v1'),
+            BASE + 'guide-a': make_page(BASE + 'guide-a', 'guide v1'),
+        }
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_scrape(self, incremental):
+        """Scrape and build the fake site, returning the converter"""
+        converter = DocToSkillConverter(self.config, incremental=incremental)
+        converter.fetch_page = lambda url: self.site.get(url)
+        converter.scrape_all()
+        with patch.object(converter, 'create_reference_file',
+                          wraps=converter.create_reference_file) as create:
+            converter.build_skill(incremental=incremental)
+            converter.built = sorted(call.args[0] for call in create.call_args_list)
+        return converter
+
+    def test_only_changed_category_rebuilt(self):
+        """Test that a change in one page rebuilds only its category"""
+        first = self.run_scrape(incremental=False)
+        self.assertEqual(first.built, ['api', 'guides', 'other'])
+
+        self.site[BASE + 'api-a'] = make_page(BASE + 'api-a', 'api v2')
+        second = self.run_scrape(incremental=True)
+
+        self.assertEqual(second.built, ['api'])
+        self.assertEqual(second.change_counts['changed'], 1)
+        self.assertEqual(second.change_counts['unchanged'], 2)
+
+    def test_disappeared_page_dropped(self):
+        """Test that a page no longer linked is removed from the data"""
+        self.run_scrape(incremental=False)
+
+        self.site[BASE + 'index'] = make_page(BASE + 'index', 'home', [BASE + 'api-a'])
+        del self.site[BASE + 'guide-a']
+        second = self.run_scrape(incremental=True)
+
+        urls = {p['url'] for p in second.load_scraped_data()}
+        self.assertNotIn(BASE + 'guide-a', urls)
+        self.assertFalse(os.path.exists(f"output/{self.config['name']}/references/guides.md"))
+
+    def test_fresh_lastmod_skips_fetch(self):
+        """Test that an unchanged sitemap lastmod reuses the stored page"""
+        first = DocToSkillConverter(self.config)
+        first.lastmod = {BASE + 'api-a': '2024-01-01'}
+        first.fetch_page = lambda url: self.site.get(url)
+        first.scrape_all()
+
+        second = DocToSkillConverter(self.config, incremental=True)
+        second.lastmod = {BASE + 'api-a': '2024-01-01'}
+        fetched = []
+        second.fetch_page = lambda url: fetched.append(url) or self.site.get(url)
+        second.scrape_all()
+
+        self.assertNotIn(BASE + 'api-a', fetched)
+        self.assertIn(BASE + 'api-a', {p['url'] for p in second.pages})
+
+
+if __name__ == '__main__':
+    unittest.main()
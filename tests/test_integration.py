@@ -225,7 +225,7 @@ class TestURLProcessing(unittest.TestCase):
 
         # Should have base_url in pending_urls
         self.assertEqual(len(converter.pending_urls), 1)
-        self.assertEqual(converter.pending_urls[0], 'https://example.com/')
+        self.assertEqual(converter.pending_urls.peek(), 'https://example.com/')
 
     def test_multiple_start_urls(self):
         """Test multiple start URLs"""
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test suite for the code language classifier
+Tests the shipped model, batch scoring and build-time classification
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.lang_classifier import (LanguageClassifier, get_classifier, train, features,
+                                 MIN_CONFIDENCE)
+from cli.doc_scraper import DocToSkillConverter
+
+
+# Not in training/lang_samples
+SNIPPETS = {
+    'python': 'from typing import List\n\ndef total(values: List[int]) -> int:\n    return sum(values)',
+    'javascript': 'const list = document.querySelectorAll("li");\nlist.forEach((item) => item.remove());',
+    'rust': 'fn main() {\n    let mut v = Vec::new();\n    v.push(1);\n    println!("{:?}", v);\n}',
+    'go': 'package main\n\nimport "fmt"\n\nfunc main() {\n\tfmt.Println("hi")\n}',
+    'sql': 'SELECT name, COUNT(*) FROM orders GROUP BY name ORDER BY 2 DESC;',
+    'gdscript': 'extends Node2D\n\nfunc _process(delta):\n    position.x += speed * delta',
+    'json': '{"name": "widget", "tags": ["a", "b"], "size": 3}',
+    'yaml': 'services:\n  web:\n    image: nginx:latest\n    ports:\n      - "8080:80"',
+}
+
+
+class TestLanguageClassifier(unittest.TestCase):
+    """Test the shipped model"""
+
+    def test_snippets(self):
+        classifier = get_classifier()
+        for language, code in SNIPPETS.items():
+            with self.subTest(language=language):
+                guess, confidence = classifier.classify(code)
+                self.assertEqual(guess, language)
+                self.assertGreaterEqual(confidence, MIN_CONFIDENCE)
+
+    def test_batch_matches_single(self):
+        """Test batch results, in order, with repeats served from the cache"""
+        classifier = get_classifier()
+        codes = list(SNIPPETS.values()) * 3
+        self.assertEqual(classifier.classify_batch(codes), [classifier.classify(code) for code in codes])
+
+    def test_unknown(self):
+        """Test prose and unseen tokens stay unknown"""
+        classifier = get_classifier()
+        self.assertEqual(classifier.classify('some random text without clear indicators')[0], 'unknown')
+        self.assertEqual(classifier.classify('§§§ ¶¶¶'), ('unknown', 0.0))
+
+    def test_short_snippets(self):
+        """Test one-liners the model is unsure of fall back to the keyword rules"""
+        classifier = get_classifier()
+        for code, language in (('const myVar = 10;', 'javascript'), ('let a = 1;', 'javascript'),
+                               ('print("hi")', 'unknown'), ('#include <stdio.h>', 'cpp'),
+                               ('SELECT 1;', 'sql')):
+            with self.subTest(code=code):
+                self.assertEqual(classifier.classify(code)[0], language)
+
+    def test_dialects(self):
+        """Test typescript and C++ specific syntax wins over the plainer language"""
+        classifier = get_classifier()
+        self.assertEqual(classifier.classify('let count: number = 0;\ninterface A { b: string }')[0], 'typescript')
+        self.assertEqual(classifier.classify('std::vector<int> v;\nv.push_back(1);')[0], 'cpp')
+
+
+class TestTraining(unittest.TestCase):
+    """Test a model trained from a tiny corpus"""
+
+    def test_train_and_load(self):
+        snippets = {
+            'python': ['def f(x):\n    return x', 'import os\nprint(os.sep)', 'def g():\n    pass'] * 2,
+            'ruby': ['def f(x)\n  x\nend', 'puts "hi"\nputs 1', 'require "json"\nputs 2'] * 2,
+        }
+        model = train(snippets, min_samples=1)
+        self.assertEqual(model['languages'], ['python', 'ruby'])
+        self.assertIn('<snake>', features('my_var = 1'))
+
+        # Survives a JSON round trip, as shipped
+        classifier = LanguageClassifier(json.loads(json.dumps(model)))
+        self.assertEqual(classifier.classify('def h():\n    return 1')[0], 'python')
+        self.assertEqual(classifier.classify('puts "x"\nend')[0], 'ruby')
+
+    def test_superset_family(self):
+        """Test code that reads equally as javascript and typescript is javascript"""
+        shared = ['const a = 1;', 'let b = a + 2;', 'console.log(b);'] * 2
+        model = train({'javascript': shared, 'typescript': shared, 'python': ['x = 1', 'print(x)'] * 3},
+                      min_samples=1)
+        language, confidence = LanguageClassifier(model).classify('const b = a;\nconsole.log(b);')
+        self.assertEqual(language, 'javascript')
+        self.assertGreater(confidence, 0.9)
+
+
+class TestBuildClassification(unittest.TestCase):
+    """Test code samples are classified in one batch at build time"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_classify_code(self):
+        converter = DocToSkillConverter({'name': 'langs', 'base_url': 'https://example.com/'}, dry_run=True)
+        pages = [{'code_samples': [
+            {'code': SNIPPETS['rust'], 'language': 'unknown'},
+            {'code': SNIPPETS['go'], 'language': 'go'},
+        ]}, {'code_samples': [{'code': SNIPPETS['sql'], 'language': 'unknown'}]}, {}]
+
+        self.assertEqual(converter.classify_code(pages), 2)
+        first, hinted = pages[0]['code_samples']
+        self.assertEqual(first['language'], 'rust')
+        self.assertGreater(first['language_confidence'], MIN_CONFIDENCE)
+        self.assertNotIn('language_confidence', hinted)
+        self.assertEqual(pages[1]['code_samples'][0]['language'], 'sql')
+
+        # Already classified samples are left alone
+        self.assertEqual(converter.classify_code(pages), 0)
+
+    def test_build_skill(self):
+        """Test the built references carry the classified language"""
+        config = {'name': 'langs', 'base_url': 'https://example.com/'}
+        converter = DocToSkillConverter(config, dry_run=False)
+        page = {'url': 'https://example.com/a', 'title': 'Queries', 'content': 'Reporting queries.',
+                'headings': [], 'links': [], 'patterns': [],
+                'code_samples': [{'code': SNIPPETS['sql'], 'language': 'unknown'}]}
+        converter.save_page(page)
+
+        self.assertTrue(converter.build_skill())
+        references = ''.join(path.read_text(encoding='utf-8')
+                             for path in Path(converter.skill_dir, 'references').glob('*.md'))
+        self.assertIn('```sql', references)
+
+
+if __name__ == '__main__':
+    unittest.main()
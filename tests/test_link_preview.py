@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test suite for the link-graph preview
+Tests selector matching, streaming link extraction and dry-run seeding
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.link_preview import (LinkExtractor, parse_simple_selector, fetch_links, load_discovered,
+                              discovered_path)
+from cli.batch_scrape import BatchScheduler
+from cli.doc_scraper import DocToSkillConverter
+import cli.estimate_pages as estimator
+from tests.test_http_client import streamed_response, LocalSite, finishes
+from cli.http_client import HttpClient
+
+
+BASE = 'https://docs.example.com/'
+
+
+def extract(html, selector):
+    parser = LinkExtractor(selector)
+    parser.feed(html)
+    parser.close()
+    return parser.hrefs
+
+
+class TestLinkExtractor(unittest.TestCase):
+    """Test href harvesting with the tokenizer"""
+
+    def test_simple_selectors(self):
+        """Test which selectors can be matched on one tag"""
+        self.assertEqual(parse_simple_selector('div[role="main"]'), [('div', {'role': 'main'}, set())])
+        self.assertEqual(parse_simple_selector('article.doc#body, main'),
+                         [('article', {'id': 'body'}, {'doc'}), ('main', {}, set())])
+        self.assertIsNone(parse_simple_selector('div.content > article'))
+        self.assertIsNone(parse_simple_selector('div:first-child'))
+
+    def test_links_inside_main_only(self):
+        """Test nav links are ignored once the main region is found"""
+        html = ('<nav><a href="/nav">n</a></nav>'
+                '<div role="main"><div><a href="/a">a</a></div><br><a href="/b">b</a></div>'
+                '<div role="main"><a href="/second-main">x</a></div>'
+                '<footer><a href="/footer">f</a></footer>')
+        self.assertEqual(extract(html, 'div[role="main"]'), ['/a', '/b'])
+
+    def test_fallback_to_whole_page(self):
+        """Test all links are used when the region is missing or unsupported"""
+        html = '<a href="/a">a</a><section><a href="/b">b</a></section>'
+        self.assertEqual(extract(html, 'article'), ['/a', '/b'])
+        self.assertEqual(extract(html, 'body section'), ['/a', '/b'])
+
+    def test_stops_reading_after_main(self):
+        """Test the download is abandoned once the main region closes"""
+        body = b'<article><a href="/a">a</a></article>' + b'<p>footer</p>' * 50000
+        response = streamed_response(body, {'Content-Type': 'text/html; charset=utf-8'})
+        client = Mock()
+        client.get.return_value = response
+
+        _, hrefs = fetch_links(client, BASE, 'article')
+
+        self.assertEqual(hrefs, ['/a'])
+        self.assertLess(response.raw.bytes_read, len(body) // 4)
+
+
+class TestDryRunSeeding(unittest.TestCase):
+    """Test that a dry run's URLs seed the next scrape"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.config = {
+            'name': 'test-preview',
+            'base_url': BASE,
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0,
+            'max_pages': 100
+        }
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_dry_run_saves_and_scrape_reuses(self):
+        """Test the real scrape starts from every URL the preview found"""
+        links = ''.join(f'<a href="page{i}">p</a>' for i in range(30))
+        site = {BASE: f'<nav><a href="nav-only">n</a></nav><article>{links}</article>'}
+
+        def get(url, **kwargs):
+            if url.endswith('robots.txt'):
+                return Mock(status_code=404, headers={}, raw=None, content=b'')
+            return Mock(url=url, status_code=200, headers={}, raw=None,
+                        content=site.get(url, '<article></article>').encode())
+
+        preview = DocToSkillConverter(self.config, dry_run=True)
+        preview.http = Mock()
+        preview.http.get.side_effect = get
+        preview.scrape_all()
+
+        saved = [url for url, _ in load_discovered('test-preview')]
+        self.assertEqual(len(saved), 31)
+        self.assertNotIn(BASE + 'nav-only', saved)
+
+        fetched = []
+        scraper = DocToSkillConverter(self.config)
+
+        def fake_fetch(url):
+            fetched.append(url)
+            return {'url': url, 'title': url, 'content': '', 'headings': [],
+                    'code_samples': [], 'patterns': [], 'links': []}
+        scraper.fetch_page = fake_fetch
+        scraper.scrape_all()
+
+        # The start page links nowhere here, yet all previewed URLs are scraped
+        self.assertEqual(sorted(fetched), sorted(saved))
+        # ...once: the preview is consumed
+        self.assertFalse(os.path.exists(discovered_path('test-preview')))
+
+    def write_preview(self, urls, saved_at=None, base_url=BASE):
+        path = discovered_path('test-preview')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(saved_at)),
+                       'base_url': base_url, 'urls': urls, 'depths': [1] * len(urls)}, f)
+
+    def test_stale_preview_ignored(self):
+        """Test an old preview, or one for another base_url, seeds nothing"""
+        self.write_preview([BASE + 'a'], saved_at=time.time() - 30 * 24 * 3600)
+        self.assertEqual(load_discovered('test-preview', BASE), [])
+        self.write_preview([BASE + 'a'], base_url='https://other.example.com/')
+        self.assertEqual(load_discovered('test-preview', BASE), [])
+        self.write_preview([BASE + 'a'])
+        self.assertEqual(load_discovered('test-preview', BASE), [(BASE + 'a', 1)])
+
+    def test_batch_scrape_seeds_from_preview(self):
+        """Test batch_scrape consumes a preview like scrape_all does"""
+        self.write_preview([BASE + 'a', BASE + 'b'])
+        fetched = []
+        scraper = DocToSkillConverter(self.config)
+
+        def fake_fetch(url):
+            fetched.append(url)
+            return {'url': url, 'title': url, 'content': '', 'headings': [],
+                    'code_samples': [], 'patterns': [], 'links': []}
+        scraper.fetch_page = fake_fetch
+        BatchScheduler([scraper]).run()
+
+        self.assertEqual(sorted(fetched), [BASE, BASE + 'a', BASE + 'b'])
+        self.assertFalse(os.path.exists(discovered_path('test-preview')))
+
+    def test_estimator_uses_default_main_content(self):
+        """Test the estimator follows only main-region links, like the scraper, without selectors"""
+        config = {'name': 'test-preview', 'base_url': BASE, 'rate_limit': 0}
+        pages = {BASE: '<nav><a href="nav-only">n</a></nav><div role="main"><a href="a">a</a></div>',
+                 BASE + 'a': '<div role="main"></div>'}
+        client = Mock()
+        client.get.side_effect = lambda url, **kwargs: Mock(
+            url=url, status_code=200 if url in pages else 404, headers={}, raw=None,
+            content=pages.get(url, '').encode())
+
+        original = estimator.get_client
+        estimator.get_client = lambda config: client
+        try:
+            results = estimator.estimate_pages(config)
+        finally:
+            estimator.get_client = original
+
+        self.assertEqual(results['discovered'], 2)
+        self.assertEqual(results['pending'], 0)
+
+    def test_broken_links_release_connections(self):
+        """Test a preview past more broken links than the pool holds, against a real server"""
+        links = ''.join(f'<a href="gone{i}">g</a>' for i in range(6))
+        pages = {'/': (200, {'Content-Type': 'text/html'}, f'<article>{links}</article>'.encode())}
+        with LocalSite(pages) as site:
+            config = dict(self.config, base_url=site.base_url)
+            preview = DocToSkillConverter(config, dry_run=True)
+            preview.http = HttpClient(max_connections_per_host=2, retries=0)
+            finishes(self, preview.scrape_all)
+            preview.http.close()
+
+        self.assertEqual(sorted(path for path, status in site.requests if status == 404),
+                         [f'/gone{i}' for i in range(6)])
+
+    def test_errors_do_not_stop_preview(self):
+        """Test failing pages are counted and skipped"""
+        preview = DocToSkillConverter(self.config, dry_run=True)
+        preview.http = Mock()
+        preview.http.get.side_effect = requests.ConnectionError("down")
+        preview.scrape_all()
+        self.assertEqual(preview.visited_urls, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
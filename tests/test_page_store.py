@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Test suite for the page store
+Tests lookup, streaming, tombstones, compaction, crash recovery, multiple
+writers, migration from the one-file-per-page layout and a build whose
+memory does not grow with the number of pages
+"""
+
+import sys
+import os
+import io
+import contextlib
+import gzip
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.page_store import PageStore, StoredPages, ENTRY
+from cli.doc_scraper import DocToSkillConverter
+
+
+BASE = 'https://docs.example.com/'
+
+
+def make_page(name, content=''):
+    return {'url': BASE + name, 'title': name.title(), 'content': content or f'About {name}',
+            'headings': [], 'code_samples': [], 'patterns': [], 'links': []}
+
+
+class TestPageStore(unittest.TestCase):
+    """Test a single writer's store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = PageStore(self.temp_dir)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def reopen(self, **kwargs):
+        self.store.close()
+        self.store = PageStore(self.temp_dir, **kwargs)
+        return self.store
+
+    def test_put_get(self):
+        pages = [make_page(f'p{i}') for i in range(20)]
+        for page in pages:
+            self.assertTrue(self.store.put(page))
+
+        store = self.reopen()
+        self.assertEqual(len(store), 20)
+        self.assertEqual(store.get(BASE + 'p7'), pages[7])
+        self.assertIsNone(store.get(BASE + 'missing'))
+        self.assertIn(BASE + 'p3', store)
+        # Streamed in write order
+        self.assertEqual(list(store.pages()), pages)
+
+    def test_replace_and_unchanged(self):
+        """Test the newest version wins, including under a new title"""
+        self.store.put(make_page('a', 'one'))
+        self.assertFalse(self.store.put(make_page('a', 'one')))
+        renamed = dict(make_page('a', 'two'), title='Renamed')
+        self.assertTrue(self.store.put(renamed))
+
+        store = self.reopen()
+        self.assertEqual(list(store.pages()), [renamed])
+
+    def test_stored_pages(self):
+        """Test the URL-only list reads pages in its own order, across shards"""
+        pages = [make_page(f'p{i}', 'x' * 500) for i in range(6)]
+        store = self.reopen(shard_bytes=400)
+        for page in pages:
+            store.put(page)
+
+        view = StoredPages(store, [BASE + 'p4', BASE + 'p0', BASE + 'missing', BASE + 'p5'])
+        self.assertEqual(len(view), 4)
+        self.assertEqual(list(view), [pages[4], pages[0], pages[5]])
+        self.assertEqual(view[:2], [pages[4], pages[0]])
+        self.assertEqual(view[1], pages[0])
+
+        view = StoredPages(store)
+        view.append(pages[2])
+        self.assertEqual(view, [pages[2]])
+        self.assertFalse(StoredPages(store))
+
+    def test_shards_stream_with_zcat(self):
+        """Test a shard is a plain gzip stream of JSON lines"""
+        self.store.put(make_page('a'))
+        self.store.put(make_page('b'))
+        self.store.close()
+
+        with gzip.open(os.path.join(self.temp_dir, 'pages-00001.jsonl.gz'), 'rt', encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['url'] for line in f], [BASE + 'a', BASE + 'b'])
+
+    def test_rolls_shards(self):
+        store = self.reopen(shard_bytes=200)
+        for i in range(5):
+            store.put(make_page(f'p{i}', 'x' * 50))
+        store = self.reopen(shard_bytes=200)
+        self.assertGreater(len([f for f in os.listdir(self.temp_dir) if f.endswith('.jsonl.gz')]), 1)
+        self.assertEqual([p['url'] for p in store.pages()], [BASE + f'p{i}' for i in range(5)])
+        # Appending after a reopen continues the last shard series
+        store.put(make_page('p5'))
+        self.assertEqual(len(self.reopen()), 6)
+
+    def test_tombstones(self):
+        self.store.put(make_page('a'))
+        self.store.put(make_page('b'))
+        self.assertTrue(self.store.delete(BASE + 'a'))
+        self.assertFalse(self.store.delete(BASE + 'a'))
+
+        store = self.reopen()
+        self.assertNotIn(BASE + 'a', store)
+        self.assertEqual([p['url'] for p in store.pages()], [BASE + 'b'])
+
+        # Re-adding after a delete brings the page back
+        store.put(make_page('a'))
+        self.assertIn(BASE + 'a', self.reopen())
+
+    def test_compact(self):
+        for i in range(10):
+            self.store.put(make_page(f'p{i}', 'old ' * 50))
+        for i in range(5):
+            self.store.put(make_page(f'p{i}', 'new ' * 50))
+        self.store.delete(BASE + 'p9')
+        expected = {p['url']: p for p in self.store.pages()}
+
+        reclaimed = self.store.compact()
+        self.assertGreater(reclaimed, 0)
+        self.assertEqual(self.store.total_bytes, self.store.live_bytes)
+
+        store = self.reopen()
+        self.assertEqual({p['url']: p for p in store.pages()}, expected)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['pages-00002.jsonl.gz', 'pages.idx'])
+        store.put(make_page('p9'))
+        self.assertEqual(len(self.reopen()), 10)
+
+    def test_compact_if_needed(self):
+        self.store.put(make_page('a'))
+        self.assertEqual(self.store.compact_if_needed(), 0)
+
+    def test_truncated_index_entry(self):
+        """Test a half-written index entry (a crash) is ignored and overwritten"""
+        self.store.put(make_page('a'))
+        self.store.put(make_page('b'))
+        self.store.close()
+        index = os.path.join(self.temp_dir, 'pages.idx')
+        with open(index, 'r+b') as f:
+            f.truncate(ENTRY.size + 7)
+
+        store = self.reopen()
+        self.assertEqual([p['url'] for p in store.pages()], [BASE + 'a'])
+        store.put(make_page('c'))
+        self.assertEqual(os.path.getsize(index), 2 * ENTRY.size)
+        self.assertEqual(len(self.reopen()), 2)
+
+    def test_multiple_writers(self):
+        """Test worker indexes merge, newest write per URL winning"""
+        worker = PageStore(self.temp_dir, writer='pages.host-1')
+        self.store.put(make_page('a', 'coordinator'))
+        time.sleep(0.01)
+        worker.put(make_page('a', 'worker'))
+        worker.put(make_page('b'))
+        worker.close()
+
+        self.store.load()
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get(BASE + 'a')['content'], 'worker')
+
+        # Compaction folds the worker's files into this writer's
+        self.store.compact()
+        self.assertFalse(any(name.startswith('pages.host-1') for name in os.listdir(self.temp_dir)))
+        self.assertEqual(self.reopen().get(BASE + 'a')['content'], 'worker')
+
+    def test_clear(self):
+        self.store.put(make_page('a'))
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_migrate_legacy(self):
+        """Test old page files move into the store, the newest file per URL winning"""
+        old = dict(make_page('a', 'old title'), title='Old')
+        new = make_page('a', 'new title')
+        for index, (name, page) in enumerate([('Old_abc.json', old), ('A_abc.json', new),
+                                              ('B_def.json', make_page('b'))]):
+            path = os.path.join(self.temp_dir, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(page, f, indent=2)
+            os.utime(path, (1000 + index, 1000 + index))
+        with open(os.path.join(self.temp_dir, 'broken.json'), 'w') as f:
+            f.write('{')
+
+        self.assertEqual(self.store.migrate_legacy(), 3)
+        store = self.reopen()
+        self.assertEqual(store.get(BASE + 'a'), new)
+        self.assertEqual(len(store), 2)
+        self.assertEqual([f for f in os.listdir(self.temp_dir) if f.endswith('.json')], ['broken.json'])
+
+
+class TestScraperStore(unittest.TestCase):
+    """Test the scraper reads and writes pages through the store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_migrates_on_open(self):
+        os.makedirs('output/legacy_data/pages')
+        with open('output/legacy_data/pages/A_123.json', 'w', encoding='utf-8') as f:
+            json.dump(make_page('a'), f, indent=2)
+
+        converter = DocToSkillConverter({'name': 'legacy', 'base_url': BASE})
+        self.assertEqual(converter.load_scraped_data(), [make_page('a')])
+        self.assertFalse(os.path.exists('output/legacy_data/pages/A_123.json'))
+
+        converter.save_page(dict(make_page('a'), title='Renamed'))
+        self.assertEqual([p['title'] for p in converter.load_scraped_data()], ['Renamed'])
+
+    def build_peak(self, count):
+        """Peak memory (bytes) of building a skill from count stored pages"""
+        config = {'name': f'bounded-{count}', 'base_url': BASE,
+                  'categories': {'api': ['api'], 'guides': ['guide']}}
+        converter = DocToSkillConverter(config)
+        for i in range(count):
+            converter.save_page(dict(
+                make_page(f"{('api', 'guide', 'misc')[i % 3]}/p{i}", f'word{i} ' * 1000),
+                code_samples=[{'code': f'value = {i}\n' * 20, 'language': 'unknown'}]))
+        converter.store.close()
+
+        converter = DocToSkillConverter(config)
+        converter.BUILD_BATCH = 20
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(converter.build_skill())
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_build_memory_is_bounded(self):
+        """Test build_skill streams pages: 4x the pages must not mean 4x the memory"""
+        # Load the code classifier outside the measurement
+        self.build_peak(10)
+        small, large = self.build_peak(100), self.build_peak(400)
+        page_bytes = 400 * len('word399 ' * 1000)
+        self.assertLess(large, small * 1.5)
+        self.assertLess(large, page_bytes / 4)
+
+        with open('output/bounded-400/references/api.md', encoding='utf-8') as f:
+            self.assertEqual(f.read().count('\n## '), 134)
+
+
+if __name__ == '__main__':
+    unittest.main()
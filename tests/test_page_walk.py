@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test suite for the single-pass main content walk
+Compares PageWalk with the per-kind find_all/select/get_text calls it replaces
+"""
+
+import sys
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.page_walk import PageWalk
+
+
+HEADINGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+PAGE = '''
+<html><body>
+<div class="document"><div role="main">
+  <h1>Title <code>api</code><!-- hidden --></h1>
+  <div class="section">
+    <p><b>Example</b>: keyword split across tags &amp; entities</p>
+    <div class="highlight"><pre><code class="language-python">print("hello world")</code></pre></div>
+    <script>var usage = "usage: not text";</script>
+    <div><div><p>Typical use
+    spans a line break</p></div></div>
+    <pre>int main() { return 0; }</pre>
+    <h2 id="usage">Usage:</h2>
+    <p>Pattern: the code for this one is outside main</p>
+    <a href="one.html">one</a><a name="anchor">no href</a><a href="">empty</a>
+  </div>
+</div></div>
+<pre>after main</pre>
+</body></html>
+'''
+
+
+def multi_pass(main, code_selector):
+    """What extract_content computed before the single pass"""
+    patterns = []
+    for elem in main.find_all(['p', 'div']):
+        if any(word in elem.get_text().lower() for word in ['example:', 'pattern:', 'usage:', 'typical use']):
+            next_code = elem.find_next(['pre', 'code'])
+            if next_code:
+                patterns.append((elem.get_text(), next_code))
+    return {
+        'headings': [(h, h.get_text()) for h in main.find_all(HEADINGS)],
+        'code_blocks': [(c, c.get_text()) for c in main.select(code_selector)],
+        'paragraphs': [p.get_text() for p in main.find_all('p')],
+        'hrefs': [a['href'] for a in main.find_all('a', href=True)],
+        'patterns': patterns[:5],
+    }
+
+
+def single_pass(main, code_selector):
+    walk = PageWalk(main, code_selector)
+    return {
+        'headings': walk.headings,
+        'code_blocks': walk.code_blocks,
+        'paragraphs': walk.paragraphs,
+        'hrefs': walk.hrefs,
+        'patterns': walk.pattern_candidates(limit=5),
+    }
+
+
+def identities(items):
+    """Compare elements by identity, not by equal markup"""
+    return [tuple(id(x) if not isinstance(x, str) else x for x in item) if isinstance(item, tuple) else item
+            for item in items]
+
+
+class TestPageWalk(unittest.TestCase):
+    """Test the walk returns what the separate passes did"""
+
+    def assert_same(self, html, main_selector, code_selector):
+        main = BeautifulSoup(html, 'html.parser').select_one(main_selector)
+        expected = multi_pass(main, code_selector)
+        actual = single_pass(main, code_selector)
+        for key in expected:
+            self.assertEqual(identities(actual[key]), identities(expected[key]), key)
+        return actual
+
+    def test_page(self):
+        """Test keywords across tags, scripts, comments and code after main"""
+        actual = self.assert_same(PAGE, 'div[role="main"]', 'pre')
+        self.assertEqual(len(actual['patterns']), 5)
+
+        main = BeautifulSoup(PAGE, 'html.parser').select_one('div[role="main"]')
+        last_text, last_code = PageWalk(main, 'pre').pattern_candidates()[-1]
+        self.assertIn('outside main', last_text)
+        self.assertEqual(last_code.get_text(), 'after main')
+
+    def test_code_selectors(self):
+        """Test nested, contextual and :scope code selectors"""
+        for selector in ('pre code', 'pre, code', 'div.highlight pre', 'div[role="main"] code',
+                         ':scope > div > pre', 'code.language-python'):
+            with self.subTest(selector=selector):
+                self.assert_same(PAGE, 'div[role="main"]', selector)
+
+    def test_deep_nesting(self):
+        """Test deep markup matches, and deeper still is walked without recursion"""
+        def nested(depth):
+            return ('<article>' + '<div><p>Example: level text here</p>' * depth
+                    + '<pre>x = 1</pre>' + '</div>' * depth + '</article>')
+
+        self.assert_same(nested(200), 'article', 'pre')
+
+        main = BeautifulSoup(nested(3000), 'html.parser').select_one('article')
+        walk = PageWalk(main, 'pre')
+        self.assertEqual(len(walk.paragraphs), 3000)
+        self.assertEqual(len(walk.pattern_candidates(limit=5)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
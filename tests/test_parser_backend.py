@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test suite for HTML parser backends
+Parity tests: extract_content must give the same title, headings, code
+samples and links whichever backend built the tree
+"""
+
+import sys
+import os
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.parser_backend import (make_soup, resolve_backend, backend_available, find_element,
+                                partial_markup, PARSER_BACKENDS)
+from cli.doc_scraper import DocToSkillConverter, validate_config
+
+
+BASE = 'https://docs.example.com/'
+
+FIXTURES = {
+    'sphinx': ({'main_content': 'div[role="main"]', 'title': 'title', 'code_blocks': 'pre'}, '''
+<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Widgets &mdash; Example 2.0</title>
+<script>var nav = "<a href='/not-a-link'>";</script></head>
+<body>
+<nav class="sidebar"><a href="/guide/">Guide</a><a href="/api/">API</a></nav>
+<div class="document"><div role="main" class="body">
+  <h1 id="widgets">Widgets<a class="headerlink" href="#widgets">¶</a></h1>
+  <p>Widgets are the building blocks of every example application &amp; tool.</p>
+  <h2 id="usage">Usage</h2>
+  <p>Example: create a widget and attach it to the window like this.</p>
+  <div class="highlight-python"><pre class="language-python"><code>from example import Widget
+w = Widget(size=3)
+window.attach(w)</code></pre></div>
+  <h3>Options &lt;advanced&gt;</h3>
+  <ul><li><a href="options.html#size">size</a></li><li><a href="../api/widget.html?highlight=x">API</a></li></ul>
+  <pre><code class="lang-javascript">const w = new Widget({size: 3});
+w.render();</code></pre>
+  <table><tr><td><a href="/guide/tables">tables</a></td></tr></table>
+</div></div>
+<footer><a href="/about">About</a></footer>
+</body></html>
+'''),
+    'nested_selector': ({'main_content': 'div.content > article', 'title': 'h1', 'code_blocks': 'pre code'}, '''
+<html><body>
+<article><h1>Decoy</h1><a href="/decoy">decoy</a></article>
+<div class="content"><article>
+  <h1>Real Title</h1>
+  <h2>Section</h2>
+  <p>This paragraph is long enough to be kept as content text.</p>
+  <pre><code class="language-gdscript">func _ready():
+    var x = 1</code></pre>
+  <a href="/real">real</a>
+</article></div>
+</body></html>
+'''),
+    'sloppy_markup': ({'main_content': 'main', 'title': 'title', 'code_blocks': 'pre'}, '''
+<html><head><title>Sloppy</title></head><body>
+<main>
+<h2>Unclosed paragraphs</h2>
+<p>First paragraph without a closing tag that is long enough
+<p>Second paragraph, also without a closing tag, long enough
+<h3>Code</h3>
+<pre>int main() {
+  return 0;
+}</pre>
+<a href=relative/path>unquoted</a>
+<a href="/b">b</a>
+</main>
+</body></html>
+'''),
+    'decoys': ({'main_content': '#content.body', 'title': 'h1', 'code_blocks': 'pre'}, '''
+<html><head><title>Decoys</title>
+<script>document.write('<div id="content" class="body"><h1>Script</h1></div>');</script>
+<style>div[id="content"] > h1 { color: red }</style></head>
+<BODY><!-- <div id="content" class="body"><h1>Comment</h1></div> -->
+<div id="content" class="sidebar"><h1>Wrong class</h1></div>
+<DIV data-note="a > b" CLASS="body wide" ID="content">
+  <h1>Real &amp; Only</h1>
+  <div class="section"><div class="inner"><p>Nested divs of the same tag name are balanced.</p></div></div>
+  <pre>echo "&lt;/div&gt;" and more text</pre>
+  <a href="../up.html">up</a>
+</DIV>
+<div class="footer"><a href="/footer">footer</a></div>
+</BODY></html>
+'''),
+}
+
+PARITY_FIELDS = ('title', 'headings', 'code_samples', 'links')
+
+
+def extract(backend, selectors, html, partial=False):
+    config = {'name': 'parity', 'base_url': BASE, 'selectors': selectors, 'parser': backend,
+              'partial_parse': partial}
+    converter = DocToSkillConverter(config, dry_run=True)
+    return converter.extract_content(converter.make_soup(html.encode('utf-8')), BASE + 'guide/widgets.html')
+
+
+class TestParserParity(unittest.TestCase):
+    """Compare each installed backend with html.parser"""
+
+    def check_backend(self, backend):
+        for name, (selectors, html) in FIXTURES.items():
+            with self.subTest(fixture=name):
+                expected = extract('html.parser', selectors, html)
+                actual = extract(backend, selectors, html)
+                self.assertTrue(expected['title'] and expected['headings'] and expected['links'])
+                for field in PARITY_FIELDS:
+                    self.assertEqual(actual[field], expected[field], field)
+
+    @unittest.skipUnless(backend_available('lxml'), "lxml not installed")
+    def test_lxml_parity(self):
+        self.check_backend('lxml')
+
+    @unittest.skipUnless(backend_available('selectolax'), "selectolax not installed")
+    def test_selectolax_parity(self):
+        self.check_backend('selectolax')
+
+    @unittest.skipUnless(backend_available('selectolax'), "selectolax not installed")
+    def test_selectolax_keeps_only_title_and_main(self):
+        """Test the fast path hands BeautifulSoup the two elements it needs"""
+        selectors, html = FIXTURES['sphinx']
+        soup = make_soup(html, 'selectolax', selectors)
+        self.assertIsNone(soup.select_one('nav'))
+        self.assertIsNotNone(soup.select_one(selectors['main_content']))
+
+
+class TestPartialParse(unittest.TestCase):
+    """Test parsing only the title and main content"""
+
+    def check_partial(self, backend):
+        for name, (selectors, html) in FIXTURES.items():
+            with self.subTest(fixture=name):
+                expected = extract(backend, selectors, html)
+                actual = extract(backend, selectors, html, partial=True)
+                for field in PARITY_FIELDS + ('content',):
+                    self.assertEqual(actual[field], expected[field], field)
+
+    def test_html_parser_parity(self):
+        self.check_partial('html.parser')
+
+    @unittest.skipUnless(backend_available('lxml'), "lxml not installed")
+    def test_lxml_parity(self):
+        self.check_partial('lxml')
+
+    def test_scan_skips_scripts_and_comments(self):
+        """Test the pre-scan finds the real element, not decoys"""
+        selectors, html = FIXTURES['decoys']
+        markup = partial_markup(html, selectors)
+        # The first h1 (the title selector) precedes main, so it is kept too
+        self.assertTrue(markup.startswith('<h1>Wrong class</h1><DIV data-note'))
+        self.assertTrue(markup.endswith('</DIV>'))
+        self.assertNotIn('footer', markup)
+
+        soup = make_soup(html.encode('utf-8'), 'html.parser', selectors, partial=True)
+        self.assertEqual(len(soup.find_all('h1')), 2)
+        self.assertIsNone(soup.find('style'))
+
+    def test_falls_back_to_full_parse(self):
+        """Test complex selectors and unclosed elements parse the whole page"""
+        self.assertIsNone(find_element('<div class="content"><article>x</article></div>',
+                                       'div.content > article'))
+        self.assertIsNone(find_element('<main><div>never closed</div>', 'main'))
+        self.assertIsNone(partial_markup('<p>no main</p>', {'main_content': 'article'}))
+
+
+class TestBackendSelection(unittest.TestCase):
+    """Test config validation and fallbacks"""
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            resolve_backend('html5lib')
+        errors, _ = validate_config({'name': 'x', 'base_url': BASE, 'parser': 'fast'})
+        self.assertTrue(any('parser' in e for e in errors))
+
+    def test_missing_backend_falls_back(self):
+        """Test a backend that is not installed degrades to html.parser"""
+        import cli.parser_backend as parser_backend
+        original = parser_backend.backend_available
+        parser_backend.backend_available = lambda name: name == 'html.parser'
+        try:
+            self.assertEqual(resolve_backend('selectolax'), 'html.parser')
+        finally:
+            parser_backend.backend_available = original
+        self.assertEqual(resolve_backend(None), 'html.parser')
+        self.assertIn('lxml', PARSER_BACKENDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test suite for the fetch -> extract -> write pipeline
+Tests that process-pool extraction matches the in-thread scrape and that
+downloads are held back while the extraction queue is full
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.doc_scraper import DocToSkillConverter, validate_config, extract_processes
+from cli.page_store import PageStore
+
+
+BASE = 'https://docs.example.com/'
+TEXT = 'This paragraph is long enough to survive content extraction.'
+
+
+def make_site(num_pages):
+    """Pages link to the next two pages; page3 repeats page1, so 7, 8 and below are never reached"""
+    site = {}
+    for i in range(num_pages):
+        links = ''.join(f'<a href="{BASE}page{j}">p{j}</a>' for j in (2 * i + 1, 2 * i + 2) if j < num_pages)
+        site[f"{BASE}page{i}"] = f'<h1>Page {i}</h1><article><p>{TEXT} {i}</p><pre><code>x = {i}</code></pre>{links}</article>'
+    site[BASE + 'page3'] = site[BASE + 'page1'].replace('<h1>Page 1', '<h1>Page 3')
+    return site
+
+
+class TestPipelineScrape(unittest.TestCase):
+    """Test scraping with extraction processes"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.site = make_site(20)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def scrape(self, name, **options):
+        config = dict({
+            'name': name,
+            'base_url': BASE,
+            'start_urls': [BASE + 'page0'],
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0,
+            'max_pages': 100
+        }, **options)
+        converter = DocToSkillConverter(config)
+        converter.http_cache = None
+        converter.http = Mock()
+        converter.http.get.side_effect = self.get
+        return converter
+
+    def get(self, url, **kwargs):
+        if url not in self.site:
+            return Mock(url=url, status_code=404, headers={}, raw=None, content=b'')
+        return Mock(url=url, status_code=200, headers={}, raw=None, content=self.site[url].encode())
+
+    def test_matches_in_thread_scrape(self):
+        """Test the pipeline saves the same pages, duplicates and summary"""
+        serial = self.scrape('serial')
+        serial.scrape_all()
+        piped = self.scrape('piped', concurrency=3, extract_processes=2)
+        piped.scrape_all()
+
+        by_url = lambda pages: sorted(pages, key=lambda p: p['url'])
+        self.assertEqual(by_url(piped.pages), by_url(serial.pages))
+        self.assertEqual(len(piped.pages), 13)
+        self.assertEqual(len(piped.duplicate_urls), 1)
+        self.assertEqual(piped.in_flight_urls, set())
+        self.assertEqual(len(PageStore('output/piped_data/pages')), 13)
+        with open('output/piped_data/summary.json') as f:
+            self.assertEqual(len(json.load(f)['pages']), 13)
+
+    def test_duplicates_not_extracted(self):
+        """Test extraction processes skip extract_content for duplicates"""
+        cache = os.path.join(self.temp_dir, 'cache')
+        piped = self.scrape('piped-dedup', concurrency=3, extract_processes=2, blob_cache={'dir': cache})
+        piped.scrape_all()
+
+        self.assertEqual(piped.duplicate_urls, {BASE + 'page3': BASE + 'page1'})
+        # Workers cache each extraction they run: page3 was never extracted
+        self.assertEqual(piped.blob_cache.counts()['extracted'], 13)
+
+    def test_backpressure(self):
+        """Test downloads stop while the extraction queue is full"""
+        converter = self.scrape('bounded', concurrency=4, extract_processes=1)
+        held = {'now': 0, 'max': 0}
+        download, finish_fetch = converter.download, converter.finish_fetch
+
+        def counting_download(url):
+            fetched = download(url)
+            if fetched:
+                held['now'] += 1
+                held['max'] = max(held['max'], held['now'])
+            return fetched
+
+        def counting_finish(url, page):
+            if page:
+                held['now'] -= 1
+            finish_fetch(url, page)
+
+        converter.download = counting_download
+        converter.finish_fetch = counting_finish
+        converter.scrape_all()
+
+        self.assertEqual(len(converter.visited_urls), 14)
+        queue_size = converter.EXTRACT_QUEUE_PER_PROCESS
+        self.assertLessEqual(held['max'], queue_size + converter.concurrency)
+
+    def test_extraction_errors_skip_page(self):
+        """Test a page whose extraction fails is skipped, not fatal"""
+        # urljoin rejects the malformed IPv6 host while links are extracted
+        self.site[BASE + 'page0'] = self.site[BASE + 'page0'].replace('</article>', '<a href="http://[broken">x</a></article>')
+        converter = self.scrape('broken', extract_processes=1)
+        converter.scrape_all()
+        self.assertEqual(converter.pages, [])
+        self.assertEqual(converter.in_flight_urls, set())
+
+
+class TestPipelineConfig(unittest.TestCase):
+    """Test extract_processes parsing and validation"""
+
+    def test_values(self):
+        self.assertEqual(extract_processes({}), 0)
+        self.assertEqual(extract_processes({'extract_processes': 3}), 3)
+        self.assertGreaterEqual(extract_processes({'extract_processes': 'auto'}), 1)
+
+        for bad in (-1, 'many'):
+            errors, _ = validate_config({'name': 'x', 'base_url': BASE, 'extract_processes': bad})
+            self.assertTrue(any('extract_processes' in e for e in errors))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared frontier (SQLite and Redis backends)
+Tests leases, crash recovery, sharding, the page budget and worker crawls
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+import types
+import unittest
+from fnmatch import fnmatchcase
+from unittest.mock import Mock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.shared_frontier import (SqliteFrontier, RedisFrontier, open_frontier, shard_of, NUM_SHARDS,
+                                 CLAIM_SCRIPT, REQUEUE_SCRIPT)
+from cli.dedup import DuplicateDetector
+from tests.test_dedup import TEXT
+from cli.doc_scraper import DocToSkillConverter, run_worker_process
+
+
+BASE = 'https://docs.example.com/'
+
+
+def check_duplicates(test, frontier, other):
+    """Shared checks of a frontier backend's check_duplicate"""
+    detector = DuplicateDetector(near_duplicates=True)
+    page = detector.signature(TEXT)
+    near = detector.signature(TEXT.replace('item40', 'changed'))
+    exact_only = DuplicateDetector().signature('another page entirely')
+
+    test.assertIsNone(frontier.check_duplicate(BASE + 'a', page))
+    test.assertIsNone(frontier.check_duplicate(BASE + 'a', page))  # refetch of the same URL
+    test.assertEqual(other.check_duplicate(BASE + 'b', page), BASE + 'a')
+    test.assertEqual(other.check_duplicate(BASE + 'c', near), BASE + 'a')
+    test.assertIsNone(other.check_duplicate(BASE + 'd', exact_only))
+    test.assertIsNone(other.check_duplicate(BASE + 'e', None))
+    test.assertEqual(frontier.duplicates(), {BASE + 'b': BASE + 'a', BASE + 'c': BASE + 'a'})
+
+    frontier.reset()
+    test.assertEqual(frontier.duplicates(), {})
+    test.assertIsNone(other.check_duplicate(BASE + 'b', page))
+
+
+class TestSqliteFrontier(unittest.TestCase):
+    """Test claims and leases"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'frontier.sqlite')
+        self.frontier = SqliteFrontier(self.path)
+
+    def tearDown(self):
+        self.frontier.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_add_dedups(self):
+        """Test that a URL is queued once"""
+        self.assertTrue(self.frontier.add(BASE + 'a'))
+        self.assertFalse(self.frontier.add(BASE + 'a'))
+        self.assertEqual(self.frontier.add_many([(BASE + 'a', 0), (BASE + 'b', 1)]), 1)
+        self.assertEqual(self.frontier.counts()['pending'], 2)
+
+    def test_claims_are_exclusive(self):
+        """Test that two workers never lease the same URL"""
+        self.frontier.add_many((BASE + str(i), 0) for i in range(4))
+        other = open_frontier(f"sqlite:///{self.path}")
+
+        first = self.frontier.claim('w1', limit=2)
+        second = other.claim('w2', limit=10)
+        other.close()
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(set(first) & set(second))
+
+    def test_expired_lease_is_requeued(self):
+        """Test that a crashed worker's URLs go back to the queue"""
+        frontier = SqliteFrontier(self.path, lease_seconds=0.01)
+        frontier.add(BASE + 'a')
+        self.assertEqual(frontier.claim('crashed'), [(BASE + 'a', 0)])
+        time.sleep(0.02)
+
+        self.assertEqual(frontier.claim('w2'), [(BASE + 'a', 0)])
+        frontier.complete(BASE + 'a', 'crashed')  # stale owner: ignored
+        self.assertEqual(frontier.counts()['leased'], 1)
+        frontier.complete(BASE + 'a', 'w2')
+        self.assertEqual(frontier.counts()['done'], 1)
+        frontier.close()
+
+    def test_own_shards_first(self):
+        """Test that a worker prefers URLs hashed to its shards"""
+        urls = [BASE + str(i) for i in range(40)]
+        self.frontier.add_many((url, 0) for url in urls)
+        mine = [url for url in urls if shard_of(url) % 2 == 1]
+
+        claimed = [url for url, _ in self.frontier.claim('w1', worker_index=1, num_workers=2, limit=len(mine))]
+        self.assertEqual(sorted(claimed), sorted(mine))
+        self.assertEqual(len(self.frontier.claim('w1', 1, 2, limit=100)), 40 - len(mine))
+        self.assertLess(max(shard_of(url) for url in urls), NUM_SHARDS)
+
+    def test_duplicate_index_is_shared(self):
+        """Test that duplicates are found across frontier connections"""
+        other = open_frontier(f"sqlite:///{self.path}")
+        check_duplicates(self, self.frontier, other)
+        other.close()
+
+    def test_duplicate_check_from_fetch_thread(self):
+        """Test that fetch threads can check duplicates while the worker thread uses the frontier"""
+        signature = DuplicateDetector().signature(TEXT)
+        self.assertIsNone(self.frontier.check_duplicate(BASE + 'a', signature))
+        found = []
+        thread = threading.Thread(target=lambda: found.append(self.frontier.check_duplicate(BASE + 'b', signature)))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(found, [BASE + 'a'])
+        self.assertEqual(self.frontier.duplicates(), {BASE + 'b': BASE + 'a'})
+
+    def test_budget(self):
+        """Test that claims stop at max_pages across workers"""
+        self.frontier.add_many((BASE + str(i), 0) for i in range(10))
+        self.assertEqual(len(self.frontier.claim('w1', limit=4, budget=6)), 4)
+        self.assertEqual(len(self.frontier.claim('w2', limit=4, budget=6)), 2)
+        self.assertEqual(self.frontier.claim('w3', limit=4, budget=6), [])
+
+
+def _b(value):
+    """Redis keeps members, fields and values as bytes"""
+    return value if isinstance(value, bytes) else str(value).encode('utf-8')
+
+
+class StubPipeline:
+    """Queues StubRedis calls until execute(), like a redis-py pipeline"""
+
+    def __init__(self, server):
+        self.server = server
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        results = [getattr(self.server, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+        self.calls = []
+        return results
+
+
+class StubRedis:
+    """
+    In-memory stand-in for the redis-py calls RedisFrontier makes
+
+    Registered scripts run as Python versions of CLAIM_SCRIPT and
+    REQUEUE_SCRIPT, step for step, so the frontier's keys, arguments and
+    reply parsing are exercised without a server.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def register_script(self, script):
+        run = {CLAIM_SCRIPT: self._claim_script, REQUEUE_SCRIPT: self._requeue_script}[script]
+        return lambda keys, args: run(keys, args)
+
+    def _claim_script(self, keys, args):
+        queue, leases, owners, seen = keys
+        expiry, worker, limit = args
+        claimed = []
+        for _ in range(int(limit)):
+            k = self.lpop(queue)
+            if k is None:
+                break
+            self.zadd(leases, {k: expiry})
+            self.hset(owners, k, worker)
+            entry = self.hget(seen, k)
+            if entry is not None:
+                claimed.append(entry)
+        return claimed
+
+    def _requeue_script(self, keys, args):
+        leases, owners, queue = keys
+        if self.zrem(leases, args[0]) == 1:
+            self.hdel(owners, args[0])
+            self.lpush(queue, args[0])
+            return 1
+        return 0
+
+    def pipeline(self):
+        return StubPipeline(self)
+
+    def hsetnx(self, name, key, value):
+        hash_ = self.data.setdefault(name, {})
+        if _b(key) in hash_:
+            return 0
+        hash_[_b(key)] = _b(value)
+        return 1
+
+    def hset(self, name, key, value):
+        self.data.setdefault(name, {})[_b(key)] = _b(value)
+
+    def hget(self, name, key):
+        return self.data.get(name, {}).get(_b(key))
+
+    def hdel(self, name, key):
+        return int(self.data.get(name, {}).pop(_b(key), None) is not None)
+
+    def hgetall(self, name):
+        return dict(self.data.get(name, {}))
+
+    def rpush(self, name, value):
+        self.data.setdefault(name, []).append(_b(value))
+
+    def lpush(self, name, value):
+        self.data.setdefault(name, []).insert(0, _b(value))
+
+    def lpop(self, name):
+        values = self.data.get(name)
+        return values.pop(0) if values else None
+
+    def lrange(self, name, start, end):
+        values = self.data.get(name, [])
+        return list(values[start:None if end == -1 else end + 1])
+
+    def llen(self, name):
+        return len(self.data.get(name, []))
+
+    def zadd(self, name, mapping, xx=False):
+        zset = self.data.setdefault(name, {})
+        for member, score in mapping.items():
+            if not xx or _b(member) in zset:
+                zset[_b(member)] = float(score)
+
+    def zrem(self, name, member):
+        return int(self.data.get(name, {}).pop(_b(member), None) is not None)
+
+    def zrangebyscore(self, name, low, high):
+        zset = self.data.get(name, {})
+        return sorted((m for m, score in zset.items() if score <= float(high)), key=zset.get)
+
+    def zcard(self, name):
+        return len(self.data.get(name, {}))
+
+    def get(self, name):
+        value = self.data.get(name)
+        return None if value is None else _b(value)
+
+    def incr(self, name):
+        self.data[name] = int(self.data.get(name, 0)) + 1
+
+    def scan_iter(self, match):
+        return [_b(name) for name in list(self.data) if fnmatchcase(name, match)]
+
+    def delete(self, name):
+        self.data.pop(name.decode('utf-8') if isinstance(name, bytes) else name, None)
+
+    def close(self):
+        pass
+
+
+def fakeredis_server():
+    """A fakeredis server that can run Lua scripts, or None"""
+    try:
+        import fakeredis
+        import lupa  # noqa: F401 - fakeredis runs EVAL through lupa
+    except ImportError:
+        return None
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+
+class TestRedisFrontier(unittest.TestCase):
+    """Test claims, leases and requeues of the Redis frontier against a stub server"""
+
+    def make_server(self):
+        return StubRedis()
+
+    def setUp(self):
+        self.server = self.make_server()
+
+    def open(self, lease_seconds=60):
+        """A RedisFrontier on self.server, as another worker process would open it"""
+        redis_module = types.SimpleNamespace(Redis=types.SimpleNamespace(from_url=lambda url: self.server))
+        with patch.dict(sys.modules, {'redis': redis_module}):
+            return open_frontier('redis://localhost:6379/0', lease_seconds=lease_seconds)
+
+    def test_opens_redis_backend(self):
+        """Test that a redis:// spec opens a RedisFrontier"""
+        self.assertIsInstance(self.open(), RedisFrontier)
+
+    def test_add_dedups(self):
+        """Test that a URL is queued once"""
+        frontier = self.open()
+        self.assertTrue(frontier.add(BASE + 'a'))
+        self.assertFalse(frontier.add(BASE + 'a'))
+        self.assertEqual(frontier.add_many([(BASE + 'a', 0), (BASE + 'b', 1)]), 1)
+        self.assertEqual(frontier.counts()['pending'], 2)
+
+    def test_claims_are_exclusive(self):
+        """Test that two workers never lease the same URL"""
+        frontier, other = self.open(), self.open()
+        frontier.add_many((BASE + str(i), i) for i in range(4))
+
+        first = frontier.claim('w1', limit=2)
+        second = other.claim('w2', limit=10)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(sorted(first + second), [(BASE + str(i), i) for i in range(4)])
+        self.assertEqual(frontier.counts(), {'pending': 0, 'leased': 4, 'done': 0, 'failed': 0})
+
+    def test_expired_lease_is_requeued(self):
+        """Test that a crashed worker's URLs go back to the queue"""
+        frontier = self.open(lease_seconds=0.01)
+        frontier.add(BASE + 'a', 2)
+        self.assertEqual(frontier.claim('crashed'), [(BASE + 'a', 2)])
+        time.sleep(0.02)
+
+        self.assertEqual(frontier.claim('w2'), [(BASE + 'a', 2)])
+        frontier.complete(BASE + 'a', 'crashed')  # stale owner: ignored
+        self.assertEqual(frontier.counts()['leased'], 1)
+        frontier.complete(BASE + 'a', 'w2')
+        self.assertEqual(frontier.counts(), {'pending': 0, 'leased': 0, 'done': 1, 'failed': 0})
+
+    def test_renewed_lease_is_kept(self):
+        """Test that renewing keeps a live worker's URLs from being requeued"""
+        frontier = self.open(lease_seconds=0.05)
+        frontier.add(BASE + 'a')
+        frontier.claim('w1')
+        time.sleep(0.03)
+        frontier.renew('w1')
+        time.sleep(0.03)
+
+        self.assertEqual(frontier.claim('w2'), [])
+        frontier.complete(BASE + 'a', 'w1', ok=False)
+        self.assertEqual(frontier.counts(), {'pending': 0, 'leased': 0, 'done': 0, 'failed': 1})
+
+    def test_own_shards_first(self):
+        """Test that a worker prefers URLs hashed to its shards"""
+        frontier = self.open()
+        urls = [BASE + str(i) for i in range(40)]
+        frontier.add_many((url, 0) for url in urls)
+        mine = [url for url in urls if shard_of(url) % 2 == 1]
+
+        claimed = [url for url, _ in frontier.claim('w1', worker_index=1, num_workers=2, limit=len(mine))]
+        self.assertEqual(sorted(claimed), sorted(mine))
+        self.assertEqual(len(frontier.claim('w1', 1, 2, limit=100)), 40 - len(mine))
+
+    def test_budget(self):
+        """Test that claims stop at max_pages across workers, counting finished URLs"""
+        frontier = self.open()
+        frontier.add_many((BASE + str(i), 0) for i in range(10))
+        first = frontier.claim('w1', limit=4, budget=6)
+        self.assertEqual(len(first), 4)
+        for url, _ in first:
+            frontier.complete(url, 'w1')
+        self.assertEqual(len(frontier.claim('w2', limit=4, budget=6)), 2)
+        self.assertEqual(frontier.claim('w3', limit=4, budget=6), [])
+
+    def test_done_urls_not_queued(self):
+        """Test that add_many(done=True) marks URLs seen without queueing them"""
+        frontier = self.open()
+        self.assertEqual(frontier.add_many([(BASE + 'a', 0)], done=True), 1)
+        self.assertFalse(frontier.add(BASE + 'a'))
+        self.assertEqual(frontier.claim('w1', limit=10), [])
+
+    def test_duplicate_index_is_shared(self):
+        """Test that duplicates are found across frontier connections"""
+        check_duplicates(self, self.open(), self.open())
+
+    def test_reset(self):
+        """Test that reset clears every key under the prefix"""
+        frontier = self.open()
+        frontier.add_many((BASE + str(i), 0) for i in range(3))
+        frontier.claim('w1')
+        frontier.reset()
+        self.assertEqual(frontier.counts(), {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0})
+        self.assertTrue(frontier.add(BASE + '0'))
+
+
+@unittest.skipUnless(fakeredis_server(), "fakeredis with Lua support not installed")
+class TestRedisFrontierScripts(TestRedisFrontier):
+    """Run the Redis frontier tests with the real Lua scripts on fakeredis"""
+
+    def make_server(self):
+        return fakeredis_server()
+
+
+class TestWorkerCrawl(unittest.TestCase):
+    """Test workers crawling a fake site through one shared frontier"""
+
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.config = {
+            'name': 'test-workers',
+            'base_url': BASE,
+            'start_urls': [BASE + 'page0'],
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'rate_limit': 0,
+            'max_pages': 100,
+            'concurrency': 2
+        }
+        self.site = {f"{BASE}page{i}": [f"{BASE}page{j}" for j in (2 * i + 1, 2 * i + 2) if j < 15]
+                     for i in range(15)}
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_worker(self, fetched):
+        converter = DocToSkillConverter(self.config)
+        converter.manifest = None
+
+        def fake_fetch(url):
+            fetched.append(url)
+            return {'url': url, 'title': url.rsplit('/', 1)[-1], 'content': '', 'headings': [],
+                    'code_samples': [], 'patterns': [], 'links': self.site[url]}
+        converter.fetch_page = fake_fetch
+        return converter
+
+    def test_workers_share_one_crawl(self):
+        """Test that workers split the site and fetch every page once"""
+        coordinator = DocToSkillConverter(self.config)
+        spec = coordinator.default_frontier_spec()
+        frontier = open_frontier(spec, key=coordinator.canonicalizer.key)
+        coordinator.seed_shared_frontier(frontier)
+
+        fetched = []
+        # The first worker drains the queue; the second must find nothing left to fetch
+        first, second = self.make_worker(fetched), self.make_worker(fetched)
+        first.run_worker(open_frontier(spec, key=first.canonicalizer.key), 0, 2)
+        second.run_worker(open_frontier(spec, key=second.canonicalizer.key), 1, 2)
+
+        self.assertEqual(sorted(fetched), sorted(self.site))
+        self.assertEqual(frontier.counts()['done'], 15)
+
+        coordinator.collect_worker_pages()
+        self.assertEqual(len(coordinator.pages), 15)
+        frontier.close()
+
+    def test_budget_is_global(self):
+        """Test that max_pages caps the crawl across workers"""
+        self.config['max_pages'] = 5
+        coordinator = DocToSkillConverter(self.config)
+        spec = coordinator.default_frontier_spec()
+        frontier = open_frontier(spec, key=coordinator.canonicalizer.key)
+        coordinator.seed_shared_frontier(frontier)
+
+        fetched = []
+        self.make_worker(fetched).run_worker(open_frontier(spec), 0, 1)
+
+        self.assertEqual(len(fetched), 5)
+        frontier.close()
+
+    def test_duplicates_across_workers(self):
+        """Test that a page repeating one another worker scraped is caught"""
+        mirror = b'<h1>Intro</h1><article><p>The same introduction, served under two URLs.</p></article>'
+        site = {BASE + 'stable/intro': mirror, BASE + 'latest/intro': mirror}
+        http = Mock()
+        http.get.side_effect = lambda url, **kwargs: Mock(
+            url=url, status_code=200 if url in site else 404, headers={}, raw=None,
+            content=site.get(url, b''))
+        self.config.update(start_urls=[BASE + 'stable/intro'], http_cache=False)
+
+        coordinator = DocToSkillConverter(self.config)
+        spec = coordinator.default_frontier_spec()
+        frontier = open_frontier(spec, key=coordinator.canonicalizer.key)
+        coordinator.seed_shared_frontier(frontier)
+        with patch('cli.doc_scraper.get_client', return_value=http):
+            # Two worker processes, one after the other, each with its own detector
+            run_worker_process(self.config, spec, 0, 1)
+            frontier.add(BASE + 'latest/intro')
+            run_worker_process(self.config, spec, 0, 1)
+
+        self.assertEqual(frontier.duplicates(), {BASE + 'latest/intro': BASE + 'stable/intro'})
+        self.assertEqual(frontier.counts()['done'], 2)
+        coordinator.collect_worker_pages()
+        self.assertEqual([page['url'] for page in coordinator.pages], [BASE + 'stable/intro'])
+        frontier.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
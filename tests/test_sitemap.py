@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test suite for sitemap-driven frontier seeding
+Tests robots.txt hints, sitemap indexes, filtering and scraper/estimator seeding
+"""
+
+import sys
+import os
+import gzip
+import unittest
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.sitemap import fetch_robots, iter_sitemap, load_sitemap_urls
+from cli.doc_scraper import DocToSkillConverter
+from cli.estimate_pages import estimate_pages
+from cli.http_client import HttpClient
+from tests.test_http_client import LocalSite, finishes
+
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+INDEX = f'''<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex {NS}>
+  <sitemap><loc>https://docs.example.com/sitemap-guide.xml</loc></sitemap>
+  <sitemap><loc>https://docs.example.com/sitemap-blog.xml.gz</loc></sitemap>
+</sitemapindex>'''
+
+GUIDE = f'''<?xml version="1.0" encoding="UTF-8"?>
+<urlset {NS} xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url><loc>https://docs.example.com/guide/intro</loc><lastmod>2024-01-01</lastmod></url>
+  <url>
+    <loc>https://docs.example.com/guide/setup</loc>
+    <image:image><image:loc>https://docs.example.com/img.png</image:loc></image:image>
+  </url>
+</urlset>'''
+
+BLOG = f'''<?xml version="1.0" encoding="UTF-8"?>
+<urlset {NS}>
+  <url><loc>https://docs.example.com/blog/news</loc></url>
+</urlset>'''
+
+
+class FakeClient:
+    """Serve canned bodies by URL"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        body = self.routes.get(url)
+        response = Mock(raw=None)
+        response.status_code = 200 if body is not None else 404
+        response.content = body if isinstance(body, bytes) else (body or '').encode()
+        response.text = body if isinstance(body, str) else ''
+        return response
+
+
+def site_routes(robots=True):
+    """Routes for a site with a sitemap index"""
+    routes = {
+        'https://docs.example.com/sitemap-index.xml': INDEX,
+        'https://docs.example.com/sitemap-guide.xml': GUIDE,
+        'https://docs.example.com/sitemap-blog.xml.gz': gzip.compress(BLOG.encode()),
+    }
+    if robots:
+        routes['https://docs.example.com/robots.txt'] = (
+            "User-agent: *\nCrawl-delay: 2\nDisallow: /private/\n"
+            "Sitemap: https://docs.example.com/sitemap-index.xml\n"
+        )
+    return routes
+
+
+class TestSitemapParsing(unittest.TestCase):
+    """Test robots.txt and sitemap parsing"""
+
+    def test_robots_hints(self):
+        """Test sitemap and crawl-delay extraction from robots.txt"""
+        robots = fetch_robots('https://docs.example.com/en/', FakeClient(site_routes()))
+        self.assertEqual(robots['sitemaps'], ['https://docs.example.com/sitemap-index.xml'])
+        self.assertEqual(robots['crawl_delay'], 2.0)
+
+    def test_nested_index_and_gzip(self):
+        """Test that indexes are followed into plain and gzipped sitemaps"""
+        entries = list(iter_sitemap('https://docs.example.com/sitemap-index.xml',
+                                    FakeClient(site_routes())))
+        urls = [url for url, _ in entries]
+        self.assertEqual(urls, [
+            'https://docs.example.com/guide/intro',
+            'https://docs.example.com/guide/setup',
+            'https://docs.example.com/blog/news',
+        ])
+        self.assertEqual(entries[0][1], '2024-01-01')
+        self.assertIsNone(entries[1][1])
+
+    def test_filters_through_url_patterns(self):
+        """Test that only in-scope URLs are returned"""
+        urls = load_sitemap_urls({'base_url': 'https://docs.example.com/', 'sitemap': True},
+                                 FakeClient(site_routes()),
+                                 lambda url: '/blog/' not in url)
+        self.assertNotIn('https://docs.example.com/blog/news', urls)
+        self.assertIn('https://docs.example.com/guide/intro', urls)
+
+    def test_fallback_to_sitemap_xml(self):
+        """Test /sitemap.xml is tried when robots.txt has no hint"""
+        routes = site_routes(robots=False)
+        routes['https://docs.example.com/sitemap.xml'] = GUIDE
+        urls = load_sitemap_urls({'base_url': 'https://docs.example.com/', 'sitemap': True},
+                                 FakeClient(routes), lambda url: True)
+        self.assertEqual(len(urls), 2)
+
+
+    def test_missing_sitemaps_release_connections(self):
+        """Test more missing sitemaps and robots.txt than the pool holds, against a real server"""
+        client = HttpClient(max_connections_per_host=2, retries=0)
+        found = []
+
+        def work():
+            for i in range(3):
+                found.append(fetch_robots(site.base_url, client))
+                found.extend(iter_sitemap(site.base_url + f'sitemap{i}.xml', client))
+
+        with LocalSite() as site:
+            finishes(self, work)
+            self.assertEqual(len(site.requests), 6)
+        client.close()
+        self.assertEqual(found, [{'sitemaps': [], 'crawl_delay': None}] * 3)
+
+
+class TestSitemapSeeding(unittest.TestCase):
+    """Test that the scraper and estimator use the sitemap"""
+
+    def setUp(self):
+        self.config = {
+            'name': 'test-sitemap',
+            'base_url': 'https://docs.example.com/',
+            'selectors': {'main_content': 'article', 'title': 'h1', 'code_blocks': 'pre'},
+            'url_patterns': {'include': ['/guide/'], 'exclude': []},
+            'sitemap': True,
+            'rate_limit': 0,
+            'max_pages': 100
+        }
+
+    def test_scraper_seeds_frontier(self):
+        """Test that sitemap URLs are queued and lastmod recorded"""
+        converter = DocToSkillConverter(self.config, dry_run=True)
+        converter.http = FakeClient(site_routes())
+        converter.seed_from_sitemap()
+
+        self.assertIn('https://docs.example.com/guide/setup', converter.pending_urls)
+        self.assertNotIn('https://docs.example.com/blog/news', converter.pending_urls)
+        self.assertEqual(converter.lastmod['https://docs.example.com/guide/intro'], '2024-01-01')
+
+    def test_estimator_counts_sitemap(self):
+        """Test that estimation needs no page fetches with a sitemap"""
+        client = FakeClient(site_routes())
+        import cli.estimate_pages as estimator
+        original = estimator.get_client
+        estimator.get_client = lambda config: client
+        try:
+            results = estimate_pages(self.config)
+        finally:
+            estimator.get_client = original
+
+        self.assertEqual(results['source'], 'sitemap')
+        self.assertEqual(results['estimated_total'], 2)
+        self.assertFalse(any('/guide/' in url for url in client.requested))
+
+
+if __name__ == '__main__':
+    unittest.main()